@@ -0,0 +1,28 @@
+"""add intervention_events.decode_strategy
+
+Revision ID: 3c9e1b7d2a41
+Revises: 712d7a71fcdb
+Create Date: 2026-10-17 10:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9e1b7d2a41'
+down_revision: Union[str, Sequence[str], None] = '712d7a71fcdb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('intervention_events', sa.Column('decode_strategy', sa.String(length=16), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('intervention_events', 'decode_strategy')
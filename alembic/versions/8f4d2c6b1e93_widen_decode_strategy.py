@@ -0,0 +1,38 @@
+"""widen intervention_events.decode_strategy for *_rerank strategies
+
+Revision ID: 8f4d2c6b1e93
+Revises: 3c9e1b7d2a41
+Create Date: 2026-10-17 11:48:05.327716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f4d2c6b1e93'
+down_revision: Union[str, Sequence[str], None] = '3c9e1b7d2a41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column(
+        'intervention_events', 'decode_strategy',
+        existing_type=sa.String(length=16),
+        type_=sa.String(length=32),
+        existing_nullable=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column(
+        'intervention_events', 'decode_strategy',
+        existing_type=sa.String(length=32),
+        type_=sa.String(length=16),
+        existing_nullable=True,
+    )
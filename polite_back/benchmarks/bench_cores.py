@@ -0,0 +1,106 @@
+# polite_back/benchmarks/bench_cores.py
+# 워커 수 × 워커당 스레드 레이아웃별 추론 처리량 (머신 크기 산정용)
+# 실행: python -m polite_back.benchmarks.bench_cores --model electra [--layouts 1x1 1x2 2x1 2x2] [--requests 64]
+#       python -m polite_back.benchmarks.bench_cores --model kobart --requests 16
+# 레이아웃마다 별도 프로세스에서 측정 (torch 스레드 풀·코어 고정이 서로 섞이지 않도록).
+# 배처/입장 제어/캐시 없이 InferenceExecutor 만 거친 원시 처리량이며, 모델은 MODEL_ARTIFACT_DIR 등 기존 설정으로 로드.
+
+import argparse
+import asyncio
+import multiprocessing as mp
+import os
+import statistics
+import time
+from typing import List, Tuple
+
+from polite_back.benchmarks.bench_kobart_onnx import CORPUS
+
+
+def _default_layouts(cpus: int) -> List[Tuple[int, int]]:
+    sizes = [n for n in (1, 2, 4, 8, 16) if n <= cpus]
+    return [(w, t) for w in sizes for t in sizes if w * t <= cpus]
+
+
+def _run_layout(model, workers, threads, n_requests, batch, queue):
+    prefix = model.upper()
+    os.environ[f"{prefix}_WORKERS"] = str(workers)
+    os.environ[f"{prefix}_THREADS"] = str(threads)
+    os.environ[f"{prefix}_QUEUE"] = str(n_requests)
+    os.environ["GEN_CACHE_PATH"] = ""  # 캐시 없이 실제 생성 시간 측정
+
+    from polite_back.models import bert_model, cores, kobart_model
+    from polite_back.models.executor import electra_executor, kobart_executor
+
+    if model == "electra":
+        executor = electra_executor
+        texts = [CORPUS[i % len(CORPUS)] + f" {i}" for i in range(batch)]
+        fn, args, load = bert_model.score_batch, (texts,), bert_model._ensure_loaded
+    else:
+        executor = kobart_executor
+        fn, args, load = kobart_model.refine_batch, ([CORPUS[0]] * batch,), kobart_model.get_kobart_model
+
+    async def _bench():
+        await executor.run(load)
+        # 워커마다 1회씩 예열 (스레드 생성·코어 고정·커널 선택)
+        await asyncio.gather(*(executor.run(fn, *args) for _ in range(workers)))
+        lat_ms: List[float] = []
+
+        async def _one():
+            t0 = time.perf_counter()
+            await executor.run(fn, *args)
+            lat_ms.append((time.perf_counter() - t0) * 1000)
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(_one() for _ in range(n_requests)))
+        return time.perf_counter() - t0, lat_ms
+
+    wall_s, lat_ms = asyncio.run(_bench())
+    lat_ms.sort()
+    queue.put({
+        "layout": f"{workers}x{threads}",
+        "cores": workers * threads,
+        "pinned": cores.PIN,
+        "items_per_s": n_requests * batch / wall_s,
+        "p50_ms": statistics.median(lat_ms),
+        "p95_ms": lat_ms[min(len(lat_ms) - 1, int(len(lat_ms) * 0.95))],
+    })
+    executor.shutdown()
+
+
+def main():
+    from polite_back.models import cores
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--model", choices=["electra", "kobart"], default="electra")
+    ap.add_argument("--layouts", nargs="+", default=None, help="워커x스레드 (예: 1x2 2x1). 기본: 코어 수 안의 모든 조합")
+    ap.add_argument("--requests", type=int, default=64)
+    ap.add_argument("--batch", type=int, default=None, help="요청당 문장 수 (기본: electra 8, kobart 1)")
+    args = ap.parse_args()
+
+    cpus = cores.available_cpus()
+    batch = args.batch or (8 if args.model == "electra" else 1)
+    layouts = [tuple(int(x) for x in l.split("x")) for l in args.layouts] if args.layouts else _default_layouts(cpus)
+    print(f"cpus: available={cpus} quota={cores.cgroup_cpu_limit()} affinity={len(cores.affinity())} os={os.cpu_count()}")
+    print(f"model={args.model} requests={args.requests} batch={batch}")
+
+    ctx = mp.get_context("spawn")
+    results = []
+    for workers, threads in layouts:
+        q = ctx.Queue()
+        p = ctx.Process(target=_run_layout, args=(args.model, workers, threads, args.requests, batch, q))
+        p.start()
+        results.append(q.get())
+        p.join()
+
+    print(f"{'layout':>7} {'cores':>5} {'pin':>4} {'items/s':>9} {'per_core':>9} {'p50_ms':>8} {'p95_ms':>8}")
+    for r in results:
+        print(
+            f"{r['layout']:>7} {r['cores']:>5} {str(r['pinned'])[0]:>4} {r['items_per_s']:>9.1f} "
+            f"{r['items_per_s'] / r['cores']:>9.1f} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f}"
+        )
+    best = max(results, key=lambda r: r["items_per_s"])
+    print(f"best: {best['layout']} ({best['items_per_s']:.1f} items/s) → {args.model.upper()}_WORKERS / {args.model.upper()}_THREADS")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# polite_back/benchmarks/bench_kobart_onnx.py
+# KoBART eager(torch) ↔ ONNX(fp32/int8, KV-cache) 비교: 지연, 상주 메모리(RSS), 출력 일치율
+# 실행: python -m polite_back.benchmarks.bench_kobart_onnx [--backends torch onnx onnx-int8] [--repeat 3]
+# 백엔드별로 별도 프로세스에서 측정 (RSS 가 서로 섞이지 않도록)
+
+import argparse
+import difflib
+import multiprocessing as mp
+import os
+import statistics
+import time
+
+CORPUS = [
+    "야 이 멍청아 그것도 모르냐",
+    "기사 쓴 사람 머리는 장식이냐",
+    "진짜 어이없네 생각 좀 하고 말해라",
+    "너 같은 애들 때문에 댓글창이 엉망이다",
+    "ㅋㅋ 완전 바보 같은 소리 하고 있네",
+    "닥치고 기사나 똑바로 써",
+    "이런 걸 기사라고 올리냐 수준 진짜 낮다",
+    "말도 안 되는 소리 좀 그만해 답답해 죽겠네 정말로 한 번만 더 생각해 보고 글 좀 써라",
+]
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _run_backend(backend, model_name, onnx_dir, repeat, queue):
+    os.environ["KOBART_BACKEND"] = backend
+    os.environ["GEN_CACHE_PATH"] = ""  # 캐시 없이 실제 생성 시간 측정
+    if onnx_dir:
+        os.environ["KOBART_ONNX_DIR"] = onnx_dir
+
+    from polite_back.models import kobart_model
+
+    if model_name:
+        kobart_model.MODEL_NAME = model_name
+
+    rss_before = _rss_mb()
+    t0 = time.perf_counter()
+    kobart_model.get_kobart_model()
+    load_s = time.perf_counter() - t0
+    rss_loaded = _rss_mb()
+
+    outputs = [kobart_model.refine_text(t) for t in CORPUS]  # warm-up 겸 출력 수집
+    lat_ms = []
+    for _ in range(repeat):
+        for t in CORPUS:
+            t1 = time.perf_counter()
+            kobart_model.refine_text(t)
+            lat_ms.append((time.perf_counter() - t1) * 1000)
+
+    queue.put({
+        "backend": backend,
+        "load_s": load_s,
+        "rss_base_mb": rss_before,
+        "rss_loaded_mb": rss_loaded,
+        "rss_peak_mb": _rss_mb(),
+        "p50_ms": statistics.median(lat_ms),
+        "mean_ms": statistics.fmean(lat_ms),
+        "outputs": outputs,
+    })
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--backends", nargs="+", default=["torch", "onnx", "onnx-int8"])
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--model", default=None, help="MODEL_NAME 대신 사용할 모델 (로컬 경로 가능)")
+    ap.add_argument("--onnx-dir", default=None)
+    args = ap.parse_args()
+
+    ctx = mp.get_context("spawn")
+    results = []
+    for backend in args.backends:
+        q = ctx.Queue()
+        p = ctx.Process(target=_run_backend, args=(backend, args.model, args.onnx_dir, args.repeat, q))
+        p.start()
+        results.append(q.get())
+        p.join()
+
+    ref = results[0]["outputs"]
+    print(f"{'backend':>10} {'load_s':>7} {'rss_MB':>8} {'p50_ms':>8} {'mean_ms':>8} {'exact':>6} {'sim':>6}")
+    for r in results:
+        exact = sum(a == b for a, b in zip(ref, r["outputs"])) / len(ref)
+        sim = statistics.fmean(difflib.SequenceMatcher(None, a, b).ratio() for a, b in zip(ref, r["outputs"]))
+        rss = r["rss_peak_mb"] - r["rss_base_mb"]
+        print(f"{r['backend']:>10} {r['load_s']:>7.2f} {rss:>8.1f} {r['p50_ms']:>8.1f} {r['mean_ms']:>8.1f} {exact:>6.2f} {sim:>6.3f}")
+    print(f"(exact/sim: {results[0]['backend']} 출력 대비 완전 일치율 / 평균 문자 유사도)")
+
+
+if __name__ == "__main__":
+    main()
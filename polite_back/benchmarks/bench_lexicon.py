@@ -0,0 +1,64 @@
+# polite_back/benchmarks/bench_lexicon.py
+# 실행: python -m polite_back.benchmarks.bench_lexicon [--repeat 200]
+
+import argparse
+import random
+import timeit
+
+from polite_back.models.lexicon import LexiconMatcher, load_words
+
+# 사전에 걸리지 않는 일반 문장 조각 (최악의 경우: 끝까지 스캔)
+_BENIGN = [
+    "오늘", "기사", "내용이", "정말", "흥미롭네요", "저는", "조금", "다르게",
+    "생각합니다", "근거가", "있으면", "좋겠어요", "다음", "글도", "기대할게요",
+]
+
+
+def _make_text(n_chars: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    parts = []
+    size = 0
+    while size < n_chars:
+        w = rng.choice(_BENIGN)
+        parts.append(w)
+        size += len(w) + 1
+    return " ".join(parts)[:n_chars]
+
+
+def _loop_match(words, text):
+    # bert_model.predict의 기존 구현
+    for word in words:
+        if word in text:
+            return word
+    return None
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=200)
+    ap.add_argument("--lengths", type=int, nargs="+", default=[10, 50, 200, 1000, 5000])
+    args = ap.parse_args()
+
+    words = load_words()
+    t0 = timeit.default_timer()
+    matcher = LexiconMatcher(words)
+    build_ms = (timeit.default_timer() - t0) * 1000
+    print(f"words={len(words)} build={build_ms:.1f}ms")
+    print(f"{'chars':>6} {'loop_us':>10} {'ac_us':>10} {'speedup':>8}")
+
+    for n in args.lengths:
+        text = _make_text(n)
+        # 결과 일치 여부 확인 (매칭 없음 + 끝부분 매칭)
+        hit_text = text + words[len(words) // 2]
+        assert (_loop_match(words, text) is None) == (matcher.search(text) is None)
+        assert (_loop_match(words, hit_text) is None) == (matcher.search(hit_text) is None)
+
+        loop_s = timeit.timeit(lambda: _loop_match(words, text), number=args.repeat)
+        ac_s = timeit.timeit(lambda: matcher.search(text), number=args.repeat)
+        loop_us = loop_s / args.repeat * 1e6
+        ac_us = ac_s / args.repeat * 1e6
+        print(f"{n:>6} {loop_us:>10.1f} {ac_us:>10.1f} {loop_us / ac_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# polite_back/benchmarks/parity_bert_onnx.py
+# PyTorch ↔ ONNX Runtime 확률 일치 검사 + 지연 비교
+# 실행: python -m polite_back.benchmarks.parity_bert_onnx [--backend onnx-int8] [--tol 0.05]
+
+import argparse
+import tempfile
+import time
+
+import torch
+from transformers import ElectraTokenizer
+
+from polite_back.models import bert_model, bert_onnx
+
+# 고정 코퍼스: 일반/비판/공격적 표현, 짧은 문장~max_length 초과 문장
+CORPUS = [
+    "좋은 기사 감사합니다.",
+    "저는 이 의견에 동의하지 않아요.",
+    "근거도 없이 이런 글을 쓰다니 실망이네요.",
+    "정말 한심하다 이런 생각밖에 못 하냐",
+    "말 같지도 않은 소리 좀 그만해라",
+    "ㅋㅋㅋㅋ 진짜 웃기네",
+    "기자님 다음 기사도 기대하겠습니다!",
+    "너 같은 사람들 때문에 나라가 이 모양이다",
+    "이건 좀 아닌 것 같은데요? 다시 확인해 보세요.",
+    "제발 생각 좀 하고 살아",
+    "오늘 날씨가 참 좋네요. " * 30,
+    "a",
+]
+
+# fp32 export는 연산 순서 차이 수준, int8은 양자화 오차 허용
+DEFAULT_TOL = {"onnx": 1e-3, "onnx-int8": 0.05}
+
+
+def _torch_probs(model, input_ids, attention_mask):
+    with torch.inference_mode():
+        return torch.sigmoid(model(input_ids=input_ids, attention_mask=attention_mask)).tolist()
+
+
+def compare(torch_model, onnx_model, tokenizer, corpus, tol, repeat=5):
+    enc = tokenizer(corpus, return_tensors="pt", padding=True, truncation=True, max_length=bert_model.MAX_LENGTH)
+    ids, mask = enc["input_ids"], enc["attention_mask"]
+
+    ref = _torch_probs(torch_model, ids, mask)
+    got = onnx_model.predict_proba(ids.numpy(), mask.numpy())
+    diffs = [abs(a - b) for a, b in zip(ref, got)]
+    worst = max(diffs)
+
+    def _time(fn):
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            for i in range(len(corpus)):
+                fn(i)
+        return (time.perf_counter() - t0) / (repeat * len(corpus)) * 1000
+
+    # 배치=1 기준 per-comment 지연 (운영 경로와 동일)
+    single = [tokenizer(t, return_tensors="pt", truncation=True, max_length=bert_model.MAX_LENGTH) for t in corpus]
+    torch_ms = _time(lambda i: _torch_probs(torch_model, single[i]["input_ids"], single[i]["attention_mask"]))
+    onnx_ms = _time(lambda i: onnx_model.predict_proba(single[i]["input_ids"].numpy(), single[i]["attention_mask"].numpy()))
+
+    return {"max_abs_diff": worst, "tol": tol, "torch_ms": torch_ms, "onnx_ms": onnx_ms, "ref": ref, "got": got}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--backend", choices=["onnx", "onnx-int8"], default="onnx")
+    ap.add_argument("--tol", type=float, default=None)
+    ap.add_argument("--onnx-dir", default=None, help="기본: 임시 디렉토리에 새로 export")
+    args = ap.parse_args()
+
+    torch.set_num_threads(1)
+    tokenizer = ElectraTokenizer.from_pretrained("H0jinPark/KoELECTRA-hatespeech")
+    torch_model = bert_model._build_torch_model(torch.device("cpu"))
+    tol = args.tol if args.tol is not None else DEFAULT_TOL[args.backend]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        onnx_model = bert_onnx.load_session(args.backend, args.onnx_dir or tmp, lambda: torch_model)
+        res = compare(torch_model, onnx_model, tokenizer, CORPUS, tol)
+
+    for text, a, b in zip(CORPUS, res["ref"], res["got"]):
+        print(f"{a:.5f} {b:.5f} {abs(a - b):.2e}  {text[:30]}")
+    print(f"backend={args.backend} max_abs_diff={res['max_abs_diff']:.2e} tol={tol}")
+    print(f"latency/comment: torch={res['torch_ms']:.1f}ms {args.backend}={res['onnx_ms']:.1f}ms")
+    assert res["max_abs_diff"] <= tol, f"parity check failed: {res['max_abs_diff']:.3e} > {tol}"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# polite_back/inference_token.py
+# /comments/suggest 에서 계산한 점수·순화문을 서명된 토큰으로 돌려주고,
+# POST /comments 에서 검증 후 재사용 → 같은 입력에 대한 모델 재호출 생략.
+# 토큰 자체에 값이 담기므로 서버 저장소 없이 여러 워커/재시작 간에도 검증 가능 (비밀키가 같다면).
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+# 미설정 시 프로세스별 임시 키 → 다른 워커가 받은 토큰은 무효 처리되어 재계산으로 대체됨
+_SECRET = (os.environ.get("INFERENCE_TOKEN_SECRET") or secrets.token_hex(32)).encode("utf-8")
+TOKEN_TTL = int(os.environ.get("INFERENCE_TOKEN_TTL", "1800"))
+_VERSION = 1
+
+
+@dataclass
+class InferenceHint:
+    post_id: int
+    threshold: float
+    text_sha: str
+    score_original: Tuple[float, bool]          # (prob, lexicon_hit)
+    polite_text: Optional[str] = None
+    score_polite: Optional[Tuple[float, bool]] = None
+
+
+def _b64(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _unb64(s: str) -> bytes:
+    return base64.urlsafe_b64decode(s + "=" * (-len(s) % 4))
+
+
+def text_sha(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def decided_score(over_pred: int, prob: float, threshold: float) -> Tuple[float, bool]:
+    """
+    핸들러가 이미 가진 decide() 결과 (pred, prob) → 같은 임계값의 decide() 가 같은 결과를 내는 (prob, lexicon_hit).
+    사전 매칭(LEXICON_PROB 고정)이 확률만으로는 임계 이하일 때만 lexicon_hit 로 표시.
+    """
+    return prob, bool(over_pred) and not prob > threshold
+
+
+def _sign(body: bytes) -> bytes:
+    return hmac.new(_SECRET, body, hashlib.sha256).digest()
+
+
+def issue(hint: InferenceHint, ttl: int = TOKEN_TTL) -> str:
+    payload = {
+        "v": _VERSION,
+        "pid": hint.post_id,
+        "th": hint.threshold,
+        "sha": hint.text_sha,
+        "so": list(hint.score_original),
+        "pt": hint.polite_text,
+        "sp": list(hint.score_polite) if hint.score_polite is not None else None,
+        "exp": int(time.time()) + ttl,
+    }
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return f"{_b64(body)}.{_b64(_sign(body))}"
+
+
+def verify(token: Optional[str], post_id: int, threshold: float, text: str) -> Optional[InferenceHint]:
+    """서명·만료·포스트·임계값·원문이 모두 일치할 때만 InferenceHint, 아니면 None (재계산)."""
+    if not token:
+        return None
+    try:
+        body_b64, sig_b64 = token.split(".", 1)
+        body = _unb64(body_b64)
+        if not hmac.compare_digest(_sign(body), _unb64(sig_b64)):
+            return None
+        p = json.loads(body)
+    except (ValueError, TypeError):
+        return None
+
+    if p.get("v") != _VERSION or p.get("exp", 0) < time.time():
+        return None
+    if int(p["pid"]) != int(post_id) or float(p["th"]) != float(threshold):
+        return None
+    if p["sha"] != text_sha(text):
+        return None
+
+    return InferenceHint(
+        post_id=int(p["pid"]),
+        threshold=float(p["th"]),
+        text_sha=p["sha"],
+        score_original=(float(p["so"][0]), bool(p["so"][1])),
+        polite_text=p.get("pt"),
+        score_polite=(float(p["sp"][0]), bool(p["sp"][1])) if p.get("sp") else None,
+    )
@@ -1,7 +1,8 @@
 # polite_back/main.py
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 from sqlalchemy import text
 
@@ -14,8 +15,11 @@ from polite_back.routes.intervention import router as intervention_router
 from polite_back.routes.reaction import router as reaction_router
 from polite_back.routes.reward import router as reward_router
 from polite_back.database import engine
+from polite_back.models.admission import Overloaded
+from polite_back.models.executor import QueueFull, electra_executor, kobart_executor
+from polite_back.models import inference, registry, warmup
 
-# 앱 라이프사이클: DB 연결 체크 / 종료 정리 
+# 앱 라이프사이클: DB 연결 체크 / 모델 백그라운드 워밍업 / 종료 정리 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     try:
@@ -23,11 +27,34 @@ async def lifespan(app: FastAPI):
             await conn.execute(text("SELECT 1"))
     except Exception as e:
         print(f"[startup] DB connection check failed: {e}")
+    # 요청 수신을 막지 않도록 백그라운드 실행 (진행 상황은 /ready)
+    warmup_task = warmup.start()
+    # 유휴 모델 해제 (client 모드에서는 모델 서버가 담당)
+    reaper_task = registry.start() if inference.remote is None else None
     yield
+    for task in (warmup_task, reaper_task):
+        if task is not None:
+            task.cancel()
+    electra_executor.shutdown()
+    kobart_executor.shutdown()
     await engine.dispose()
 
 app = FastAPI(title="Polite_Backend", lifespan=lifespan)
 
+# 추론 대기열 초과 → 503
+@app.exception_handler(QueueFull)
+async def queue_full_handler(request: Request, exc: QueueFull):
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
+# 예상 대기 시간 SLO 초과 → 429(제안 등) / 503(저장)
+@app.exception_handler(Overloaded)
+async def overloaded_handler(request: Request, exc: Overloaded):
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": str(exc), "model": exc.name, "estimated_wait_ms": round(exc.wait_ms)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
 # CORS 
 app.add_middleware(
     CORSMiddleware,
@@ -53,3 +80,16 @@ app.include_router(reward_router)
 @app.get("/")
 def read_root():
     return {"message": "Polite_Web 서버 실행 중"}
+
+# 준비 상태 프로브: 모델별 로드/워밍업 상태와 소요 시간, 전부 준비되기 전에는 503
+@app.get("/ready")
+async def readiness():
+    body = await warmup.readiness()
+    return JSONResponse(status_code=200 if body["ready"] else 503, content=body)
+
+# 모델 상주 현황: 메모리 예산, 모델별 상주 여부·크기·유휴 시간·재로드/해제 횟수
+@app.get("/models")
+async def model_residency():
+    if inference.remote is not None:
+        return await inference.remote.call("models")
+    return registry.models.stats()
@@ -128,6 +128,7 @@ class InterventionEvent(Base):
 
     # B 전용
     generated_polite_text = Column(Text)        # nullable
+    decode_strategy = Column(String(32))        # nullable, 순화문 디코딩 방식
     user_edit_text = Column(Text)               # nullable
     edit_logit = Column(Float if True else Integer)  # nullable
     decision_rule_applied = Column(
@@ -0,0 +1,169 @@
+# polite_back/model_server.py
+# 모델 전용 프로세스: KoELECTRA / KoBART 를 한 번만 로드하고 Unix 소켓으로 여러 웹 워커의 요청을 받아
+# 기존 마이크로 배치·캐시·입장 제어를 그대로 적용 (워커 간 요청도 한 배치로 묶임).
+#
+# 실행:
+#   python -m polite_back.model_server [--socket /tmp/polite-model-server.sock]
+#   웹 워커: MODEL_SERVER=client MODEL_SERVER_SOCKET=... uvicorn polite_back.main:app --workers N
+# 한 번에 띄우기 (모델 서버 + uvicorn N 워커):
+#   python -m polite_back.model_server --web-workers 4 --port 8000
+
+import argparse
+import asyncio
+import os
+import sys
+from typing import Dict
+
+from polite_back.models import admission, bert_model, inference, registry, remote, warmup
+from polite_back.models.executor import electra_executor, kobart_executor
+
+
+async def _op_score(text: str):
+    return list(await inference.score(text, segmented=False))
+
+
+async def _op_generate(text: str, params):
+    return await inference._generate(text, tuple(tuple(p) for p in params))
+
+
+async def _op_score_batch(texts):
+    return [list(s) for s in await electra_executor.run(bert_model.score_batch, texts)]
+
+
+async def _op_ready():
+    return warmup.local_readiness()
+
+
+async def _op_stats():
+    return inference.stats()
+
+
+async def _op_prewarm(model: str):
+    await registry.models.prewarm(model)
+
+
+async def _op_models():
+    return registry.models.stats()
+
+
+_OPS = {
+    "score": _op_score,
+    "generate": _op_generate,
+    "score_batch": _op_score_batch,
+    "ready": _op_ready,
+    "stats": _op_stats,
+    "prewarm": _op_prewarm,
+    "models": _op_models,
+}
+
+
+class _Connection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.tasks: Dict[int, asyncio.Task] = {}
+
+    def send(self, msg: dict):
+        if not self.writer.is_closing():
+            remote.write_frame(self.writer, msg)
+
+    async def _handle(self, msg: dict):
+        rid = msg["id"]
+        admission.set_priority(msg.get("priority") or admission.INTERACTIVE)
+        try:
+            if msg["op"] == "stream":
+                async for kind, payload in inference.refine_stream(msg["args"]["text"]):
+                    self.send({"id": rid, "event": kind, "data": payload})
+                    await self.writer.drain()
+                self.send({"id": rid, "end": True})
+            else:
+                result = await _OPS[msg["op"]](**msg.get("args", {}))
+                self.send({"id": rid, "result": result})
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.send({"id": rid, "error": remote.encode_error(e)})
+        finally:
+            self.tasks.pop(rid, None)
+
+    async def serve(self):
+        try:
+            while True:
+                msg = await remote.read_frame(self.reader)
+                if msg.get("op") == "cancel":
+                    task = self.tasks.get(msg.get("args", {}).get("target"))
+                    if task is not None:
+                        task.cancel()
+                    continue
+                if msg.get("op") not in _OPS and msg.get("op") != "stream":
+                    self.send({"id": msg.get("id"), "error": {"type": "ValueError", "message": f"unknown op {msg.get('op')}"}})
+                    continue
+                self.tasks[msg["id"]] = asyncio.ensure_future(self._handle(msg))
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            # 워커가 끊기면 그 워커의 요청은 모두 취소 (배치 전이면 모델 호출 생략)
+            for task in list(self.tasks.values()):
+                task.cancel()
+            self.writer.close()
+
+
+async def _on_connect(reader, writer):
+    await _Connection(reader, writer).serve()
+
+
+async def serve(path: str, web_workers: int = 0, host: str = "0.0.0.0", port: int = 8000):
+    if os.path.exists(path):
+        os.unlink(path)  # 이전 실행이 남긴 소켓 파일
+    server = await asyncio.start_unix_server(_on_connect, path=path, limit=remote.MAX_FRAME)
+    os.chmod(path, 0o660)
+    warm = warmup.start()
+    reaper = registry.start()
+    print(f"[model_server] listening on {path}")
+
+    web = None
+    if web_workers > 0:
+        env = dict(os.environ, MODEL_SERVER="client", MODEL_SERVER_SOCKET=path)
+        web = await asyncio.create_subprocess_exec(
+            sys.executable, "-m", "uvicorn", "polite_back.main:app",
+            "--host", host, "--port", str(port), "--workers", str(web_workers),
+            env=env,
+        )
+
+    try:
+        async with server:
+            if web is None:
+                await server.serve_forever()
+            else:
+                # 웹 워커가 종료되면 모델 서버도 종료
+                await web.wait()
+    finally:
+        if warm is not None:
+            warm.cancel()
+        if reaper is not None:
+            reaper.cancel()
+        if web is not None and web.returncode is None:
+            web.terminate()
+        electra_executor.shutdown()
+        kobart_executor.shutdown()
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--socket", default=remote.MODEL_SERVER_SOCKET)
+    ap.add_argument("--web-workers", type=int, default=0, help=">0 이면 uvicorn 을 이 워커 수로 함께 실행")
+    ap.add_argument("--host", default="0.0.0.0")
+    ap.add_argument("--port", type=int, default=8000)
+    args = ap.parse_args()
+    if remote.MODEL_SERVER == "client":
+        sys.exit("MODEL_SERVER=client 환경에서는 모델 서버를 실행할 수 없습니다")
+    try:
+        asyncio.run(serve(args.socket, args.web_workers, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# polite_back/models/admission.py
+# 모델별 입장 제어: 대기 중인 요청 수와 항목당 처리 시간(EWMA)으로 예상 대기 시간을 계산해
+# 지연 SLO 를 넘길 요청은 큐에 넣기 전에 거절 (Retry-After 포함, main.py 에서 429/503 으로 변환)
+
+import contextvars
+import math
+import os
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+# 우선순위: 댓글 저장 > 제안 등 일반 요청 > 입력 중 실시간 미리보기 순으로 늦게 버려진다.
+SAVE, INTERACTIVE, LIVE = "save", "interactive", "live"
+
+ELECTRA_SLO_MS = float(os.environ.get("ELECTRA_SLO_MS", "1000"))
+KOBART_SLO_MS = float(os.environ.get("KOBART_SLO_MS", "8000"))
+SAVE_SLO_FACTOR = float(os.environ.get("SAVE_SLO_FACTOR", "3.0"))  # 저장 요청은 SLO * factor 까지 허용
+LIVE_SLO_FACTOR = float(os.environ.get("LIVE_SLO_FACTOR", "0.5"))  # 실시간 미리보기는 더 일찍 포기
+ADMISSION_ENABLED = os.environ.get("ADMISSION_ENABLED", "1") != "0"
+
+# 라우터가 요청 단위로 지정 → score()/refine() 까지 인자 없이 전달 (태스크 생성 시 복사됨)
+_priority: contextvars.ContextVar = contextvars.ContextVar("admission_priority", default=INTERACTIVE)
+
+
+def set_priority(priority: str):
+    _priority.set(priority)
+
+
+def current_priority() -> str:
+    return _priority.get()
+
+
+class Overloaded(RuntimeError):
+    """예상 대기 시간이 SLO 초과. 제안 등 일반 요청은 429, 저장 요청은 503."""
+
+    def __init__(self, name: str, priority: str, wait_ms: float, slo_ms: float):
+        super().__init__(f"{name} is overloaded (estimated wait {wait_ms:.0f}ms > SLO {slo_ms:.0f}ms)")
+        self.name = name
+        self.priority = priority
+        self.wait_ms = wait_ms
+        self.slo_ms = slo_ms
+        self.status_code = 503 if priority == SAVE else 429
+        self.retry_after = max(1, math.ceil((wait_ms - slo_ms) / 1000))
+
+
+class AdmissionController:
+    """
+    in_flight(대기 + 실행 중 항목) * 항목당 처리 시간 / 동시 실행 수 = 예상 대기 시간.
+    항목당 처리 시간은 배치 실행 시간 / 배치 크기의 EWMA (배치가 커지면 자연히 줄어듦).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        concurrency: int,
+        slo_ms: float,
+        initial_cost_ms: float,
+        save_slo_factor: float = SAVE_SLO_FACTOR,
+        live_slo_factor: float = LIVE_SLO_FACTOR,
+        alpha: float = 0.2,
+        enabled: bool = ADMISSION_ENABLED,
+    ):
+        self.name = name
+        self.concurrency = max(1, int(concurrency))
+        self.slo_ms: Dict[str, float] = {
+            INTERACTIVE: slo_ms,
+            SAVE: slo_ms * save_slo_factor,
+            LIVE: slo_ms * live_slo_factor,
+        }
+        self.cost_ms = float(initial_cost_ms)
+        self.alpha = alpha
+        self.enabled = enabled
+        self.in_flight = 0
+        self.admitted: Counter = Counter()
+        self.shed: Counter = Counter()
+        self.last_shed_at: Optional[float] = None
+
+    def estimate_wait_ms(self) -> float:
+        return self.in_flight * self.cost_ms / self.concurrency
+
+    def check(self, priority: Optional[str] = None):
+        """자리를 잡지 않고 입장 가능 여부만 확인 (비동기 작업 접수 시)."""
+        priority = priority or current_priority()
+        slo = self.slo_ms.get(priority, self.slo_ms[INTERACTIVE])
+        wait = self.estimate_wait_ms() + self.cost_ms
+        if self.enabled and self.in_flight > 0 and wait > slo:
+            self.shed[priority] += 1
+            self.last_shed_at = time.time()
+            raise Overloaded(self.name, priority, wait, slo)
+        return priority
+
+    def admit(self, priority: Optional[str] = None):
+        priority = self.check(priority)
+        self.in_flight += 1
+        self.admitted[priority] += 1
+
+    def release(self):
+        self.in_flight = max(0, self.in_flight - 1)
+
+    @contextmanager
+    def slot(self, priority: Optional[str] = None):
+        self.admit(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def observe(self, items: int, run_ms: float):
+        if items <= 0:
+            return
+        self.cost_ms += self.alpha * (run_ms / items - self.cost_ms)
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "enabled": self.enabled,
+            "concurrency": self.concurrency,
+            "in_flight": self.in_flight,
+            "cost_ms_per_item": round(self.cost_ms, 3),
+            "estimated_wait_ms": round(self.estimate_wait_ms(), 3),
+            "slo_ms": dict(self.slo_ms),
+            "admitted": dict(self.admitted),
+            "shed": dict(self.shed),
+            "last_shed_at": self.last_shed_at,
+        }
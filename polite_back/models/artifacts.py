@@ -0,0 +1,225 @@
+# polite_back/models/artifacts.py
+# 로컬 모델 아티팩트 저장소: 허브 체크포인트를 한 번 safetensors 로 변환해 두고 이후에는 오프라인으로 mmap 로드
+# (pickle 역직렬화 없이 페이지 캐시를 그대로 매핑 → fork 된 워커/모델 서버가 같은 페이지를 공유)
+#
+# 디렉토리 구조 ($MODEL_ARTIFACT_DIR):
+#   electra/backbone/{config.json, model.safetensors}  electra/head.safetensors  electra/tokenizer/*
+#   kobart/{config.json, generation_config.json, model.safetensors, tokenizer*}
+#   */manifest.json  ← 파일별 sha256·크기·mtime
+#
+# 변환/검증 (배포 이미지 빌드 시 1회):
+#   python -m polite_back.models.artifacts convert [--models electra kobart]
+#   python -m polite_back.models.artifacts verify
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+from typing import Dict, Optional
+
+MODEL_ARTIFACT_DIR = os.environ.get(
+    "MODEL_ARTIFACT_DIR",
+    os.path.join(os.environ.get("HF_HOME", "/opt/render/project/.hf_cache"), "artifacts"),
+)
+# 1: 아티팩트 경로 사용(기본) | 0: 기존처럼 허브에서 직접 로드
+MODEL_ARTIFACTS = os.environ.get("MODEL_ARTIFACTS", "1") != "0"
+# 1: 네트워크 접근 금지 (아티팩트가 없으면 변환하지 않고 에러)
+MODEL_OFFLINE = os.environ.get("MODEL_OFFLINE", "0") == "1"
+# 로드 전 검증: stat(기본, 크기+mtime — mtime 이 다른 파일만 sha256) | sha256(전체 해시) | size(크기만) | none
+# 전체 해시는 변환 직후 manifest 작성과 `verify` 명령(배포 이미지 빌드 시)에서 수행
+ARTIFACT_VERIFY = os.environ.get("ARTIFACT_VERIFY", "stat").lower()
+
+if MODEL_OFFLINE:
+    # transformers / huggingface_hub 가 import 되기 전에 설정되어야 함
+    os.environ["HF_HUB_OFFLINE"] = "1"
+    os.environ["TRANSFORMERS_OFFLINE"] = "1"
+
+MANIFEST = "manifest.json"
+_verified: Dict[str, str] = {}  # 프로세스 내 검증 완료 (토크나이저·모델 로드 시 중복 해시 방지)
+
+
+class ArtifactError(RuntimeError):
+    """아티팩트 누락/손상 (오프라인이면 자동 변환하지 않음)."""
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def artifact_dir(name: str) -> str:
+    return os.path.join(MODEL_ARTIFACT_DIR, name)
+
+
+def _sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _write_manifest(root: str, source: Dict[str, str]):
+    files = {}
+    for dirpath, _, names in os.walk(root):
+        for n in sorted(names):
+            if n == MANIFEST:
+                continue
+            path = os.path.join(dirpath, n)
+            st = os.stat(path)
+            files[os.path.relpath(path, root)] = {"sha256": _sha256(path), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    with open(os.path.join(root, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump({"source": source, "created_at": time.time(), "files": files}, f, ensure_ascii=False, indent=2)
+
+
+def verify(root: str, mode: str = ARTIFACT_VERIFY) -> dict:
+    path = os.path.join(root, MANIFEST)
+    if not os.path.exists(path):
+        raise ArtifactError(f"missing manifest: {path}")
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    if mode == "none":
+        return manifest
+    for rel, meta in manifest["files"].items():
+        p = os.path.join(root, rel)
+        try:
+            st = os.stat(p)
+        except OSError:
+            raise ArtifactError(f"missing artifact: {p}")
+        if st.st_size != meta["size"]:
+            raise ArtifactError(f"truncated artifact: {p}")
+        # stat: 변환 이후 그대로인 파일은 해시 생략 (mtime 을 보존하지 않는 복사 등으로 바뀐 파일만 해시)
+        rehash = mode == "sha256" or (mode == "stat" and st.st_mtime_ns != meta.get("mtime_ns"))
+        if rehash and _sha256(p) != meta["sha256"]:
+            raise ArtifactError(f"checksum mismatch: {p}")
+    return manifest
+
+
+def _replace_dir(tmp: str, dst: str):
+    shutil.rmtree(dst, ignore_errors=True)
+    os.replace(tmp, dst)
+
+
+def convert_electra(model_name: str, weights_url: str, tokenizer_name: str, out_dir: Optional[str] = None) -> str:
+    """허브 base + 파인튜닝 pytorch_model.bin → backbone(save_pretrained, safetensors) + head.safetensors."""
+    import torch
+    from safetensors.torch import save_file
+    from transformers import ElectraTokenizerFast
+
+    from polite_back.models.koelectra import KoElectraClassifier
+
+    out_dir = out_dir or artifact_dir("electra")
+    tmp = out_dir.rstrip("/") + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    model = KoElectraClassifier(model_name)
+    model.load_state_dict(torch.hub.load_state_dict_from_url(weights_url, map_location="cpu"))
+    model.electra.save_pretrained(os.path.join(tmp, "backbone"), safe_serialization=True)
+    save_file({k: v.contiguous() for k, v in model.classifier.state_dict().items()}, os.path.join(tmp, "head.safetensors"))
+    # fast tokenizer 로 저장 → tokenizer.json 포함 (로드 시 vocab 변환 생략)
+    ElectraTokenizerFast.from_pretrained(tokenizer_name).save_pretrained(os.path.join(tmp, "tokenizer"))
+    _write_manifest(tmp, {"base": model_name, "weights": weights_url, "tokenizer": tokenizer_name})
+    _replace_dir(tmp, out_dir)
+    return out_dir
+
+
+def convert_kobart(model_name: str, out_dir: Optional[str] = None) -> str:
+    from transformers import BartForConditionalGeneration, PreTrainedTokenizerFast
+
+    out_dir = out_dir or artifact_dir("kobart")
+    tmp = out_dir.rstrip("/") + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    BartForConditionalGeneration.from_pretrained(model_name).save_pretrained(tmp, safe_serialization=True)
+    PreTrainedTokenizerFast.from_pretrained(model_name).save_pretrained(tmp)
+    _write_manifest(tmp, {"model": model_name})
+    _replace_dir(tmp, out_dir)
+    return out_dir
+
+
+def _ensure(name: str, convert) -> str:
+    root = artifact_dir(name)
+    if _verified.get(name) == root:
+        return root
+    if not os.path.exists(os.path.join(root, MANIFEST)):
+        if MODEL_OFFLINE:
+            raise ArtifactError(f"{name} artifacts not found in {root} (MODEL_OFFLINE=1)")
+        print(f"[artifacts] converting {name} → {root}")
+        convert()
+    started = time.perf_counter()
+    verify(root)
+    print(f"[artifacts] {name} verified ({ARTIFACT_VERIFY}) in {(time.perf_counter() - started) * 1000:.0f}ms")
+    _verified[name] = root
+    return root
+
+
+def ensure_electra(model_name: str, weights_url: str, tokenizer_name: str) -> str:
+    return _ensure("electra", lambda: convert_electra(model_name, weights_url, tokenizer_name))
+
+
+def ensure_kobart(model_name: str) -> str:
+    return _ensure("kobart", lambda: convert_kobart(model_name))
+
+
+def load_electra_tokenizer(root: str):
+    from transformers import ElectraTokenizerFast
+
+    return ElectraTokenizerFast.from_pretrained(os.path.join(root, "tokenizer"), local_files_only=True)
+
+
+def load_electra(root: str, device):
+    """
+    KoElectraClassifier. backbone 은 transformers 의 safetensors 로더(meta 초기화 후 mmap 텐서 할당),
+    head 는 load_file(mmap) 텐서를 assign=True 로 파라미터에 그대로 할당 → CPU 에서는 가중치 복사 없음.
+    """
+    from safetensors.torch import load_file
+
+    from polite_back.models.koelectra import KoElectraClassifier
+
+    model = KoElectraClassifier(os.path.join(root, "backbone"), local_files_only=True)
+    model.classifier.load_state_dict(load_file(os.path.join(root, "head.safetensors")), assign=True)
+    model.to(device)
+    return model.eval()
+
+
+def load_kobart(root: str, device):
+    from transformers import BartForConditionalGeneration, PreTrainedTokenizerFast
+
+    tokenizer = PreTrainedTokenizerFast.from_pretrained(root, local_files_only=True)
+    model = BartForConditionalGeneration.from_pretrained(root, local_files_only=True)
+    model.to(device)
+    return tokenizer, model.eval()
+
+
+def main():
+    from polite_back.models import bert_model, kobart_model
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("command", choices=["convert", "verify"])
+    ap.add_argument("--models", nargs="+", default=["electra", "kobart"])
+    args = ap.parse_args()
+
+    for name in args.models:
+        if args.command == "convert":
+            started = time.perf_counter()
+            if name == "electra":
+                convert_electra(bert_model.MODEL_NAME, bert_model.WEIGHTS_URL, bert_model.TOKENIZER_NAME)
+            else:
+                convert_kobart(kobart_model.MODEL_NAME)
+            print(f"{name}: converted in {time.perf_counter() - started:.1f}s → {artifact_dir(name)}")
+        else:
+            manifest = verify(artifact_dir(name), "sha256")
+            size = sum(f["size"] for f in manifest["files"].values())
+            print(f"{name}: ok ({len(manifest['files'])} files, {size / 1024 / 1024:.1f}MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+# polite_back/models/batcher.py
+
+import asyncio
+import time
+from collections import Counter
+from typing import Any, Awaitable, Callable, Hashable, List, Optional, Sequence
+
+from polite_back.models.admission import AdmissionController
+from polite_back.models.executor import QueueFull
+
+
+class MicroBatcher:
+    """
+    동시 요청을 최대 max_batch_size개 또는 max_wait_ms까지 모아 fn(items) 한 번으로 처리.
+    fn은 입력 순서대로 결과 리스트를 반환해야 하며, runner(기본: asyncio.to_thread)로 실행된다.
+    대기 항목이 max_queue를 넘으면 QueueFull, 동시에 실행되는 배치는 max_concurrency개까지.
+    bucket_key 를 주면 모은 요청을 키(예: 입력 길이 구간)별로 나눠 각각 별도 배치로 실행한다.
+    admission 을 주면 큐에 넣기 전에 예상 대기 시간으로 입장 여부를 판단하고 배치 실행 시간을 알려준다.
+    tag 를 주면 submit 시점(호출자 컨텍스트)에 tag() 값을 붙여 두고, 배치가 이미 실행된 뒤 결과를 기다리는 쪽이
+    사라진 항목의 워커 실행 시간 몫을 태그별 discarded_ms 로 집계한다 (취소해도 실행 중인 forward 는 멈추지 않음).
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[List[Any]], Sequence[Any]],
+        max_batch_size: int = 16,
+        max_wait_ms: float = 10.0,
+        name: str = "batcher",
+        runner: Optional[Callable[..., Awaitable[Any]]] = None,
+        max_queue: int = 0,
+        max_concurrency: int = 1,
+        bucket_key: Optional[Callable[[Any], Hashable]] = None,
+        admission: Optional[AdmissionController] = None,
+        tag: Optional[Callable[[], Hashable]] = None,
+    ):
+        self.fn = fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.name = name
+        self.runner = runner or asyncio.to_thread
+        self.max_queue = max(0, int(max_queue))  # 0 = 무제한
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.bucket_key = bucket_key
+        self.admission = admission
+        self.tag = tag
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._tasks: set = set()
+
+        # 메트릭
+        self.batches = 0
+        self.items = 0
+        self.errors = 0
+        self.rejected = 0
+        self.size_hist: Counter = Counter()
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+        self.last_batch_size = 0
+        self.last_run_ms = 0.0
+        self.discarded_items = 0
+        self.discarded_ms: Counter = Counter()  # 태그별, 결과가 버려진 항목의 워커 실행 시간 몫
+
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, item: Any) -> Any:
+        self._ensure_worker()
+        if self.max_queue and self._queue.qsize() >= self.max_queue:
+            self.rejected += 1
+            raise QueueFull(self.name, self.max_queue)
+        if self.admission is None:
+            return await self._enqueue(item)
+        with self.admission.slot():
+            return await self._enqueue(item)
+
+    async def _enqueue(self, item: Any) -> Any:
+        fut = asyncio.get_running_loop().create_future()
+        tag = self.tag() if self.tag is not None else None
+        await self._queue.put((item, fut, time.perf_counter(), tag))
+        return await fut
+
+    async def _collect(self) -> list:
+        batch = [await self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def _split(self, batch: list) -> List[list]:
+        if self.bucket_key is None:
+            return [batch]
+        buckets: dict = {}
+        for entry in batch:
+            buckets.setdefault(self.bucket_key(entry[0]), []).append(entry)
+        return [buckets[k] for k in sorted(buckets)]
+
+    async def _run(self):
+        while True:
+            await self._slots.acquire()
+            batch = await self._collect()
+            # 이미 취소된 요청(클라이언트 이탈 등)은 제외
+            batch = [b for b in batch if not b[1].done()]
+            if not batch:
+                self._slots.release()
+                continue
+            for i, group in enumerate(self._split(batch)):
+                if i > 0:
+                    await self._slots.acquire()
+                task = asyncio.get_running_loop().create_task(self._execute(group))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    async def _execute(self, batch: list):
+        started = time.perf_counter()
+        for _, _, enq, _ in batch:
+            w = (started - enq) * 1000
+            self.wait_ms_total += w
+            self.wait_ms_max = max(self.wait_ms_max, w)
+
+        items = [b[0] for b in batch]
+        busy = [0.0]
+        try:
+            results = await self.runner(self._timed, items, busy)
+        except Exception as e:
+            self.errors += 1
+            self._count_discarded(batch, busy[0])
+            for _, fut, _, _ in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        finally:
+            self.last_run_ms = (time.perf_counter() - started) * 1000
+            self._slots.release()
+
+        # 결과를 넣기 전이므로 이미 done 인 future = 실행 중에 취소된 요청
+        self._count_discarded(batch, busy[0])
+        if self.admission is not None:
+            self.admission.observe(len(items), self.last_run_ms)
+        self.batches += 1
+        self.items += len(items)
+        self.size_hist[len(items)] += 1
+        self.last_batch_size = len(items)
+        for (_, fut, _, _), res in zip(batch, results):
+            if not fut.done():
+                fut.set_result(res)
+
+    def _timed(self, items: List[Any], busy: List[float]) -> Sequence[Any]:
+        # 워커 스레드 안에서 fn 자체의 실행 시간만 측정 (executor 대기 시간 제외)
+        started = time.perf_counter()
+        try:
+            return self.fn(items)
+        finally:
+            busy[0] = (time.perf_counter() - started) * 1000
+
+    def _count_discarded(self, batch: list, busy_ms: float):
+        dropped = [b for b in batch if b[1].done()]
+        if not dropped or not busy_ms:
+            return
+        share = busy_ms / len(batch)
+        self.discarded_items += len(dropped)
+        for *_, tag in dropped:
+            self.discarded_ms[tag] += share
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "batches": self.batches,
+            "items": self.items,
+            "errors": self.errors,
+            "rejected": self.rejected,
+            "avg_batch_size": round(self.items / self.batches, 3) if self.batches else 0.0,
+            "last_batch_size": self.last_batch_size,
+            "batch_size_hist": dict(sorted(self.size_hist.items())),
+            "avg_queue_wait_ms": round(self.wait_ms_total / self.items, 3) if self.items else 0.0,
+            "max_queue_wait_ms": round(self.wait_ms_max, 3),
+            "last_run_ms": round(self.last_run_ms, 3),
+            "discarded_items": self.discarded_items,
+            "discarded_ms": {str(k): round(v, 3) for k, v in self.discarded_ms.items()},
+        }
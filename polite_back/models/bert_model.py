@@ -1,70 +1,186 @@
 # polite_back/models/bert_model.py
 
-import torch
-import torch.nn as nn
-from transformers import ElectraTokenizer, ElectraModel
-import json
+# torch / transformers 는 모델을 실제로 로드할 때 import (서버 기동·DB 전용 워커 시작 시간 단축)
 import os
+import threading
+import time
+from typing import List, Sequence, Tuple
+
+from polite_back.models import lexicon
+from polite_back.models.tokenization import BatchTokenizer
 
 CACHE_DIR = os.environ.get("TRANSFORMERS_CACHE", "/tmp/huggingface/transformers")
 
-# 욕설 사전 불러오기
-base_dir = os.path.dirname(os.path.abspath(__file__))
-json_path = os.path.join(base_dir, "word_list.json")
-with open(json_path, "r", encoding="utf-8") as f:
-    badword_dict = json.load(f)
-badword_list = badword_dict["words"]
+# 추론 백엔드: torch(기본) | onnx | onnx-int8 (onnx 계열은 requirements-onnx.txt 설치 필요)
+BERT_BACKEND = os.environ.get("BERT_BACKEND", "torch").lower()
+BERT_ONNX_DIR = os.environ.get("BERT_ONNX_DIR", os.path.join(CACHE_DIR, "koelectra-onnx"))
 
 MODEL_NAME = "monologg/koelectra-base-v3-discriminator"
 WEIGHTS_URL = "https://huggingface.co/H0jinPark/KoELECTRA-hatespeech/resolve/main/pytorch_model.bin"
+TOKENIZER_NAME = "H0jinPark/KoELECTRA-hatespeech"
+MAX_LENGTH = 128
+# 배치의 패딩 비율이 BUCKET_MAX_PADDING 을 넘으면 토큰 길이 구간(폭)별로 나눠 forward (0: 나누지 않음)
+ELECTRA_BUCKET_TOKENS = int(os.environ.get("ELECTRA_BUCKET_TOKENS", "32"))
+LEXICON_PROB = 0.9  # 욕설 사전 매칭 시 고정 확률
 
 # 전역 싱글톤 (지연 로딩)
 _tokenizer = None
 _model = None
-_device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+_device = None
+_load_lock = threading.Lock()  # 백그라운드 워밍업과 첫 요청이 동시에 로드하지 않도록
+load_ms = None  # 마지막 로드 소요 시간 (/ready 에 표시)
+
+def __getattr__(name):
+    # 기존 import 경로 호환: from polite_back.models.bert_model import KoElectraClassifier
+    if name == "KoElectraClassifier":
+        from polite_back.models.koelectra import KoElectraClassifier
+        return KoElectraClassifier
+    raise AttributeError(name)
+
+def _get_device():
+    global _device
+    if _device is None:
+        import torch
+        _device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    return _device
+
+def _load_tokenizer():
+    # Rust fast tokenizer (vocab.txt 만 있으면 로드 시 변환)
+    from transformers import ElectraTokenizerFast
+    from polite_back.models import artifacts
+
+    if artifacts.MODEL_ARTIFACTS:
+        root = artifacts.ensure_electra(MODEL_NAME, WEIGHTS_URL, TOKENIZER_NAME)
+        return artifacts.load_electra_tokenizer(root)
+    return ElectraTokenizerFast.from_pretrained(TOKENIZER_NAME)
 
-class KoElectraClassifier(nn.Module):
-    def __init__(self):
-        super().__init__()
-        self.electra = ElectraModel.from_pretrained(MODEL_NAME)
-        self.classifier = nn.Linear(self.electra.config.hidden_size, 1)
+def _build_torch_model(device=None):
+    import torch
+    from polite_back.models import artifacts
+    from polite_back.models.koelectra import KoElectraClassifier
 
-    def forward(self, input_ids, attention_mask):
-        outputs = self.electra(input_ids=input_ids, attention_mask=attention_mask)
-        cls_token = outputs.last_hidden_state[:, 0, :]
-        logits = self.classifier(cls_token)
-        return logits.squeeze(-1)
+    device = device or _get_device()
+    if artifacts.MODEL_ARTIFACTS:
+        # 로컬 safetensors 아티팩트(없으면 1회 변환)에서 mmap 로드
+        root = artifacts.ensure_electra(MODEL_NAME, WEIGHTS_URL, TOKENIZER_NAME)
+        return artifacts.load_electra(root, device)
+    model = KoElectraClassifier(MODEL_NAME)
+    state_dict = torch.hub.load_state_dict_from_url(WEIGHTS_URL, map_location=device)
+    model.load_state_dict(state_dict)
+    model.to(device)
+    return model.eval()
+
+# 토큰 id 는 텍스트별로 캐시 (모델을 해제했다 다시 로드해도 같은 vocab 이므로 유지)
+tokens = BatchTokenizer("electra", lambda: _tokenizer, max_length=MAX_LENGTH, bucket_width=ELECTRA_BUCKET_TOKENS)
+
+def is_loaded() -> bool:
+    return _model is not None
 
 def _ensure_loaded():
-    global _tokenizer, _model
-    if _model is None:
-        torch.set_num_threads(1)  
-        _tokenizer = ElectraTokenizer.from_pretrained("H0jinPark/KoELECTRA-hatespeech")
-        model = KoElectraClassifier()
-        state_dict = torch.hub.load_state_dict_from_url(WEIGHTS_URL, map_location=_device)
-        model.load_state_dict(state_dict)
-        model.to(_device)
-        _model = model.eval()
+    global _tokenizer, _model, load_ms
+    if _model is not None:
+        return
+    with _load_lock:
+        if _model is not None:
+            return
+        import torch
+        from polite_back.models import artifacts, cores
+        from polite_back.models.registry import models
 
-def predict(text, threshold=0.5):
-    for word in badword_list:
-        if word in text:
-            return 1, 0.9
+        models.before_load("electra")  # 메모리 예산 초과 시 유휴 모델 해제
+        started = time.perf_counter()
+        rss_before = artifacts.rss_mb()
+        # 워커 스레드는 executor initializer 가 설정, 여기서는 executor 밖(벤치마크 등)에서 로드될 때의 기본값
+        torch.set_num_threads(cores.threads_for("electra"))
+        tokenizer = _load_tokenizer()
+        if BERT_BACKEND == "torch":
+            model = _build_torch_model()
+        else:
+            from polite_back.models import bert_onnx
+            model = bert_onnx.load_session(
+                BERT_BACKEND, BERT_ONNX_DIR, lambda: _build_torch_model(torch.device("cpu")),
+                num_threads=cores.threads_for("electra"),
+            )
+        _tokenizer = tokenizer
+        _model = model
+        load_ms = (time.perf_counter() - started) * 1000
+        rss = artifacts.rss_mb()
+        print(f"[bert_model] loaded ({BERT_BACKEND}) in {load_ms:.0f}ms, RSS {rss:.0f}MB (+{rss - rss_before:.0f}MB)")
+        models.after_load("electra")
 
+def unload() -> bool:
+    """
+    모델 해제 (registry 가 유휴·메모리 예산 초과 시 호출, 다음 요청에서 다시 로드).
+    로드 중이면 기다리지 않고 False.
+    """
+    global _tokenizer, _model
+    if not _load_lock.acquire(blocking=False):
+        return False
+    try:
+        if _model is None:
+            return False
+        _tokenizer = None
+        _model = None
+        return True
+    finally:
+        _load_lock.release()
+
+def warmup(lengths: Sequence[int] = (16, 64, MAX_LENGTH), batch_size: int = 4) -> None:
+    """
+    대표 길이(토큰)별 더미 배치로 forward 1회씩 → 첫 사용자 요청 전에 커널 선택/메모리 할당을 끝내 둔다.
+    사전·캐시를 거치지 않고 모델만 호출.
+    """
     _ensure_loaded()
+    for n in lengths:
+        enc = tokens.encode(["안녕하세요 " * n] * batch_size, max_length=min(n, MAX_LENGTH), use_cache=False)
+        inputs = tokens.collate(enc)
+        _forward_proba(inputs["input_ids"], inputs["attention_mask"])
+
+def _forward_proba(input_ids, attention_mask) -> List[float]:
+    if BERT_BACKEND != "torch":
+        return _model.predict_proba(input_ids.numpy(), attention_mask.numpy())
 
-    # 동적 패딩(배치=1에서는 PAD 불필요) + 길이는 기존과 동일하게 max_length=128 유지
-    inputs = _tokenizer(text, return_tensors="pt", truncation=True, max_length=128)
-    input_ids = inputs["input_ids"].to(_device)
-    attention_mask = inputs["attention_mask"].to(_device)
+    import torch
 
+    device = _get_device()
+    input_ids = input_ids.to(device)
+    attention_mask = attention_mask.to(device)
     # inference_mode: 그래프/grad 버퍼 완전 OFF (출력 동일)
     with torch.inference_mode():
         logits = _model(input_ids=input_ids, attention_mask=attention_mask)
-        prob = torch.sigmoid(logits)
-        pred = (prob > threshold).int().item()
-
+        probs = torch.sigmoid(logits).tolist()
     # 임시 텐서 참조 해제(파편화 완화)
     del input_ids, attention_mask, logits
+    return probs
+
+def predict(text, threshold=0.5):
+    return decide(score_batch([text])[0], threshold)
+
+def score_batch(texts: List[str]) -> List[Tuple[float, bool]]:
+    """
+    여러 문장을 한 번의 forward로 채점해 (prob, lexicon_hit) 목록 반환.
+    길이 차이가 커서 패딩 비율이 BUCKET_MAX_PADDING 을 넘는 배치만 길이 구간별로 나눠 여러 번 forward.
+    사전 매칭 문장은 모델을 거치지 않으며 임계값과 무관하게 초과로 판정된다(decide 참고).
+    """
+    scores: List[Tuple[float, bool]] = [(LEXICON_PROB, True)] * len(texts)
+    todo = [i for i, t in enumerate(texts) if lexicon.search(t) is None]
+    if not todo:
+        return scores
+
+    _ensure_loaded()
+
+    enc = tokens.encode([texts[i] for i in todo])
+    # 그룹(보통 배치 전체 하나) 내 최장 길이에 맞춰 동적 패딩
+    for bucket in tokens.buckets(enc):
+        inputs = tokens.collate([enc[j] for j in bucket])
+        probs = _forward_proba(inputs["input_ids"], inputs["attention_mask"])
+        for j, p in zip(bucket, probs):
+            scores[todo[j]] = (float(p), False)
+    return scores
 
-    return pred, float(prob.item())
+def decide(score: Tuple[float, bool], threshold: float = 0.5) -> Tuple[int, float]:
+    """score_batch 결과에 임계값 적용 → predict와 같은 (pred, prob)."""
+    prob, lexicon_hit = score
+    if lexicon_hit:
+        return 1, prob
+    return int(prob > threshold), prob
@@ -0,0 +1,92 @@
+# polite_back/models/bert_onnx.py
+# KoElectraClassifier → ONNX 변환 및 ONNX Runtime(CPU) 추론 백엔드
+# onnx / onnxruntime 은 BERT_BACKEND=onnx|onnx-int8 일 때만 필요 (선택 의존성, requirements-onnx.txt)
+
+import os
+from typing import List
+
+import torch
+
+OPSET = 17
+
+
+def onnx_paths(onnx_dir: str) -> dict:
+    return {
+        "onnx": os.path.join(onnx_dir, "koelectra_cls.onnx"),
+        "onnx-int8": os.path.join(onnx_dir, "koelectra_cls.int8.onnx"),
+    }
+
+
+def export_onnx(model: torch.nn.Module, path: str, seq_len: int = 16):
+    """ELECTRA encoder + linear head 를 (batch, seq) 동적 축으로 내보냄."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    model = model.eval().to("cpu")
+    input_ids = torch.ones(2, seq_len, dtype=torch.long)
+    attention_mask = torch.ones(2, seq_len, dtype=torch.long)
+    tmp = path + ".tmp"
+    with torch.inference_mode():
+        torch.onnx.export(
+            model,
+            (input_ids, attention_mask),
+            tmp,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["logits"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "seq"},
+                "attention_mask": {0: "batch", 1: "seq"},
+                "logits": {0: "batch"},
+            },
+            opset_version=OPSET,
+            dynamo=False,
+        )
+    os.replace(tmp, path)  # 여러 워커가 동시에 내보내도 반쯤 쓴 파일을 읽지 않도록
+
+
+def quantize_int8(src: str, dst: str):
+    """가중치 동적 int8 양자화 (활성값은 실행 시 양자화)."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    tmp = dst + ".tmp"
+    quantize_dynamic(src, tmp, weight_type=QuantType.QInt8)
+    os.replace(tmp, dst)
+
+
+class OnnxClassifier:
+    """KoElectraClassifier 와 같은 입력을 받아 sigmoid 확률 목록을 반환."""
+
+    def __init__(self, path: str, num_threads: int = 1):
+        import onnxruntime as ort
+
+        opts = ort.SessionOptions()
+        opts.intra_op_num_threads = num_threads
+        opts.inter_op_num_threads = 1
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.path = path
+        self.session = ort.InferenceSession(path, sess_options=opts, providers=["CPUExecutionProvider"])
+
+    def predict_proba(self, input_ids, attention_mask) -> List[float]:
+        import numpy as np
+
+        (logits,) = self.session.run(
+            ["logits"],
+            {
+                "input_ids": np.asarray(input_ids, dtype=np.int64),
+                "attention_mask": np.asarray(attention_mask, dtype=np.int64),
+            },
+        )
+        return (1.0 / (1.0 + np.exp(-logits.astype(np.float64)))).reshape(-1).tolist()
+
+
+def load_session(backend: str, onnx_dir: str, build_torch_model, num_threads: int = 1) -> OnnxClassifier:
+    """
+    backend 에 맞는 ONNX 파일이 없으면 build_torch_model() 로 PyTorch 모델을 만들어 1회 변환.
+    이후 기동부터는 변환된 파일만 읽는다.
+    """
+    paths = onnx_paths(onnx_dir)
+    if backend not in paths:
+        raise ValueError(f"unknown onnx backend: {backend}")
+    if not os.path.exists(paths["onnx"]):
+        export_onnx(build_torch_model(), paths["onnx"])
+    if backend == "onnx-int8" and not os.path.exists(paths["onnx-int8"]):
+        quantize_int8(paths["onnx"], paths["onnx-int8"])
+    return OnnxClassifier(paths[backend], num_threads=num_threads)
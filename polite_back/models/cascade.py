@@ -0,0 +1,244 @@
+# polite_back/models/cascade.py
+# ELECTRA 앞단 저비용 분류기: 문자 n-gram 해싱 + 로지스틱 회귀 (comments.original_logit 을 정답으로 증류)
+# 임계값에서 충분히 먼 확률이면 ELECTRA 없이 판정하고, 임계 주변(band)만 ELECTRA 로 넘긴다.
+#
+# 학습 (오프라인):
+#   python -m polite_back.models.cascade --out /path/cascade.npz            # DATABASE_URL 의 comments 테이블
+#   python -m polite_back.models.cascade --csv data.csv --out cascade.npz   # text,prob 헤더 CSV
+# 주의: 캐스케이드로 판정된 댓글은 original_logit 에 캐스케이드 확률이 저장되므로, 재학습 시 자기 출력이 일부 섞인다.
+
+import argparse
+import json
+import math
+import os
+import random
+import time
+import zlib
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+CACHE_DIR = os.environ.get("TRANSFORMERS_CACHE", "/tmp/huggingface/transformers")
+CASCADE_MODEL_PATH = os.environ.get("CASCADE_MODEL_PATH", os.path.join(CACHE_DIR, "cascade.npz"))
+CASCADE_ENABLED = os.environ.get("CASCADE_ENABLED", "1") != "0"
+# 임계값 ± margin 안쪽(불확실 구간)만 ELECTRA 로 넘김
+CASCADE_MARGIN = float(os.environ.get("CASCADE_MARGIN", "0.3"))
+# 포스트 임계값별 margin: "0.5:0.3,0.8:0.2" → 가장 가까운 임계값의 margin 사용
+CASCADE_BANDS = os.environ.get("CASCADE_BANDS", "")
+
+DIM_BITS = 18
+NGRAMS = (1, 2, 3)
+
+
+def _parse_bands(spec: str) -> List[Tuple[float, float]]:
+    bands = []
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        th, margin = part.split(":")
+        bands.append((float(th), float(margin)))
+    return bands
+
+
+def features(text: str, dim_bits: int = DIM_BITS, ngrams: Sequence[int] = NGRAMS) -> Tuple[np.ndarray, np.ndarray]:
+    """정규화 텍스트 → (해시 버킷 인덱스, L2 정규화된 log(1+count) 값)."""
+    padded = f" {text} "
+    mask = (1 << dim_bits) - 1
+    counts: Counter = Counter()
+    for n in ngrams:
+        for i in range(len(padded) - n + 1):
+            counts[zlib.crc32(padded[i:i + n].encode("utf-8")) & mask] += 1
+    if not counts:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+    idx = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+    val = np.log1p(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+    val /= np.linalg.norm(val)
+    return idx, val
+
+
+class CascadeModel:
+    def __init__(self, weights: np.ndarray, bias: float, meta: Optional[dict] = None):
+        self.weights = weights
+        self.bias = float(bias)
+        self.meta = meta or {}
+        self.dim_bits = int(self.meta.get("dim_bits", DIM_BITS))
+
+    def predict_proba(self, text: str) -> float:
+        idx, val = features(text, self.dim_bits)
+        z = float(self.weights[idx] @ val) + self.bias
+        return 1.0 / (1.0 + math.exp(-max(-30.0, min(30.0, z))))
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = path + ".tmp.npz"
+        np.savez_compressed(tmp, weights=self.weights, bias=np.float32(self.bias), meta=json.dumps(self.meta))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "CascadeModel":
+        with np.load(path) as f:
+            return cls(f["weights"].astype(np.float32), float(f["bias"]), json.loads(str(f["meta"])))
+
+
+def train(
+    rows: Sequence[Tuple[str, float]],
+    epochs: int = 5,
+    lr: float = 0.5,
+    l2: float = 1e-6,
+    dim_bits: int = DIM_BITS,
+    seed: int = 0,
+) -> CascadeModel:
+    """soft label(ELECTRA 확률) 로지스틱 회귀, AdaGrad SGD."""
+    rng = random.Random(seed)
+    data = [(features(t, dim_bits), p) for t, p in rows]
+    w = np.zeros(1 << dim_bits, dtype=np.float32)
+    g2 = np.full(1 << dim_bits, 1e-8, dtype=np.float32)
+    b, gb2 = 0.0, 1e-8
+    for _ in range(epochs):
+        rng.shuffle(data)
+        for (idx, val), y in data:
+            z = float(w[idx] @ val) + b
+            grad = 1.0 / (1.0 + math.exp(-max(-30.0, min(30.0, z)))) - y
+            gw = grad * val + l2 * w[idx]
+            g2[idx] += gw * gw
+            w[idx] -= lr * gw / np.sqrt(g2[idx])
+            gb2 += grad * grad
+            b -= lr * grad / math.sqrt(gb2)
+    return CascadeModel(w, b, {"dim_bits": dim_bits, "ngrams": list(NGRAMS), "samples": len(rows), "trained_at": time.time()})
+
+
+class Cascade:
+    """
+    decide(): 확률이 임계값 ± margin 밖이면 (prob, False) 반환(ELECTRA 생략), 안쪽이면 None(ELECTRA 로 넘김).
+    모델 파일이 없거나 CASCADE_ENABLED=0 이면 항상 None.
+    """
+
+    def __init__(self, path: str = CASCADE_MODEL_PATH, margin: float = CASCADE_MARGIN, bands: str = CASCADE_BANDS):
+        self.path = path
+        self.margin = margin
+        self.bands = _parse_bands(bands)
+        self.model: Optional[CascadeModel] = None
+        self.counts: Counter = Counter()
+        if CASCADE_ENABLED and path and os.path.exists(path):
+            try:
+                self.model = CascadeModel.load(path)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"[cascade] disabled: {e}")
+
+    def margin_for(self, threshold: float) -> float:
+        if not self.bands:
+            return self.margin
+        return min(self.bands, key=lambda b: abs(b[0] - threshold))[1]
+
+    def decide(self, text: str, threshold: float) -> Optional[Tuple[float, bool]]:
+        if self.model is None:
+            return None
+        prob = self.model.predict_proba(text)
+        margin = self.margin_for(threshold)
+        if prob <= threshold - margin:
+            self.counts["benign"] += 1
+            return prob, False
+        if prob > threshold + margin:
+            self.counts["toxic"] += 1
+            return prob, False
+        self.counts["escalated"] += 1
+        return None
+
+    def stats(self) -> dict:
+        total = sum(self.counts.values())
+        skipped = self.counts["benign"] + self.counts["toxic"]
+        return {
+            "enabled": self.model is not None,
+            "path": self.path,
+            "margin": self.margin,
+            "bands": self.bands,
+            "calls": total,
+            "skipped_benign": self.counts["benign"],
+            "skipped_toxic": self.counts["toxic"],
+            "escalated": self.counts["escalated"],
+            "skip_fraction": round(skipped / total, 4) if total else 0.0,
+            "meta": self.model.meta if self.model is not None else None,
+        }
+
+
+def evaluate(model: CascadeModel, rows: Sequence[Tuple[str, float]], thresholds: Iterable[float], margins: Iterable[float]) -> List[Dict]:
+    """검증 데이터에서 임계값·margin 별 생략 비율과 생략한 것 중 ELECTRA 판정과 다른 비율."""
+    probs = np.array([model.predict_proba(t) for t, _ in rows])
+    ref = np.array([p for _, p in rows])
+    out = []
+    for th in thresholds:
+        for m in margins:
+            skip = (probs <= th - m) | (probs > th + m)
+            wrong = skip & ((probs > th) != (ref > th))
+            out.append({
+                "threshold": th,
+                "margin": m,
+                "skip_fraction": float(skip.mean()) if len(rows) else 0.0,
+                "disagree_rate": float(wrong.sum() / max(1, skip.sum())),
+            })
+    return out
+
+
+def _load_rows_db() -> List[Tuple[str, float]]:
+    import asyncio
+
+    from sqlalchemy import select
+
+    from polite_back.database import async_session
+    from polite_back.model import Comment
+
+    async def _fetch():
+        async with async_session() as db:
+            res = await db.execute(
+                select(Comment.text_original, Comment.original_logit).where(
+                    Comment.text_original.isnot(None), Comment.original_logit.isnot(None)
+                )
+            )
+            return [(t, float(p)) for t, p in res.all()]
+
+    return asyncio.run(_fetch())
+
+
+def _load_rows_csv(path: str) -> List[Tuple[str, float]]:
+    import csv
+
+    with open(path, encoding="utf-8", newline="") as f:
+        return [(r["text"], float(r["prob"])) for r in csv.DictReader(f)]
+
+
+def main():
+    from polite_back.models import lexicon
+    from polite_back.models.score_cache import normalize_text
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--out", default=CASCADE_MODEL_PATH)
+    ap.add_argument("--csv", default=None, help="text,prob 헤더 CSV (없으면 DB 의 comments 사용)")
+    ap.add_argument("--epochs", type=int, default=5)
+    ap.add_argument("--val", type=float, default=0.1)
+    ap.add_argument("--thresholds", type=float, nargs="+", default=[0.5, 0.7])
+    ap.add_argument("--margins", type=float, nargs="+", default=[0.1, 0.2, 0.3, 0.4])
+    args = ap.parse_args()
+
+    rows = _load_rows_csv(args.csv) if args.csv else _load_rows_db()
+    # 사전 매칭 문장은 고정 확률(LEXICON_PROB)로 저장돼 있고 캐스케이드 앞단에서 처리되므로 제외
+    rows = [(normalize_text(t), min(1.0, max(0.0, p))) for t, p in rows if t and lexicon.search(t) is None]
+    random.Random(0).shuffle(rows)
+    n_val = int(len(rows) * args.val)
+    val, tr = rows[:n_val], rows[n_val:]
+    print(f"train={len(tr)} val={len(val)}")
+
+    t0 = time.perf_counter()
+    model = train(tr, epochs=args.epochs)
+    print(f"trained in {time.perf_counter() - t0:.1f}s")
+    if val:
+        mae = float(np.mean([abs(model.predict_proba(t) - p) for t, p in val]))
+        model.meta["val_mae"] = mae
+        print(f"val MAE vs ELECTRA: {mae:.4f}")
+        print(f"{'th':>5} {'margin':>6} {'skip':>6} {'disagree':>8}")
+        for r in evaluate(model, val, args.thresholds, args.margins):
+            print(f"{r['threshold']:>5.2f} {r['margin']:>6.2f} {r['skip_fraction']:>6.3f} {r['disagree_rate']:>8.4f}")
+    model.save(args.out)
+    print(f"saved → {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+# polite_back/models/cores.py
+# 추론 워커 CPU 배치: 컨테이너(cgroup) 한도를 반영해 사용 가능한 코어 수를 구하고
+# ELECTRA / KoBART 워커에 코어를 나눠 워커별 intra-op 스레드 수와 코어 고정(affinity)을 정한다.
+#
+# 환경변수 (지정하지 않으면 자동):
+#   INFERENCE_CPUS        사용할 코어 수 (기본: cgroup quota·affinity 중 작은 값)
+#   ELECTRA_CORE_SHARE    ELECTRA 에 줄 코어 비율 (기본 0.25, 최소 1코어)
+#   ELECTRA_WORKERS / ELECTRA_THREADS, KOBART_WORKERS / KOBART_THREADS   워커 수 × 워커당 스레드
+#   PIN_CORES             auto(기본: cpuset 이 quota 와 같을 때만) | 1 | 0
+# 현재 배치: GET /bert/stats 의 "cores", 레이아웃별 처리량: python -m polite_back.benchmarks.bench_cores
+
+import itertools
+import math
+import os
+import threading
+from typing import Dict, List, Optional
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def cgroup_cpu_limit() -> Optional[float]:
+    """cgroup CPU quota (코어 단위). 제한이 없거나 읽을 수 없으면 None."""
+    # cgroup v2: "max 100000" | "200000 100000"
+    v2 = _read("/sys/fs/cgroup/cpu.max")
+    if v2:
+        quota, _, period = v2.partition(" ")
+        if quota != "max" and period:
+            return int(quota) / int(period)
+        return None
+    # cgroup v1
+    quota = _read("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") or _read("/sys/fs/cgroup/cpu,cpuacct/cpu.cfs_quota_us")
+    period = _read("/sys/fs/cgroup/cpu/cpu.cfs_period_us") or _read("/sys/fs/cgroup/cpu,cpuacct/cpu.cfs_period_us")
+    if quota and period and int(quota) > 0:
+        return int(quota) / int(period)
+    return None
+
+
+def affinity() -> List[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def available_cpus() -> int:
+    """os.cpu_count() 는 호스트 전체 코어 수라 컨테이너에서는 과대 → quota 와 cpuset 중 작은 값."""
+    n = len(affinity())
+    quota = cgroup_cpu_limit()
+    if quota is not None:
+        n = min(n, max(1, math.ceil(quota - 1e-6)))
+    return max(1, n)
+
+
+class ModelLayout:
+    def __init__(self, name: str, workers: int, threads: int, cores: List[int]):
+        self.name = name
+        self.workers = workers
+        self.threads = threads
+        self.cores = cores  # 이 모델에 배정된 코어 (pin 하지 않으면 참고용)
+        self.pinned: Dict[str, List[int]] = {}  # 워커 스레드 이름 → 고정된 코어
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+
+    def worker_cores(self, index: int) -> List[int]:
+        """index 번째 워커의 코어: 배정 코어를 threads 개씩 순환 분배."""
+        if not self.cores:
+            return []
+        start = (index * self.threads) % len(self.cores)
+        return [self.cores[(start + k) % len(self.cores)] for k in range(min(self.threads, len(self.cores)))]
+
+    def init_worker(self, pin: bool):
+        """InferenceExecutor 워커 스레드 initializer: 스레드 수 설정 + (선택) 코어 고정."""
+        with self._lock:
+            index = next(self._ids)
+        try:
+            import torch
+
+            # OpenMP 스레드 수는 호출한 스레드 기준 → 워커마다 따로 적용
+            torch.set_num_threads(self.threads)
+        except ImportError:
+            pass
+        if pin and hasattr(os, "sched_setaffinity"):
+            cores = self.worker_cores(index)
+            try:
+                # pid 0 = 호출 스레드 (이후 생성되는 OpenMP 스레드도 상속)
+                os.sched_setaffinity(0, cores)
+                self.pinned[threading.current_thread().name] = cores
+            except OSError as e:
+                print(f"[cores] pin {self.name} worker {index} failed: {e}")
+
+    def to_dict(self) -> dict:
+        return {
+            "workers": self.workers,
+            "threads_per_worker": self.threads,
+            "cores": self.cores,
+            "pinned": self.pinned,
+        }
+
+
+def _env_int(name: str) -> Optional[int]:
+    value = os.environ.get(name)
+    return int(value) if value else None
+
+
+def plan(cpus: Optional[int] = None) -> Dict[str, ModelLayout]:
+    """
+    코어 분배. 1코어면 기존과 같이 두 모델이 같은 코어를 1스레드로 공유 (ELECTRA 1워커, KoBART 2워커).
+    KoBART 는 코어 수와 무관하게 최소 2워커.
+    ELECTRA 는 마이크로 배치를 1워커가 여러 스레드로 처리, KoBART 는 요청별 생성이 길어 워커를 늘린다.
+    """
+    cpus = cpus or _env_int("INFERENCE_CPUS") or available_cpus()
+    ids = affinity()
+    # INFERENCE_CPUS 가 cpuset 보다 크면 코어 번호는 순환 (고정 시 같은 코어를 공유)
+    core_ids = [ids[i % len(ids)] for i in range(cpus)]
+    if cpus == 1:
+        e_cores, k_cores = core_ids, core_ids
+    else:
+        share = float(os.environ.get("ELECTRA_CORE_SHARE", "0.25"))
+        n_electra = min(cpus - 1, max(1, round(cpus * share)))
+        e_cores, k_cores = core_ids[:n_electra], core_ids[n_electra:]
+
+    e_workers = _env_int("ELECTRA_WORKERS") or 1
+    e_threads = _env_int("ELECTRA_THREADS") or max(1, len(e_cores) // e_workers)
+    k_threads = _env_int("KOBART_THREADS") or (1 if len(k_cores) <= 2 else 2)
+    # 최소 2워커 (기존 기본값: 스트리밍과 배치 생성이 서로 막지 않도록), 나누어떨어지지 않는 남는 코어는
+    # 올림으로 워커를 하나 더 두어 놀리지 않음 (worker_cores 가 순환 배정하므로 한 코어를 두 워커가 공유)
+    k_workers = _env_int("KOBART_WORKERS") or max(2, math.ceil(len(k_cores) / k_threads))
+    return {
+        "electra": ModelLayout("electra", e_workers, e_threads, e_cores),
+        "kobart": ModelLayout("kobart", k_workers, k_threads, k_cores),
+    }
+
+
+def _should_pin(cpus: int) -> bool:
+    mode = os.environ.get("PIN_CORES", "auto").lower()
+    if mode in ("1", "true"):
+        return True
+    if mode in ("0", "false") or cpus <= 1:
+        return False
+    # quota 만 걸린 경우(cpuset 은 더 넓음) 특정 코어에 묶으면 스케줄러 여유만 줄어듦
+    return len(affinity()) <= cpus
+
+
+CPUS = _env_int("INFERENCE_CPUS") or available_cpus()
+layout = plan(CPUS)
+PIN = _should_pin(CPUS)
+
+
+def threads_for(model: str) -> int:
+    return layout[model].threads
+
+
+def initializer(model: str):
+    lay = layout[model]
+    return lambda: lay.init_worker(PIN)
+
+
+def stats() -> dict:
+    return {
+        "available_cpus": available_cpus(),
+        "cgroup_quota": cgroup_cpu_limit(),
+        "affinity": affinity(),
+        "os_cpu_count": os.cpu_count(),
+        "inference_cpus": CPUS,
+        "pin": PIN,
+        "models": {name: lay.to_dict() for name, lay in layout.items()},
+    }
@@ -0,0 +1,122 @@
+# polite_back/models/executor.py
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from polite_back.models import cores
+from polite_back.models.registry import models
+
+
+class QueueFull(RuntimeError):
+    """대기열 한도 초과 (main.py에서 503으로 변환)."""
+
+    def __init__(self, name: str, limit: int):
+        super().__init__(f"{name} inference queue is full (limit={limit})")
+        self.name = name
+        self.limit = limit
+
+
+class InferenceExecutor:
+    """
+    모델 연산 전용 스레드 풀. 이벤트 루프는 결과만 await 하므로
+    KoBART beam search 중에도 DB 전용 엔드포인트가 지연되지 않는다.
+    실행 중 max_workers + 대기 max_queue 를 넘는 요청은 QueueFull.
+    model 을 지정하면 실행 중에는 registry 에 사용 중으로 표시 (유휴 해제 대상에서 제외).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int = 1,
+        max_queue: int = 32,
+        model: Optional[str] = None,
+        initializer: Optional[Callable[[], None]] = None,
+    ):
+        self.name = name
+        self.model = model
+        self.max_workers = max(1, int(max_workers))
+        self.max_queue = max(0, int(max_queue))
+        # initializer: 워커 스레드별 intra-op 스레드 수 / 코어 고정 (cores.py)
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix=f"infer-{name}", initializer=initializer
+        )
+        self._pending = 0  # 실행 중 + 대기 중 (완료 콜백은 워커 스레드에서 호출되므로 _lock 으로 보호)
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.rejected = 0
+        self.busy_ms_total = 0.0
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        return await self.submit(fn, *args, **kwargs)
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> "asyncio.Future":
+        """
+        run() 의 동기 버전: 대기열 한도 확인과 제출을 바로 하고 결과 future 반환.
+        QueueFull 을 await 전에 받아야 하는 경우(스트리밍 응답을 만들기 전 등)에 사용.
+        """
+        if self._pending >= self.capacity:
+            self.rejected += 1
+            raise QueueFull(self.name, self.capacity)
+        with self._lock:
+            self._pending += 1
+        try:
+            cfut = self._pool.submit(self._timed, fn, *args, **kwargs)
+        except BaseException:
+            self._release()
+            raise
+        # 대기하던 코루틴이 취소돼도 이미 시작된 작업은 스레드에서 계속 실행되므로,
+        # awaiter 의 finally 가 아니라 작업이 실제로 끝날 때(또는 시작 전 취소될 때) 감소
+        cfut.add_done_callback(self._release)
+        return asyncio.wrap_future(cfut)
+
+    def _release(self, _fut=None):
+        with self._lock:
+            self._pending -= 1
+
+    def _timed(self, fn, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            with models.use(self.model):
+                return fn(*args, **kwargs)
+        finally:
+            self.busy_ms_total += (time.perf_counter() - started) * 1000
+            self.completed += 1
+
+    def shutdown(self, wait: bool = False):
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_run_ms": round(self.busy_ms_total / self.completed, 3) if self.completed else 0.0,
+        }
+
+
+# 워커 수·스레드 수는 사용 가능한 코어(cgroup 반영)에서 자동 산정, ELECTRA_WORKERS 등으로 재정의 (cores.py)
+electra_executor = InferenceExecutor(
+    "electra",
+    max_workers=cores.layout["electra"].workers,
+    max_queue=int(os.environ.get("ELECTRA_QUEUE", "8")),
+    model="electra",
+    initializer=cores.initializer("electra"),
+)
+kobart_executor = InferenceExecutor(
+    "kobart",
+    max_workers=cores.layout["kobart"].workers,
+    max_queue=int(os.environ.get("KOBART_QUEUE", "16")),
+    model="kobart",
+    initializer=cores.initializer("kobart"),
+)
@@ -0,0 +1,140 @@
+# polite_back/models/gen_cache.py
+# KoBART 순화문 영구 캐시 (SQLite, WAL). 여러 uvicorn 워커가 같은 파일을 공유하고 재시작 후에도 유지된다.
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS gen_cache (
+    key        TEXT PRIMARY KEY,
+    output     TEXT NOT NULL,
+    size       INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_gen_cache_last_used ON gen_cache(last_used);
+"""
+
+
+def make_key(model_name: str, params: Dict[str, Any], text: str) -> str:
+    """입력 텍스트 + 모델명 + 디코딩 파라미터가 모두 같아야 같은 키."""
+    raw = json.dumps([model_name, params, text], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class GenerationCache:
+    def __init__(self, path: str, max_bytes: int = 64 * 1024 * 1024, evict_every: int = 32):
+        self.path = path
+        self.max_bytes = int(max_bytes)
+        self.evict_every = max(1, int(evict_every))
+        self._local = threading.local()
+        self._puts = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.errors = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 연결은 스레드 간 공유 불가 → executor 스레드마다 하나씩
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            conn = self._conn()
+            row = conn.execute("SELECT output FROM gen_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute("UPDATE gen_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+            self.hits += 1
+            return row[0]
+        except sqlite3.Error as e:
+            # 캐시 장애는 생성 경로를 막지 않음
+            self.errors += 1
+            print(f"[gen_cache] get failed: {e}")
+            return None
+
+    def put(self, key: str, output: str):
+        size = len(key) + len(output.encode("utf-8"))
+        now = time.time()
+        try:
+            conn = self._conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO gen_cache(key, output, size, created_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, output, size, now, now),
+            )
+            self._puts += 1
+            if self._puts % self.evict_every == 0:
+                self.evict()
+        except sqlite3.Error as e:
+            self.errors += 1
+            print(f"[gen_cache] put failed: {e}")
+
+    def total_bytes(self) -> int:
+        return int(self._conn().execute("SELECT COALESCE(SUM(size), 0) FROM gen_cache").fetchone()[0])
+
+    def evict(self):
+        """총 크기가 max_bytes 를 넘으면 오래 안 쓰인 항목부터 삭제 (목표: 90%)."""
+        conn = self._conn()
+        total = self.total_bytes()
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute("SELECT key, size FROM gen_cache ORDER BY last_used ASC").fetchall()
+            victims = []
+            for key, size in rows:
+                if total <= target:
+                    break
+                victims.append((key,))
+                total -= size
+            conn.executemany("DELETE FROM gen_cache WHERE key = ?", victims)
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+        self.evictions += len(victims)
+
+    def stats(self) -> dict:
+        try:
+            row = self._conn().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM gen_cache").fetchone()
+        except sqlite3.Error:
+            row = (None, None)
+        return {
+            "path": self.path,
+            "entries": row[0],
+            "bytes": row[1],
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "errors": self.errors,
+        }
+
+
+def open_cache(path: str, max_bytes: int) -> Optional[GenerationCache]:
+    """경로가 비었거나 열 수 없으면 캐시 없이 동작."""
+    if not path:
+        return None
+    try:
+        return GenerationCache(path, max_bytes=max_bytes)
+    except (OSError, sqlite3.Error) as e:
+        print(f"[gen_cache] disabled: {e}")
+        return None
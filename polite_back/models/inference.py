@@ -0,0 +1,586 @@
+# polite_back/models/inference.py
+# 라우터에서 사용하는 비동기 추론 진입점
+
+import asyncio
+import contextvars
+import os
+import re
+import threading
+import time
+from collections import Counter
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from polite_back.models import bert_model, cores, kobart_model, lexicon, segments
+from polite_back.models.admission import (
+    ELECTRA_SLO_MS,
+    KOBART_SLO_MS,
+    AdmissionController,
+)
+from polite_back.models.batcher import MicroBatcher
+from polite_back.models.cascade import Cascade
+from polite_back.models.executor import electra_executor, kobart_executor
+from polite_back.models.jobs import JobQueue
+from polite_back.models.registry import models
+from polite_back.models.remote import MODEL_SERVER, ModelClient
+from polite_back.models.score_cache import LRUCache, normalize_text, text_key
+from polite_back.models.singleflight import SingleFlight
+
+BERT_MAX_BATCH = int(os.environ.get("BERT_MAX_BATCH", "16"))
+BERT_MAX_WAIT_MS = float(os.environ.get("BERT_MAX_WAIT_MS", "10"))
+BERT_MAX_QUEUE = int(os.environ.get("BERT_MAX_QUEUE", "256"))
+KOBART_MAX_BATCH = int(os.environ.get("KOBART_MAX_BATCH", "8"))
+KOBART_MAX_WAIT_MS = float(os.environ.get("KOBART_MAX_WAIT_MS", "20"))
+KOBART_MAX_QUEUE = int(os.environ.get("KOBART_MAX_QUEUE", "64"))
+KOBART_BUCKET_CHARS = int(os.environ.get("KOBART_BUCKET_CHARS", "32"))  # 길이 구간 폭(문자)
+# 순화문 디코딩: beam(기존 5-beam) | adaptive(greedy 후 임계 초과 시에만 beam)
+KOBART_DECODING = os.environ.get("KOBART_DECODING", "beam").lower()
+ADAPTIVE_BUDGET_MS = float(os.environ.get("ADAPTIVE_BUDGET_MS", "4000"))
+BEAM_COST_FACTOR = 3.0  # beam 예상 소요 ≈ greedy 소요 * factor (예산 부족 판단용)
+# 추측 실행: off | hint(사전 매칭/자모 욕설 패턴일 때만) | always
+SPECULATIVE_SUGGEST = os.environ.get("SPECULATIVE_SUGGEST", "hint").lower()
+# beam 후보 재순위: k>1 이면 상위 k개 후보를 한 배치로 채점해 가장 덜 공격적인 후보 선택
+KOBART_RERANK_K = int(os.environ.get("KOBART_RERANK_K", "1"))
+SCORE_CACHE_SIZE = int(os.environ.get("SCORE_CACHE_SIZE", "4096"))  # 0이면 비활성화
+SCORE_CACHE_TTL = float(os.environ.get("SCORE_CACHE_TTL", "3600"))
+# 채점 단위: whole(댓글 전체, 128 토큰에서 잘림) | segment(문장/윈도우별 채점 후 최댓값 집계)
+SCORE_MODE = os.environ.get("SCORE_MODE", "whole").lower()
+
+# 예상 대기 시간 기반 입장 제어 (초기 항목당 비용은 첫 배치 이후 실측 EWMA 로 대체)
+electra_admission = AdmissionController(
+    "electra", electra_executor.max_workers, ELECTRA_SLO_MS,
+    initial_cost_ms=float(os.environ.get("ELECTRA_INITIAL_COST_MS", "50")),
+)
+kobart_admission = AdmissionController(
+    "kobart", kobart_executor.max_workers, KOBART_SLO_MS,
+    initial_cost_ms=float(os.environ.get("KOBART_INITIAL_COST_MS", "1500")),
+)
+
+# 추측 생성 경로에서 제출한 배치 항목 표시 (폐기된 추측 작업의 실제 워커 시간 집계용)
+_speculative: contextvars.ContextVar = contextvars.ContextVar("speculative", default=False)
+
+
+def _spec_tag() -> str:
+    return "speculative" if _speculative.get() else "request"
+
+
+electra_batcher = MicroBatcher(
+    bert_model.score_batch,
+    max_batch_size=BERT_MAX_BATCH,
+    max_wait_ms=BERT_MAX_WAIT_MS,
+    name="electra",
+    runner=electra_executor.run,
+    max_queue=BERT_MAX_QUEUE,
+    max_concurrency=electra_executor.max_workers,
+    admission=electra_admission,
+    tag=_spec_tag,
+)
+
+def _refine_items(items):
+    # 같은 버킷 = 같은 디코딩 파라미터
+    params = dict(items[0][1])
+    texts = [text for text, _ in items]
+    # 영구 캐시는 _generate 에서 제출 전에 조회 → 여기에는 미스만 옴
+    if params.get("num_return_sequences", 1) > 1:
+        return kobart_model.candidates_batch(texts, params, lookup=False)
+    return kobart_model.refine_batch(texts, params, lookup=False)
+
+
+kobart_batcher = MicroBatcher(
+    _refine_items,
+    max_batch_size=KOBART_MAX_BATCH,
+    max_wait_ms=KOBART_MAX_WAIT_MS,
+    name="kobart",
+    runner=kobart_executor.run,
+    max_queue=KOBART_MAX_QUEUE,
+    max_concurrency=kobart_executor.max_workers,
+    # 디코딩 파라미터가 같고 길이가 비슷한 것끼리 묶어 패딩 낭비 최소화
+    bucket_key=lambda item: (item[1], len(item[0]) // max(1, KOBART_BUCKET_CHARS)),
+    admission=kobart_admission,
+    tag=_spec_tag,
+)
+
+score_cache = LRUCache(SCORE_CACHE_SIZE, SCORE_CACHE_TTL, name="electra_scores")
+_cache_lexicon_version = lexicon.version
+
+# MODEL_SERVER=client: 모델 연산은 모델 서버 프로세스에 위임 (캐시/single-flight/캐스케이드는 워커에서 그대로)
+remote: Optional[ModelClient] = ModelClient() if MODEL_SERVER == "client" else None
+
+# 임계값에서 먼 텍스트는 n-gram 선형 모델만으로 판정 (모델 파일이 없으면 비활성)
+cascade = Cascade()
+
+# 캐시 미스가 동시에 겹칠 때 같은 입력을 한 번만 배치에 넣음
+electra_flight = SingleFlight("electra")
+kobart_flight = SingleFlight("kobart")
+
+
+class SegmentStats:
+    def __init__(self):
+        self.texts = 0
+        self.segments = 0
+        self.reused = 0  # 캐시에서 가져온 세그먼트 (수정되지 않은 문장)
+
+    def stats(self) -> dict:
+        return {
+            "mode": SCORE_MODE,
+            "texts": self.texts,
+            "segments": self.segments,
+            "segments_reused": self.reused,
+            "segments_scored": self.segments - self.reused,
+            "avg_segments": round(self.segments / self.texts, 3) if self.texts else 0.0,
+        }
+
+
+segment_stats = SegmentStats()
+
+
+async def _score_norm(norm: str) -> Tuple[Tuple[float, bool], bool]:
+    """정규화 텍스트 1개 채점 → ((prob, lexicon_hit), 캐시 적중 여부)."""
+    key = text_key(norm)
+    cached = score_cache.get(key)
+    if cached is not None:
+        return cached, True
+    result = await electra_flight.do(key, lambda: _submit_score(norm))
+    score_cache.put(key, result)
+    return result, False
+
+
+async def _submit_score(norm: str) -> Tuple[float, bool]:
+    if remote is not None:
+        prob, lexicon_hit = await remote.call("score", text=norm)
+        return float(prob), bool(lexicon_hit)
+    return await electra_batcher.submit(norm)
+
+
+async def _score_segments(norm: str, segs) -> Tuple[float, bool]:
+    # 세그먼트 경계에 걸친 욕설도 놓치지 않도록 사전은 전체 텍스트로 먼저 확인
+    if lexicon.search(norm) is not None:
+        return bert_model.LEXICON_PROB, True
+    # 세그먼트별 score_cache 조회, 미스만 electra_batcher 에서 한 배치로 채점
+    results = await asyncio.gather(*(_score_norm(seg) for seg in segs))
+    segment_stats.texts += 1
+    segment_stats.segments += len(segs)
+    segment_stats.reused += sum(1 for _, hit in results if hit)
+    return segments.aggregate([r for r, _ in results])
+
+
+async def score(
+    text: str, segmented: Optional[bool] = None, threshold: Optional[float] = None
+) -> Tuple[float, bool]:
+    """
+    (prob, lexicon_hit). 정규화 텍스트 기준으로 캐시하고,
+    미스인 경우만 electra_batcher에서 다른 요청과 한 배치로 묶어 채점.
+    SCORE_MODE=segment(또는 segmented=True) 이면 여러 문장으로 된 텍스트는 세그먼트별로 채점해 segments.aggregate 로 집계.
+    threshold 를 주면 캐스케이드가 임계값 ± margin 밖이라고 확신하는 경우 ELECTRA 없이 그 확률을 반환.
+    """
+    global _cache_lexicon_version
+    if _cache_lexicon_version != lexicon.version:
+        # 사전이 바뀌면 사전 매칭 결과가 달라질 수 있으므로 전체 무효화
+        score_cache.clear()
+        _cache_lexicon_version = lexicon.version
+
+    norm = normalize_text(text)
+    if threshold is not None and cascade.model is not None and lexicon.search(norm) is None:
+        decided = cascade.decide(norm, threshold)
+        if decided is not None:
+            return decided
+    if segmented if segmented is not None else SCORE_MODE == "segment":
+        # 줄바꿈으로도 나누도록 정규화 전 원문을 분할 (세그먼트는 각각 정규화됨)
+        segs = segments.split_segments(text)
+        if len(segs) > 1:
+            return await _score_segments(norm, segs)
+    return (await _score_norm(norm))[0]
+
+
+async def predict(text: str, threshold: float = 0.5) -> Tuple[int, float]:
+    """bert_model.predict와 동일한 (pred, prob) 반환."""
+    return bert_model.decide(await score(text, threshold=threshold), threshold)
+
+
+async def refine(text: str, gen_kwargs: Optional[Dict[str, Any]] = None) -> str:
+    """KoBART 순화문 생성. 동시 요청은 길이 구간별로 묶여 kobart_executor에서 한 번에 생성."""
+    params = tuple(sorted((gen_kwargs or kobart_model.GEN_KWARGS).items()))
+    return await _generate(text, params)
+
+
+async def _generate(text: str, params: Tuple) -> Any:
+    key = (kobart_model.CACHE_MODEL_ID, params, text_key(normalize_text(text)))
+    if remote is not None:
+        return await kobart_flight.do(key, lambda: remote.call("generate", text=text, params=params))
+    return await kobart_flight.do(key, lambda: _generate_local(text, params))
+
+
+def _cached_generation(text: str, params: Tuple) -> Any:
+    kwargs = dict(params)
+    cached = kobart_model.cached_candidates(text, kwargs)
+    if cached is None:
+        return None
+    return cached if kwargs.get("num_return_sequences", 1) > 1 else cached[0]
+
+
+async def _generate_local(text: str, params: Tuple) -> Any:
+    # 영구 캐시 적중은 입장 제어·배치 대기·executor 를 거치지 않음 (입장 제어 비용 추정에도 실제 생성만 반영)
+    cached = await asyncio.to_thread(_cached_generation, text, params)
+    if cached is not None:
+        return cached
+    return await kobart_batcher.submit((text, params))
+
+
+async def refine_reranked(text: str, k: int, base: Optional[Dict[str, Any]] = None) -> Tuple[str, float]:
+    """
+    generate() 1회로 상위 k개 beam 후보를 받고, ELECTRA 1회(배치) forward로 전부 채점해
+    가장 낮은 확률의 후보와 그 확률 반환. 채점 결과는 score_cache 에도 저장.
+    """
+    params = kobart_model.rerank_kwargs(base or kobart_model.GEN_KWARGS, k)
+    candidates = await _generate(text, tuple(sorted(params.items())))
+    norms = [normalize_text(c) for c in candidates]
+    if remote is not None:
+        scores = [(float(p), bool(h)) for p, h in await remote.call("score_batch", texts=norms)]
+    else:
+        scores = await electra_executor.run(bert_model.score_batch, norms)
+    for norm, sc in zip(norms, scores):
+        score_cache.put(text_key(norm), sc)
+    best = min(range(len(candidates)), key=lambda i: scores[i][0])
+    return candidates[best], scores[best][0]
+
+
+# /kobart/jobs 및 /kobart/generate 가 공유하는 생성 작업 큐
+job_queue = JobQueue(refine)
+
+
+class DecodeStats:
+    def __init__(self):
+        self.counts: Counter = Counter()
+        self.ms_total: Counter = Counter()
+
+    def record(self, strategy: str, ms: float):
+        self.counts[strategy] += 1
+        self.ms_total[strategy] += ms
+
+    def stats(self) -> dict:
+        return {
+            k: {"count": n, "avg_ms": round(self.ms_total[k] / n, 3)}
+            for k, n in sorted(self.counts.items())
+        }
+
+
+decode_stats = DecodeStats()
+
+
+async def refine_for_threshold(text: str, threshold: float, budget_ms: Optional[float] = None) -> Tuple[str, str]:
+    """
+    (polite_text, decode_strategy).
+    - beam: 기존 5-beam (KOBART_DECODING=beam)
+    - greedy: greedy 결과가 이미 임계 미만
+    - greedy_beam: greedy 결과가 임계 초과 → beam 으로 재생성
+    - *_rerank: KOBART_RERANK_K>1 이면 beam 후보 k개 중 ELECTRA 확률이 가장 낮은 후보
+    - greedy_deadline: 임계 초과지만 남은 예산 내에 beam 을 끝낼 수 없어 greedy 결과 반환
+    """
+    started = time.perf_counter()
+    rerank = KOBART_RERANK_K > 1
+    if KOBART_DECODING != "adaptive":
+        if rerank:
+            polite_text, _ = await refine_reranked(text, KOBART_RERANK_K)
+        else:
+            polite_text = await refine(text)
+        strategy = "beam_rerank" if rerank else "beam"
+        decode_stats.record(strategy, (time.perf_counter() - started) * 1000)
+        return polite_text, strategy
+
+    budget = (budget_ms if budget_ms is not None else ADAPTIVE_BUDGET_MS) / 1000.0
+    deadline = started + budget
+
+    greedy = await refine(text, kobart_model.GREEDY_GEN_KWARGS)
+    greedy_s = time.perf_counter() - started
+    over, _ = await predict(greedy, threshold=threshold)
+    strategy, polite_text = "greedy", greedy
+
+    if over:
+        remaining = deadline - time.perf_counter()
+        strategy = "greedy_deadline"
+        if remaining > greedy_s * BEAM_COST_FACTOR:
+            try:
+                if rerank:
+                    beam = refine_reranked(text, KOBART_RERANK_K, kobart_model.BEAM_GEN_KWARGS)
+                    polite_text, _ = await asyncio.wait_for(beam, timeout=remaining)
+                    strategy = "greedy_beam_rerank"
+                else:
+                    polite_text = await asyncio.wait_for(refine(text, kobart_model.BEAM_GEN_KWARGS), timeout=remaining)
+                    strategy = "greedy_beam"
+            except asyncio.TimeoutError:
+                pass
+
+    decode_stats.record(strategy, (time.perf_counter() - started) * 1000)
+    return polite_text, strategy
+
+
+class StreamStats:
+    """스트리밍 생성의 첫 토큰까지 시간(TTFT)과 전체 생성 시간을 따로 집계."""
+
+    def __init__(self):
+        self.streams = 0
+        self.cache_hits = 0
+        self.cancelled = 0
+        self.ttft_ms_total = 0.0
+        self.total_ms_total = 0.0
+        self.last_ttft_ms = 0.0
+        self.last_total_ms = 0.0
+
+    def record(self, ttft_ms: float, total_ms: float):
+        self.streams += 1
+        self.ttft_ms_total += ttft_ms
+        self.total_ms_total += total_ms
+        self.last_ttft_ms = ttft_ms
+        self.last_total_ms = total_ms
+
+    def stats(self) -> dict:
+        n = self.streams
+        return {
+            "streams": n,
+            "cache_hits": self.cache_hits,
+            "cancelled": self.cancelled,
+            "avg_ttft_ms": round(self.ttft_ms_total / n, 3) if n else 0.0,
+            "avg_total_ms": round(self.total_ms_total / n, 3) if n else 0.0,
+            "last_ttft_ms": round(self.last_ttft_ms, 3),
+            "last_total_ms": round(self.last_total_ms, 3),
+        }
+
+
+stream_stats = StreamStats()
+
+
+async def open_refine_stream(text: str) -> AsyncIterator[Tuple[str, dict]]:
+    """
+    스트리밍 생성의 준비 단계(캐시 조회, 입장 제어, 모델 로드, 생성 제출)를 끝내고 이벤트 이터레이터 반환.
+    Overloaded / QueueFull 은 여기서 발생하므로 라우터는 SSE 응답(200)을 보내기 전에 429/503 으로 응답할 수 있다.
+    이벤트는 ("partial", {"text", "delta"}) 를 토큰 단위로 내보낸 뒤 ("final", {"polite_text", "ttft_ms", "total_ms"}).
+    """
+    if remote is not None:
+        # 모델 서버의 입장 제어/대기열 거절은 첫 메시지로 오므로 첫 메시지까지 받아 두고 반환
+        stream = remote.stream("stream", text=text)
+        try:
+            first = await stream.__anext__()
+        except StopAsyncIteration:
+            first = None
+        except BaseException:
+            await stream.aclose()
+            raise
+        return _remote_events(first, stream)
+
+    started = time.perf_counter()
+    cached = await asyncio.to_thread(kobart_model.cached_stream_text, text)
+    if cached is not None:
+        stream_stats.cache_hits += 1
+        return _cached_events(cached, (time.perf_counter() - started) * 1000)
+
+    from transformers import AsyncTextIteratorStreamer
+
+    kobart_admission.admit()
+    try:
+        tokenizer, _, _ = await kobart_executor.run(kobart_model.get_kobart_model)
+        streamer = AsyncTextIteratorStreamer(tokenizer, skip_special_tokens=True)
+        stop = threading.Event()
+        task = kobart_executor.submit(kobart_model.refine_streaming, text, streamer, stop)
+    except BaseException:
+        kobart_admission.release()
+        raise
+    task.add_done_callback(lambda _: kobart_admission.release())
+    # 워커 스레드에서 refine_streaming 이 시작되기 전에 실패/취소되면 streamer 를 끝내 주는 쪽이 없음
+    # → 여기서 종료시켜 이벤트 이터레이터의 async for 가 빠져나오고 await task 에서 예외가 전달되도록
+    task.add_done_callback(lambda t: streamer.end() if t.cancelled() or t.exception() is not None else None)
+    return _stream_events(started, streamer, stop, task)
+
+
+async def _remote_events(first: Optional[dict], stream: AsyncIterator[dict]) -> AsyncIterator[Tuple[str, dict]]:
+    if first is None:
+        return
+    yield first["event"], first["data"]
+    async for msg in stream:
+        yield msg["event"], msg["data"]
+
+
+async def _cached_events(cached: str, ms: float) -> AsyncIterator[Tuple[str, dict]]:
+    yield "partial", {"text": cached, "delta": cached}
+    yield "final", {"polite_text": cached, "ttft_ms": ms, "total_ms": ms}
+
+
+async def _stream_events(started: float, streamer, stop: threading.Event, task) -> AsyncIterator[Tuple[str, dict]]:
+    ttft_ms = None
+    partial = ""
+    try:
+        async for delta in streamer:
+            if not delta:
+                continue
+            if ttft_ms is None:
+                ttft_ms = (time.perf_counter() - started) * 1000
+            partial += delta
+            yield "partial", {"text": partial, "delta": delta}
+        polite_text = await task
+    except (GeneratorExit, asyncio.CancelledError):
+        # 클라이언트 이탈 → 생성 스레드도 다음 토큰에서 중단
+        stop.set()
+        stream_stats.cancelled += 1
+        raise
+    total_ms = (time.perf_counter() - started) * 1000
+    if ttft_ms is None:
+        ttft_ms = total_ms
+    stream_stats.record(ttft_ms, total_ms)
+    kobart_admission.observe(1, total_ms)
+    yield "final", {"polite_text": polite_text, "ttft_ms": ttft_ms, "total_ms": total_ms}
+
+
+async def refine_stream(text: str) -> AsyncIterator[Tuple[str, dict]]:
+    """open_refine_stream 을 한 번에 (준비 단계의 예외도 반복 중에 발생). 모델 서버의 stream op 에서 사용."""
+    events = await open_refine_stream(text)
+    try:
+        async for event in events:
+            yield event
+    finally:
+        await events.aclose()
+
+
+_JAMO_RUN = re.compile(r"[ㄱ-ㅎ]{2,}")
+_LAUGH = re.compile(r"^[ㅋㅎ]+$")
+
+
+def looks_toxic(text: str) -> bool:
+    """모델 없이 판단하는 값싼 신호: 사전 매칭 또는 초성 욕설(ㅅㅂ, ㅂㅅ 등; ㅋㅋ/ㅎㅎ 제외)."""
+    if lexicon.search(text) is not None:
+        return True
+    return any(not _LAUGH.match(m.group()) for m in _JAMO_RUN.finditer(text))
+
+
+class SpeculationStats:
+    """
+    추측 생성이 이득인지 판단하기 위한 집계.
+    wasted_ms_total: 폐기된 추측 생성이 워커에서 실제로 실행된 시간 (배치 실행 시간 중 해당 항목 몫).
+    취소해도 이미 시작된 generate() 는 끝까지 돌기 때문에 취소 시점이 아니라 배치가 끝난 뒤 집계되며,
+    배치에 들어가기 전에 취소된 경우는 0. client 모드에서는 모델 서버 쪽 실행이라 집계되지 않음.
+    """
+
+    def __init__(self):
+        self.started = 0
+        self.used = 0
+        self.discarded = 0
+        self.skipped = 0
+        self.saved_ms_total = 0.0
+
+    @property
+    def wasted_ms_total(self) -> float:
+        return sum(b.discarded_ms["speculative"] for b in (kobart_batcher, electra_batcher))
+
+    def stats(self) -> dict:
+        return {
+            "mode": SPECULATIVE_SUGGEST,
+            "started": self.started,
+            "used": self.used,
+            "discarded": self.discarded,
+            "skipped": self.skipped,
+            "hit_rate": round(self.used / self.started, 4) if self.started else 0.0,
+            "saved_ms_total": round(self.saved_ms_total, 3),
+            "wasted_ms_total": round(self.wasted_ms_total, 3),
+        }
+
+
+speculation_stats = SpeculationStats()
+
+
+async def score_and_refine(text: str, threshold: float) -> Tuple[int, float, Optional[Tuple[str, str]]]:
+    """
+    (over_pred, prob, (polite_text, decode_strategy) | None).
+    추측 조건이면 ELECTRA 채점과 KoBART 생성을 동시에 시작하고, 채점 결과가 임계 미만이면 생성을 취소/폐기.
+    그 외에는 기존처럼 채점 → (초과 시) 생성 순서로 실행.
+    """
+    speculate = SPECULATIVE_SUGGEST == "always" or (SPECULATIVE_SUGGEST == "hint" and looks_toxic(text))
+    if not speculate:
+        speculation_stats.skipped += 1
+        over_pred, prob = await predict(text, threshold=threshold)
+        if not over_pred:
+            return over_pred, prob, None
+        return over_pred, prob, await refine_for_threshold(text, threshold)
+
+    speculation_stats.started += 1
+    started = time.perf_counter()
+    token = _speculative.set(True)
+    try:
+        # 태스크 생성 시점의 컨텍스트가 복사되므로 생성 경로의 배치 항목에만 표시가 붙음
+        gen_task = asyncio.ensure_future(refine_for_threshold(text, threshold))
+    finally:
+        _speculative.reset(token)
+    try:
+        over_pred, prob = await predict(text, threshold=threshold)
+    except BaseException:
+        gen_task.cancel()
+        raise
+    scored_ms = (time.perf_counter() - started) * 1000
+
+    if not over_pred:
+        # 아직 배치에 들어가지 않았다면 취소로 실제 생성도 생략됨, 이미 실행 중이면 끝까지 돌고 그 몫이 wasted_ms_total 로 집계됨
+        gen_task.cancel()
+        speculation_stats.discarded += 1
+        return over_pred, prob, None
+
+    rewrite = await gen_task
+    speculation_stats.used += 1
+    speculation_stats.saved_ms_total += scored_ms  # 채점 시간만큼 생성과 겹침
+    return over_pred, prob, rewrite
+
+
+# 정책별로 곧 필요한 모델 (polite_one_edit 만 순화문 생성에 KoBART 사용)
+_POLICY_MODELS = {"polite_one_edit": ("electra", "kobart")}
+_prewarm_tasks = set()
+
+
+def prewarm_hint(policy_mode: str):
+    """
+    포스트가 활성화될 때(사용자가 포스트에 들어옴) 호출. 필요한 모델이 해제돼 있으면 백그라운드 로드를 시작하고
+    상주 중이면 유휴 타이머만 갱신. 요청은 기다리지 않는다.
+    """
+    names = _POLICY_MODELS.get(getattr(policy_mode, "value", policy_mode), ("electra",))
+
+    async def _run():
+        for name in names:
+            if remote is not None:
+                await remote.call("prewarm", model=name)
+            else:
+                await models.prewarm(name)
+
+    task = asyncio.ensure_future(_run())
+    _prewarm_tasks.add(task)
+    task.add_done_callback(_prewarm_done)
+
+
+def _prewarm_done(task: asyncio.Task):
+    _prewarm_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        print(f"[inference] prewarm failed: {task.exception()}")
+
+
+def admission_stats() -> dict:
+    return {
+        "electra": {**electra_admission.stats(), "queue_depth": electra_batcher.stats()["queue_depth"]},
+        "kobart": {**kobart_admission.stats(), "queue_depth": kobart_batcher.stats()["queue_depth"]},
+        "jobs_pending": job_queue.pending(),
+    }
+
+
+def stats() -> dict:
+    return {
+        "admission": admission_stats(),
+        "electra_batcher": electra_batcher.stats(),
+        "score_cache": score_cache.stats(),
+        "segments": segment_stats.stats(),
+        "cascade": cascade.stats(),
+        "single_flight": {"electra": electra_flight.stats(), "kobart": kobart_flight.stats()},
+        "electra_executor": electra_executor.stats(),
+        "kobart_batcher": kobart_batcher.stats(),
+        "kobart_executor": kobart_executor.stats(),
+        "kobart_jobs": job_queue.stats(),
+        "kobart_stream": stream_stats.stats(),
+        "decode_strategy": decode_stats.stats(),
+        "speculation": speculation_stats.stats(),
+        "gen_cache": kobart_model.gen_cache.stats() if kobart_model.gen_cache is not None else None,
+        "tokenization": {"electra": bert_model.tokens.stats(), "kobart": kobart_model.tokens.stats()},
+        "model_client": remote.stats() if remote is not None else None,
+        "models": models.stats() if remote is None else None,
+        "cores": cores.stats(),
+    }
@@ -0,0 +1,195 @@
+# polite_back/models/jobs.py
+# 순화문 생성 비동기 작업 큐: 즉시 job_id 반환 → 폴링/WebSocket 으로 결과 수신
+
+import asyncio
+import itertools
+import os
+import time
+import uuid
+from collections import Counter
+from typing import Awaitable, Callable, Dict, Optional
+
+from polite_back.models.executor import QueueFull
+
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "8"))
+JOB_MAX_PENDING = int(os.environ.get("JOB_MAX_PENDING", "128"))
+JOB_MAX_PER_USER = int(os.environ.get("JOB_MAX_PER_USER", "2"))
+# 사용자 키가 없는 작업은 모두 하나의 익명 버킷으로 묶어 이 한도를 함께 적용
+JOB_MAX_ANONYMOUS = int(os.environ.get("JOB_MAX_ANONYMOUS", "8"))
+JOB_RESULT_TTL = float(os.environ.get("JOB_RESULT_TTL", "600"))
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+ANONYMOUS = "anonymous"
+# 우선순위는 작을수록 먼저. 클라이언트는 DEFAULT_PRIORITY~MAX_PRIORITY 만 지정 가능 (JobReq 검증, 스스로 낮추는 것만 허용)
+# 그보다 앞선 값은 서버가 정함: 연결에서 결과를 기다리는 동기 요청(/kobart/generate)은 INTERACTIVE_PRIORITY
+INTERACTIVE_PRIORITY, DEFAULT_PRIORITY, MAX_PRIORITY = 2, 5, 9
+
+
+class TooManyJobs(RuntimeError):
+    """사용자별 동시 작업 한도 초과 (라우터에서 429)."""
+
+
+class Job:
+    def __init__(self, text: str, user_id: str, priority: int):
+        self.id = uuid.uuid4().hex
+        self.text = text
+        self.user_id = user_id
+        self.priority = priority
+        self.status = QUEUED
+        self.result: Optional[str] = None
+        self.error: Optional[str] = None
+        self.exception: Optional[BaseException] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.done = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "polite_text": self.result,
+            "error": self.error,
+            "priority": self.priority,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobQueue:
+    """
+    우선순위(작을수록 먼저) 큐 + 워커 태스크.
+    대기 작업이 max_pending 을 넘으면 QueueFull(503), 사용자별 미완료 작업이 max_per_user 를 넘으면 TooManyJobs(429).
+    user_id 는 서버가 정한 키(라우터: 접속 주소)여야 하며, 없으면 익명 버킷(max_anonymous)에 합산.
+    limit_user=False 면 사용자별 한도를 적용하지 않음 (결과를 기다리다 연결이 끊기면 취소하는 동기 래퍼).
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[str], Awaitable[str]],
+        workers: int = JOB_WORKERS,
+        max_pending: int = JOB_MAX_PENDING,
+        max_per_user: int = JOB_MAX_PER_USER,
+        max_anonymous: int = JOB_MAX_ANONYMOUS,
+        result_ttl: float = JOB_RESULT_TTL,
+    ):
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.max_pending = max_pending
+        self.max_per_user = max_per_user
+        self.max_anonymous = max_anonymous
+        self.result_ttl = result_ttl
+        self.jobs: Dict[str, Job] = {}
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._workers: list = []
+        self._seq = itertools.count()  # 같은 우선순위는 FIFO
+        self._active_by_user: Counter = Counter()
+        self.counts: Counter = Counter()
+
+    def _ensure_workers(self):
+        if self._queue is None or all(w.done() for w in self._workers):
+            self._queue = asyncio.PriorityQueue()
+            loop = asyncio.get_running_loop()
+            self._workers = [loop.create_task(self._worker()) for _ in range(self.workers)]
+
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def submit(
+        self, text: str, user_id: Optional[str] = None, priority: int = DEFAULT_PRIORITY, limit_user: bool = True
+    ) -> Job:
+        self._ensure_workers()
+        self._purge()
+        if self.pending() >= self.max_pending:
+            self.counts["rejected_queue"] += 1
+            raise QueueFull("jobs", self.max_pending)
+        user_id = user_id or ANONYMOUS
+        limit = self.max_anonymous if user_id == ANONYMOUS else self.max_per_user
+        if limit_user and self._active_by_user[user_id] >= limit:
+            self.counts["rejected_user"] += 1
+            raise TooManyJobs(f"{user_id} already has {limit} active jobs")
+
+        priority = min(max(int(priority), 0), MAX_PRIORITY)
+        job = Job(text, user_id, priority)
+        self.jobs[job.id] = job
+        self._active_by_user[user_id] += 1
+        self._queue.put_nowait((priority, next(self._seq), job))
+        self.counts["submitted"] += 1
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        job = self.jobs.get(job_id)
+        if job is None or job.finished:
+            return job
+        if job._task is not None:
+            job._task.cancel()  # 실행 중이면 생성 결과를 기다리지 않음 (배치 전이면 생성 자체 생략)
+        self._finish(job, CANCELLED)
+        return job
+
+    async def wait(self, job: Job, timeout: Optional[float] = None) -> Job:
+        await asyncio.wait_for(job.done.wait(), timeout=timeout)
+        return job
+
+    def _finish(self, job: Job, status: str, result: Optional[str] = None, error: Optional[str] = None):
+        if job.finished:
+            return
+        job.status = status
+        job.result = result
+        job.error = error
+        job.finished_at = time.time()
+        self._active_by_user[job.user_id] -= 1
+        if self._active_by_user[job.user_id] <= 0:
+            del self._active_by_user[job.user_id]
+        self.counts[status] += 1
+        job.done.set()
+
+    async def _worker(self):
+        while True:
+            _, _, job = await self._queue.get()
+            if job.finished:  # 대기 중 취소됨
+                continue
+            job.status = RUNNING
+            job.started_at = time.time()
+            job._task = asyncio.ensure_future(self.handler(job.text))
+            try:
+                result = await job._task
+            except asyncio.CancelledError:
+                if job.status == CANCELLED:  # cancel() 로 작업만 취소된 경우
+                    continue
+                raise  # 워커 자체 종료
+            except Exception as e:
+                job.exception = e
+                self._finish(job, FAILED, error=str(e))
+                continue
+            self._finish(job, DONE, result=result)
+
+    def _purge(self):
+        now = time.time()
+        expired = [
+            jid for jid, j in self.jobs.items()
+            if j.finished and j.finished_at is not None and now - j.finished_at > self.result_ttl
+        ]
+        for jid in expired:
+            del self.jobs[jid]
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "pending": self.pending(),
+            "running": sum(1 for j in self.jobs.values() if j.status == RUNNING),
+            "tracked": len(self.jobs),
+            "max_pending": self.max_pending,
+            "max_per_user": self.max_per_user,
+            "max_anonymous": self.max_anonymous,
+            "anonymous_active": self._active_by_user[ANONYMOUS],
+            "counts": dict(self.counts),
+        }
@@ -1,24 +1,239 @@
 # polite_back/models/kobart_model.py
 
-from transformers import PreTrainedTokenizerFast, BartForConditionalGeneration
-import torch
-from typing import Optional, Tuple
+# torch / transformers 는 모델을 실제로 로드할 때 import (서버 기동 시간 단축)
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
 import os
 
-os.environ["HF_HOME"] = "/opt/render/project/.hf_cache"
-os.environ["TRANSFORMERS_CACHE"] = "/opt/render/project/.hf_cache"
+from polite_back.models.gen_cache import make_key, open_cache
+from polite_back.models.tokenization import BatchTokenizer
+
+# 배포 환경(Render) 기본값, 환경변수로 재정의 가능
+os.environ.setdefault("HF_HOME", "/opt/render/project/.hf_cache")
+os.environ.setdefault("TRANSFORMERS_CACHE", os.environ["HF_HOME"])
 MODEL_NAME = "heloolkjdasklfjlasdf/slang-kobart"
+PREFIX = "[순화] "
 
-_tokenizer: Optional[PreTrainedTokenizerFast] = None
-_model: Optional[BartForConditionalGeneration] = None
-_device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+# 추론 백엔드: torch(기본, eager fp32) | onnx | onnx-int8 (encoder + decoder_with_past, requirements-onnx.txt 설치 필요)
+KOBART_BACKEND = os.environ.get("KOBART_BACKEND", "torch").lower()
+KOBART_ONNX_DIR = os.environ.get("KOBART_ONNX_DIR", os.path.join(os.environ["HF_HOME"], "slang-kobart-onnx"))
+# 백엔드별 출력이 다를 수 있으므로 캐시 키에 포함 (torch 는 기존 키 유지)
+CACHE_MODEL_ID = MODEL_NAME if KOBART_BACKEND == "torch" else f"{MODEL_NAME}@{KOBART_BACKEND}"
+GEN_KWARGS = {"max_length": 128, "num_beams": 5}  # 기존 설정 그대로 유지
+# 스트리머는 beam search 를 지원하지 않으므로 스트리밍은 greedy 로 디코딩
+STREAM_GEN_KWARGS = {"max_length": 128, "num_beams": 1}
+# 적응형 디코딩: greedy 우선, max_length 는 입력 토큰 수 * length_ratio + LENGTH_SLACK 로 제한
+ADAPTIVE_LENGTH_RATIO = float(os.environ.get("ADAPTIVE_LENGTH_RATIO", "1.5"))
+LENGTH_SLACK = 8
+# 배치의 패딩 비율이 BUCKET_MAX_PADDING 을 넘으면 토큰 길이 구간별로 나눠 생성 → 구간마다 max_length(length_ratio) 를 따로 적용
+KOBART_BUCKET_TOKENS = int(os.environ.get("KOBART_BUCKET_TOKENS", "16"))
+GREEDY_GEN_KWARGS = {"max_length": 128, "num_beams": 1, "length_ratio": ADAPTIVE_LENGTH_RATIO}
+BEAM_GEN_KWARGS = {"max_length": 128, "num_beams": 5, "length_ratio": ADAPTIVE_LENGTH_RATIO}
+
+def rerank_kwargs(base: Dict[str, Any], k: int) -> Dict[str, Any]:
+    """상위 k개 beam 후보를 함께 반환하도록 (num_beams 는 최소 k)."""
+    params = dict(base)
+    params["num_beams"] = max(k, int(params.get("num_beams", 1)))
+    params["num_return_sequences"] = k
+    return params
+
+# 순화문 영구 캐시 (빈 문자열이면 비활성화)
+GEN_CACHE_PATH = os.environ.get("GEN_CACHE_PATH", os.path.join(os.environ["HF_HOME"], "kobart_gen_cache.sqlite3"))
+GEN_CACHE_MAX_MB = float(os.environ.get("GEN_CACHE_MAX_MB", "64"))
+gen_cache = open_cache(GEN_CACHE_PATH, int(GEN_CACHE_MAX_MB * 1024 * 1024))
+
+_tokenizer = None  # PreTrainedTokenizerFast
+_model = None      # BartForConditionalGeneration | ORTModelForSeq2SeqLM
+_device = None
+_load_lock = threading.Lock()  # KOBART_WORKERS 스레드/워밍업이 동시에 로드하지 않도록
+load_ms: Optional[float] = None
+
+# "[순화] " 접두어를 붙여 토큰화, 캐시 키는 원문 (refine_batch / 스트리밍 / 워밍업 공용)
+tokens = BatchTokenizer("kobart", lambda: get_kobart_model()[0], prefix=PREFIX, bucket_width=KOBART_BUCKET_TOKENS)
+
+def is_loaded() -> bool:
+    return _model is not None
+
+def get_kobart_model() -> Tuple[Any, Any, Any]:
+    """(tokenizer, model, torch.device)"""
+    global _tokenizer, _model, _device, load_ms
+    import torch
 
-def get_kobart_model() -> Tuple[PreTrainedTokenizerFast, BartForConditionalGeneration, torch.device]:
-    global _tokenizer, _model
     if _model is None:
-        torch.set_num_threads(1)  # 1 CPU 환경 안정화
-        _tokenizer = PreTrainedTokenizerFast.from_pretrained(MODEL_NAME)
-        m = BartForConditionalGeneration.from_pretrained(MODEL_NAME)
-        m.to(_device)
-        _model = m.eval()
+        with _load_lock:
+            if _model is None:
+                from transformers import PreTrainedTokenizerFast
+                from polite_back.models import artifacts, cores
+                from polite_back.models.registry import models
+
+                models.before_load("kobart")  # 메모리 예산 초과 시 유휴 모델 해제
+                started = time.perf_counter()
+                rss_before = artifacts.rss_mb()
+                torch.set_num_threads(cores.threads_for("kobart"))  # 워커 스레드는 executor initializer 가 설정
+                _device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+                # 로컬 safetensors 아티팩트(없으면 1회 변환) 또는 허브 모델명
+                source = artifacts.ensure_kobart(MODEL_NAME) if artifacts.MODEL_ARTIFACTS else MODEL_NAME
+                if KOBART_BACKEND == "torch" and artifacts.MODEL_ARTIFACTS:
+                    tokenizer, model = artifacts.load_kobart(source, _device)
+                elif KOBART_BACKEND == "torch":
+                    from transformers import BartForConditionalGeneration
+
+                    tokenizer = PreTrainedTokenizerFast.from_pretrained(MODEL_NAME)
+                    m = BartForConditionalGeneration.from_pretrained(MODEL_NAME)
+                    m.to(_device)
+                    model = m.eval()
+                else:
+                    from polite_back.models import kobart_onnx
+                    tokenizer = PreTrainedTokenizerFast.from_pretrained(source)
+                    model = kobart_onnx.load_model(
+                        KOBART_BACKEND, source, KOBART_ONNX_DIR, num_threads=cores.threads_for("kobart")
+                    )
+                _tokenizer = tokenizer
+                _model = model
+                load_ms = (time.perf_counter() - started) * 1000
+                rss = artifacts.rss_mb()
+                print(f"[kobart_model] loaded ({KOBART_BACKEND}) in {load_ms:.0f}ms, RSS {rss:.0f}MB (+{rss - rss_before:.0f}MB)")
+                models.after_load("kobart")
+    # ONNX Runtime 세션은 CPU 전용
+    if KOBART_BACKEND != "torch" or _device is None:
+        return _tokenizer, _model, torch.device("cpu")
     return _tokenizer, _model, _device
+
+def unload() -> bool:
+    """모델 해제 (registry 가 호출). 로드 중이면 기다리지 않고 False."""
+    global _tokenizer, _model
+    if not _load_lock.acquire(blocking=False):
+        return False
+    try:
+        if _model is None:
+            return False
+        _tokenizer = None
+        _model = None
+        return True
+    finally:
+        _load_lock.release()
+
+def warmup(texts: Tuple[str, ...] = ("안녕하세요 반갑습니다", "기사 잘 읽었습니다 " * 6)) -> None:
+    """짧은/긴 더미 입력으로 greedy·beam 생성 1회씩 (캐시를 거치지 않음)."""
+    import torch
+
+    _, model, device = get_kobart_model()
+    for text in texts:
+        enc = tokens.collate(tokens.encode([text], use_cache=False), device)
+        for kwargs in (STREAM_GEN_KWARGS, GEN_KWARGS):
+            with torch.inference_mode():
+                model.generate(**enc, **kwargs)
+
+def refine_text(text: str) -> str:
+    return refine_batch([text])[0]
+
+def refine_batch(texts: List[str], gen_kwargs: Optional[Dict[str, Any]] = None, lookup: bool = True) -> List[str]:
+    """
+    여러 입력을 한 번의 generate()로 순화 (기본 디코딩 설정은 GEN_KWARGS).
+    캐시 적중분은 제외하고, 전부 적중하면 모델 로드/생성 모두 생략.
+    gen_kwargs 의 length_ratio 는 배치 내 최장 입력 토큰 수 기준으로 max_length 를 줄인다.
+    """
+    params = dict(gen_kwargs or GEN_KWARGS)
+    params.pop("num_return_sequences", None)
+    return [c[0] for c in candidates_batch(texts, params, lookup)]
+
+def _params_for(gen_kwargs: Optional[Dict[str, Any]]) -> Tuple[Dict[str, Any], int]:
+    params = dict(gen_kwargs or GEN_KWARGS)
+    n = int(params.get("num_return_sequences", 1))
+    if n <= 1:
+        params.pop("num_return_sequences", None)  # refine_batch 와 같은 캐시 키
+    return params, n
+
+def cached_candidates(text: str, gen_kwargs: Optional[Dict[str, Any]] = None) -> Optional[List[str]]:
+    """candidates_batch 와 같은 키로 영구 캐시만 조회 (모델 로드/생성 없음). 없으면 None."""
+    if gen_cache is None:
+        return None
+    params, n = _params_for(gen_kwargs)
+    cached = gen_cache.get(make_key(CACHE_MODEL_ID, params, text))
+    if cached is None:
+        return None
+    return json.loads(cached) if n > 1 else [cached]
+
+def candidates_batch(
+    texts: List[str], gen_kwargs: Optional[Dict[str, Any]] = None, lookup: bool = True
+) -> List[List[str]]:
+    """
+    입력별 상위 num_return_sequences 개 beam 후보 (점수 순). 한 번의 generate()로 처리.
+    캐시에는 후보가 1개면 문자열, 여러 개면 JSON 배열로 저장.
+    lookup=False: 호출부가 이미 캐시를 조회한 미스만 넘기는 경우 (inference._generate → 배처)
+    """
+    params, n = _params_for(gen_kwargs)
+    keys = [make_key(CACHE_MODEL_ID, params, t) for t in texts]
+    results: List[Optional[List[str]]] = [None] * len(texts)
+    if lookup:
+        results = [cached_candidates(t, params) for t in texts]
+    todo = [i for i, r in enumerate(results) if r is None]
+    if not todo:
+        return results
+
+    import torch
+
+    tokenizer, model, device = get_kobart_model()
+    encoded = tokens.encode([texts[i] for i in todo])
+    base = dict(params)
+    ratio = base.pop("length_ratio", None)
+    # 그룹(보통 배치 전체 하나)마다 그룹 내 최장 입력에 맞춰 동적 패딩 (배치=1이면 패딩 없음)
+    for bucket in tokens.buckets(encoded):
+        kwargs = dict(base)
+        if ratio:
+            # 토큰화 결과의 길이를 그대로 사용 (다시 토큰화하지 않음)
+            n_tokens = max(encoded[j].length for j in bucket)
+            kwargs["max_length"] = min(kwargs.get("max_length", 128), int(n_tokens * ratio) + LENGTH_SLACK)
+        enc = tokens.collate([encoded[j] for j in bucket], device)
+        with torch.inference_mode():
+            output = model.generate(**enc, **kwargs)
+        decoded = tokenizer.batch_decode(output, skip_special_tokens=True)
+
+        # generate 출력은 입력 순서대로 n개씩 연속
+        for k, j in enumerate(bucket):
+            i = todo[j]
+            results[i] = decoded[k * n:(k + 1) * n]
+            if gen_cache is not None:
+                gen_cache.put(keys[i], json.dumps(results[i], ensure_ascii=False) if n > 1 else results[i][0])
+    return results
+
+def _stop_on_event(event):
+    """클라이언트가 끊기면 다음 토큰에서 생성 중단하는 StoppingCriteria."""
+    from transformers import StoppingCriteria
+
+    class _StopOnEvent(StoppingCriteria):
+        def __call__(self, input_ids, scores, **kwargs):
+            return event.is_set()
+
+    return _StopOnEvent()
+
+def cached_stream_text(text: str) -> Optional[str]:
+    if gen_cache is None:
+        return None
+    return gen_cache.get(make_key(CACHE_MODEL_ID, STREAM_GEN_KWARGS, text))
+
+def refine_streaming(text: str, streamer, stop_event=None) -> str:
+    """
+    streamer(TextIteratorStreamer 계열)로 토큰 단위 부분 결과를 흘려보내며 생성.
+    executor 스레드에서 호출되며, 예외가 나도 streamer 는 반드시 종료시킨다.
+    """
+    import torch
+    from transformers import StoppingCriteriaList
+
+    try:
+        tokenizer, model, device = get_kobart_model()
+        input_ids = tokens.collate(tokens.encode([text]), device)["input_ids"]
+        kwargs = dict(STREAM_GEN_KWARGS)
+        if stop_event is not None:
+            kwargs["stopping_criteria"] = StoppingCriteriaList([_stop_on_event(stop_event)])
+        with torch.inference_mode():
+            output = model.generate(input_ids, streamer=streamer, **kwargs)
+    except BaseException:
+        streamer.end()
+        raise
+    polite_text = tokenizer.decode(output[0], skip_special_tokens=True)
+    if gen_cache is not None and not (stop_event is not None and stop_event.is_set()):
+        gen_cache.put(make_key(CACHE_MODEL_ID, STREAM_GEN_KWARGS, text), polite_text)
+    return polite_text
@@ -0,0 +1,94 @@
+# polite_back/models/kobart_onnx.py
+# KoBART encoder / decoder(+past key values) → ONNX 변환 및 ONNX Runtime(CPU) 추론
+# optimum[onnxruntime] 는 KOBART_BACKEND=onnx|onnx-int8 일 때만 필요 (선택 의존성, requirements-onnx.txt)
+
+import glob
+import os
+import shutil
+
+
+def _has_onnx(path: str) -> bool:
+    return bool(glob.glob(os.path.join(path, "*.onnx")))
+
+
+def export_onnx(model_name: str, out_dir: str):
+    """
+    encoder_model / decoder_model / decoder_with_past_model 로 내보냄.
+    decoder_with_past 덕분에 generate() 의 각 스텝이 이전 토큰 K/V 를 재계산하지 않는다.
+    """
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    from transformers import PreTrainedTokenizerFast
+
+    tmp = out_dir.rstrip("/") + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    model = ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True, use_cache=True, use_merged=False)
+    model.save_pretrained(tmp)
+    PreTrainedTokenizerFast.from_pretrained(model_name).save_pretrained(tmp)
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(tmp, out_dir)
+
+
+def quantize_int8(src_dir: str, dst_dir: str):
+    """각 ONNX 그래프 가중치를 동적 int8 로 양자화 (활성값은 실행 시 양자화)."""
+    from optimum.onnxruntime import ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+    tmp = dst_dir.rstrip("/") + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    qconfig = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+    for path in sorted(glob.glob(os.path.join(src_dir, "*.onnx"))):
+        quantizer = ORTQuantizer.from_pretrained(src_dir, file_name=os.path.basename(path))
+        quantizer.quantize(save_dir=tmp, quantization_config=qconfig)
+    # config / generation_config / tokenizer 파일 복사
+    for path in glob.glob(os.path.join(src_dir, "*.json")):
+        name = os.path.basename(path)
+        if not os.path.exists(os.path.join(tmp, name)):
+            shutil.copy(path, tmp)
+    shutil.rmtree(dst_dir, ignore_errors=True)
+    os.replace(tmp, dst_dir)
+
+
+def ensure_exported(backend: str, model_name: str, onnx_dir: str) -> str:
+    """backend 에 맞는 디렉토리가 없으면 1회 변환하고 경로 반환."""
+    fp32_dir = os.path.join(onnx_dir, "fp32")
+    if not _has_onnx(fp32_dir):
+        export_onnx(model_name, fp32_dir)
+    if backend == "onnx":
+        return fp32_dir
+    if backend == "onnx-int8":
+        int8_dir = os.path.join(onnx_dir, "int8")
+        if not _has_onnx(int8_dir):
+            quantize_int8(fp32_dir, int8_dir)
+        return int8_dir
+    raise ValueError(f"unknown onnx backend: {backend}")
+
+
+def load_model(backend: str, model_name: str, onnx_dir: str, num_threads: int = 1):
+    """HF generate() 와 호환되는 ORTModelForSeq2SeqLM (beam search, streamer 그대로 사용)."""
+    import onnxruntime as ort
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+
+    path = ensure_exported(backend, model_name, onnx_dir)
+    opts = ort.SessionOptions()
+    opts.intra_op_num_threads = num_threads
+    opts.inter_op_num_threads = 1
+    opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    # 양자화 결과는 파일명이 *_quantized.onnx 이므로 file_name 대신 디렉토리 내 파일을 자동 탐색
+    files = {os.path.basename(p) for p in glob.glob(os.path.join(path, "*.onnx"))}
+
+    def _pick(prefix):
+        for name in sorted(files):
+            if name.startswith(prefix):
+                return name
+        return None
+
+    return ORTModelForSeq2SeqLM.from_pretrained(
+        path,
+        use_cache=True,
+        use_merged=False,
+        encoder_file_name=_pick("encoder_model"),
+        decoder_file_name=_pick("decoder_model"),
+        decoder_with_past_file_name=_pick("decoder_with_past_model"),
+        provider="CPUExecutionProvider",
+        session_options=opts,
+    )
@@ -0,0 +1,18 @@
+# polite_back/models/koelectra.py
+# KoELECTRA 이진 분류기 (torch 의존) — bert_model 은 실제 로드 시점에만 이 모듈을 import
+
+import torch.nn as nn
+from transformers import ElectraModel
+
+
+class KoElectraClassifier(nn.Module):
+    def __init__(self, model_name: str, **from_pretrained_kwargs):
+        super().__init__()
+        self.electra = ElectraModel.from_pretrained(model_name, **from_pretrained_kwargs)
+        self.classifier = nn.Linear(self.electra.config.hidden_size, 1)
+
+    def forward(self, input_ids, attention_mask):
+        outputs = self.electra(input_ids=input_ids, attention_mask=attention_mask)
+        cls_token = outputs.last_hidden_state[:, 0, :]
+        logits = self.classifier(cls_token)
+        return logits.squeeze(-1)
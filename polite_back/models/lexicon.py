@@ -0,0 +1,143 @@
+# polite_back/models/lexicon.py
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+WORD_LIST_PATH = os.environ.get("BADWORD_LIST_PATH", os.path.join(BASE_DIR, "word_list.json"))
+# 파일 변경 감지 주기(초). 0 이하이면 자동 리로드 비활성화
+RELOAD_INTERVAL = float(os.environ.get("BADWORD_RELOAD_INTERVAL", "30"))
+
+
+class LexiconMatcher:
+    """Aho-Corasick 오토마톤. 생성 후에는 불변이므로 스레드 간 공유 가능."""
+
+    def __init__(self, words: Iterable[str]):
+        # 중복/빈 문자열 제거, 입력 순서 유지
+        self.words: List[str] = list(dict.fromkeys(w for w in words if w))
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        self._build()
+
+    def _build(self):
+        goto, fail, out = self._goto, self._fail, self._out
+
+        # 1) trie 구성
+        for idx, word in enumerate(self.words):
+            state = 0
+            for ch in word:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    fail.append(0)
+                    out.append(())
+                state = nxt
+            out[state] = out[state] + (idx,)
+
+        # 2) BFS로 failure 링크 + 출력 병합
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                cand = goto[f].get(ch, 0)
+                fail[nxt] = cand if cand != nxt else 0
+                if out[fail[nxt]]:
+                    out[nxt] = out[nxt] + out[fail[nxt]]
+
+    def _step(self, state: int, ch: str) -> int:
+        goto, fail = self._goto, self._fail
+        while state and ch not in goto[state]:
+            state = fail[state]
+        return goto[state].get(ch, 0)
+
+    def search(self, text: str) -> Optional[str]:
+        """처음으로 끝나는 매칭 단어를 반환(없으면 None). 첫 매칭에서 즉시 종료."""
+        out = self._out
+        state = 0
+        for ch in text:
+            state = self._step(state, ch)
+            if out[state]:
+                return self.words[out[state][0]]
+        return None
+
+    def find_all(self, text: str) -> List[str]:
+        """텍스트에 포함된 모든 사전 단어(중복 없이, 등장 순서대로)."""
+        out, words = self._out, self.words
+        seen: Dict[int, None] = {}
+        state = 0
+        for ch in text:
+            state = self._step(state, ch)
+            for idx in out[state]:
+                seen.setdefault(idx, None)
+        return [words[i] for i in seen]
+
+    def __contains__(self, text: str) -> bool:
+        return self.search(text) is not None
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+
+def load_words(path: str = WORD_LIST_PATH) -> List[str]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["words"]
+
+
+# 전역 매처 (import 시 1회 컴파일, 리로드 시 참조만 교체)
+_lock = threading.Lock()
+_matcher = LexiconMatcher(load_words())
+_mtime = os.path.getmtime(WORD_LIST_PATH)
+_last_check = time.monotonic()
+version = 0  # 리로드마다 증가 (사전 결과를 캐시하는 쪽에서 무효화에 사용)
+
+
+def reload(words: Optional[Iterable[str]] = None, path: str = WORD_LIST_PATH) -> LexiconMatcher:
+    """새 단어 목록으로 오토마톤을 다시 컴파일해 교체 (재시작 불필요)."""
+    global _matcher, _mtime, version
+    with _lock:
+        if words is None:
+            words = load_words(path)
+            _mtime = os.path.getmtime(path)
+        _matcher = LexiconMatcher(words)
+        version += 1
+    return _matcher
+
+
+def _maybe_reload():
+    global _last_check
+    if RELOAD_INTERVAL <= 0:
+        return
+    now = time.monotonic()
+    if now - _last_check < RELOAD_INTERVAL:
+        return
+    _last_check = now
+    try:
+        if os.path.getmtime(WORD_LIST_PATH) != _mtime:
+            reload()
+    except (OSError, ValueError, KeyError) as e:
+        # 잘못된 파일이면 기존 매처 유지
+        print(f"[lexicon] reload failed: {e}")
+
+
+def get_matcher() -> LexiconMatcher:
+    _maybe_reload()
+    return _matcher
+
+
+def search(text: str) -> Optional[str]:
+    return get_matcher().search(text)
+
+
+def find_all(text: str) -> List[str]:
+    return get_matcher().find_all(text)
@@ -0,0 +1,129 @@
+# polite_back/models/live.py
+# 입력 중인 댓글의 실시간 공격성 미리보기: 연결별 debounce/병합 + 전역 동시 채점 한도
+
+import asyncio
+import os
+import time
+from typing import Awaitable, Callable, Optional
+
+from polite_back.models import admission, bert_model, inference
+from polite_back.models.admission import Overloaded
+from polite_back.models.executor import QueueFull
+
+LIVE_DEBOUNCE_MS = float(os.environ.get("LIVE_DEBOUNCE_MS", "300"))   # 마지막 입력 후 이만큼 조용하면 채점
+LIVE_MAX_DELAY_MS = float(os.environ.get("LIVE_MAX_DELAY_MS", "1500"))  # 계속 입력 중이어도 이 간격으로는 갱신
+LIVE_MAX_INFLIGHT = int(os.environ.get("LIVE_MAX_INFLIGHT", "4"))     # 전체 연결 합산 동시 채점 수
+LIVE_MAX_CHARS = int(os.environ.get("LIVE_MAX_CHARS", "2000"))
+
+
+class LiveStats:
+    def __init__(self):
+        self.connections = 0
+        self.active = 0
+        self.drafts = 0
+        self.scored = 0
+        self.dropped = 0  # 채점 전에 더 새 초안으로 대체됨
+        self.busy = 0
+        self.errors = 0
+        self.score_ms_total = 0.0
+
+    def stats(self) -> dict:
+        return {
+            "connections": self.connections,
+            "active": self.active,
+            "drafts": self.drafts,
+            "scored": self.scored,
+            "dropped": self.dropped,
+            "busy": self.busy,
+            "errors": self.errors,
+            "avg_score_ms": round(self.score_ms_total / self.scored, 3) if self.scored else 0.0,
+        }
+
+
+live_stats = LiveStats()
+_slots: Optional[asyncio.Semaphore] = None
+
+
+def _global_slots() -> asyncio.Semaphore:
+    # 이벤트 루프 안에서 생성 (python 3.9 Semaphore 는 생성 시점 루프에 묶임)
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(max(1, LIVE_MAX_INFLIGHT))
+    return _slots
+
+
+class LiveSession:
+    """
+    연결 하나의 초안 상태. update() 는 최신 초안만 남기고(이전 초안은 폐기),
+    run() 은 debounce 후 최신 초안 하나만 채점 → 연결당 진행 중 채점은 항상 최대 1개.
+    """
+
+    def __init__(self, threshold: float, send: Callable[[dict], Awaitable[None]]):
+        self.threshold = threshold
+        self.send = send
+        self.seq = 0
+        self.text = ""
+        self._pending_since: Optional[float] = None
+        self._changed = asyncio.Event()
+
+    def update(self, text: str, seq: Optional[int] = None):
+        live_stats.drafts += 1
+        if self._pending_since is not None:
+            live_stats.dropped += 1  # 아직 채점되지 않은 이전 초안
+        else:
+            self._pending_since = time.perf_counter()
+        self.seq = seq if seq is not None else self.seq + 1
+        self.text = text[:LIVE_MAX_CHARS]
+        self._changed.set()
+
+    async def _debounce(self):
+        await self._changed.wait()
+        while True:
+            self._changed.clear()
+            waited = (time.perf_counter() - self._pending_since) * 1000
+            quiet = min(LIVE_DEBOUNCE_MS, LIVE_MAX_DELAY_MS - waited)
+            if quiet <= 0:
+                return
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=quiet / 1000)
+            except asyncio.TimeoutError:
+                return
+
+    async def run(self):
+        admission.set_priority(admission.LIVE)
+        while True:
+            await self._debounce()
+            async with _global_slots():
+                # 슬롯을 기다리는 동안 들어온 초안까지 반영해 최신 것만 채점
+                seq, text = self.seq, self.text
+                self._pending_since = None
+                self._changed.clear()
+                if not text.strip():
+                    continue
+                started = time.perf_counter()
+                try:
+                    # 실시간 미리보기는 항상 세그먼트 단위 → 수정되지 않은 문장은 캐시에서 재사용
+                    prob, lexicon_hit = await inference.score(text, segmented=True, threshold=self.threshold)
+                except (Overloaded, QueueFull) as e:
+                    live_stats.busy += 1
+                    await self.send({"type": "busy", "seq": seq, "retry_after": getattr(e, "retry_after", 1)})
+                    continue
+                except Exception as e:
+                    # 한 초안의 채점 실패로 연결의 미리보기 전체가 멈추지 않도록 알리고 다음 초안을 기다림
+                    live_stats.errors += 1
+                    print(f"[live] score failed: {e!r}")
+                    await self.send({"type": "error", "seq": seq})
+                    continue
+                ms = (time.perf_counter() - started) * 1000
+            live_stats.scored += 1
+            live_stats.score_ms_total += ms
+            pred, prob = bert_model.decide((prob, lexicon_hit), self.threshold)
+            await self.send({
+                "type": "score",
+                "seq": seq,
+                "probability": round(prob, 4),
+                "over_threshold": bool(pred == 1),
+                "lexicon_hit": lexicon_hit,
+                "stale": seq != self.seq,  # 채점 중 새 초안이 들어옴 (곧 갱신됨)
+                "latency_ms": round(ms, 1),
+            })
@@ -0,0 +1,251 @@
+# polite_back/models/registry.py
+# 모델 상주 관리: 메모리 예산(MODEL_MEMORY_BUDGET_MB) 안에서 KoELECTRA / KoBART 를 로드하고,
+# 일정 시간 쓰이지 않은 모델은 내렸다가 다음 요청(또는 prewarm 힌트)에서 다시 로드한다.
+#
+# - 사용 중 표시: InferenceExecutor 가 모델 연산을 실행하는 동안 use(name) 으로 감싼다 (사용 중에는 해제하지 않음)
+# - 로드 시점: 각 모듈의 지연 로더(_ensure_loaded / get_kobart_model)가 before_load / after_load 를 호출
+#   → 예산을 넘으면 사용 중이 아닌 다른 모델을 오래된 순으로 해제 후 로드
+# - 유휴 해제: start() 가 띄운 백그라운드 태스크가 주기적으로 reap()
+
+import asyncio
+import gc
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+from polite_back.models import artifacts, bert_model, kobart_model
+
+# 0: 제한 없음. 모델 상주 메모리(로드 전후 RSS 차이) 합계 상한
+MODEL_MEMORY_BUDGET_MB = float(os.environ.get("MODEL_MEMORY_BUDGET_MB", "0"))
+# 마지막 사용 후 이 시간(초)이 지나면 해제 (0: 해제하지 않음, 기존 동작)
+ELECTRA_IDLE_UNLOAD_S = float(os.environ.get("ELECTRA_IDLE_UNLOAD_S", "0"))
+KOBART_IDLE_UNLOAD_S = float(os.environ.get("KOBART_IDLE_UNLOAD_S", "0"))
+MODEL_REAP_INTERVAL_S = float(os.environ.get("MODEL_REAP_INTERVAL_S", "30"))
+# 처음 로드하기 전(실측 전) 예산 계산에 쓰는 추정치 (fp32 기준)
+ELECTRA_SIZE_MB = float(os.environ.get("ELECTRA_SIZE_MB", "450"))
+KOBART_SIZE_MB = float(os.environ.get("KOBART_SIZE_MB", "500"))
+
+
+def _release_memory():
+    """해제된 텐서 메모리를 OS 로 반환 (glibc 는 free 만으로는 RSS 가 잘 줄지 않음)."""
+    gc.collect()
+    try:
+        import torch
+
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    except ImportError:
+        pass
+    try:
+        import ctypes
+
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+class ModelEntry:
+    def __init__(
+        self,
+        name: str,
+        load: Callable[[], object],
+        unload: Callable[[], bool],
+        is_loaded: Callable[[], bool],
+        idle_unload_s: float,
+        size_hint_mb: float,
+    ):
+        self.name = name
+        self.load = load
+        self.unload = unload
+        self.is_loaded = is_loaded
+        self.idle_unload_s = idle_unload_s
+        self.size_mb = size_hint_mb  # 로드 후 실측치로 갱신
+        self.measured = False
+        self.in_use = 0
+        self.last_used: Optional[float] = None
+        self.loads = 0
+        self.unloads = 0
+        self.evictions = 0  # 예산 때문에 해제된 횟수 (unloads 에 포함)
+        self.prewarms = 0
+        self.load_ms_total = 0.0
+        self._rss_before = 0.0
+        self._load_started = 0.0
+
+    def to_dict(self) -> dict:
+        idle = time.time() - self.last_used if self.last_used is not None else None
+        return {
+            "resident": self.is_loaded(),
+            "in_use": self.in_use,
+            "size_mb": round(self.size_mb, 1),
+            "size_measured": self.measured,
+            "idle_s": round(idle, 1) if idle is not None else None,
+            "idle_unload_s": self.idle_unload_s,
+            "loads": self.loads,
+            "reloads": max(0, self.loads - 1),
+            "unloads": self.unloads,
+            "evictions": self.evictions,
+            "prewarms": self.prewarms,
+            "avg_load_ms": round(self.load_ms_total / self.loads, 1) if self.loads else 0.0,
+        }
+
+
+class ModelRegistry:
+    def __init__(self, budget_mb: float = MODEL_MEMORY_BUDGET_MB):
+        self.budget_mb = budget_mb
+        self.entries: Dict[str, ModelEntry] = {}
+        self._lock = threading.Lock()
+        self._prewarming: Dict[str, asyncio.Task] = {}
+        self.over_budget = 0  # 사용 중인 모델 때문에 예산을 지키지 못하고 로드한 횟수
+
+    def register(self, entry: ModelEntry):
+        self.entries[entry.name] = entry
+
+    @contextmanager
+    def use(self, name: Optional[str]):
+        entry = self.entries.get(name)
+        if entry is None:
+            yield
+            return
+        with self._lock:
+            entry.in_use += 1
+            entry.last_used = time.time()
+        try:
+            yield
+        finally:
+            with self._lock:
+                entry.in_use -= 1
+                entry.last_used = time.time()
+
+    def resident_mb(self) -> float:
+        return sum(e.size_mb for e in self.entries.values() if e.is_loaded())
+
+    def _evict_for(self, name: str, need_mb: float):
+        """need_mb 를 더해도 예산 안에 들도록 다른 모델을 LRU 순으로 해제 (사용 중이면 건너뜀)."""
+        if self.budget_mb <= 0:
+            return
+        with self._lock:
+            victims: List[ModelEntry] = sorted(
+                (e for e in self.entries.values() if e.name != name and e.is_loaded() and e.in_use == 0),
+                key=lambda e: e.last_used or 0.0,
+            )
+            for victim in victims:
+                if self.resident_mb() + need_mb <= self.budget_mb:
+                    break
+                # 다른 모델의 로드 잠금을 기다리지 않음 (로드 중이면 건너뜀 → 교착 방지)
+                if victim.unload():
+                    victim.unloads += 1
+                    victim.evictions += 1
+                    print(f"[registry] evicted {victim.name} for {name} (budget {self.budget_mb:.0f}MB)")
+            fits = self.resident_mb() + need_mb <= self.budget_mb
+        if not fits:
+            # 요청을 실패시키지 않고 예산 초과로 로드 (횟수만 기록)
+            self.over_budget += 1
+            print(f"[registry] loading {name} over budget ({self.resident_mb():.0f}+{need_mb:.0f}MB > {self.budget_mb:.0f}MB)")
+
+    def before_load(self, name: str):
+        """지연 로더가 실제 로드 직전에 호출 (해당 모델의 로드 잠금을 잡은 상태)."""
+        entry = self.entries[name]
+        self._evict_for(name, entry.size_mb)
+        _release_memory()
+        entry._rss_before = artifacts.rss_mb()
+        entry._load_started = time.perf_counter()
+
+    def after_load(self, name: str):
+        entry = self.entries[name]
+        entry.load_ms_total += (time.perf_counter() - entry._load_started) * 1000
+        # 재로드 시에는 해제된 메모리를 재사용해 증가분이 작게 잡히므로 관측 최댓값 유지
+        delta = artifacts.rss_mb() - entry._rss_before
+        if delta > 0:
+            entry.size_mb = max(delta, entry.size_mb) if entry.measured else delta
+            entry.measured = True
+        with self._lock:
+            entry.loads += 1
+            entry.last_used = time.time()
+
+    def reap(self, now: Optional[float] = None) -> List[str]:
+        """유휴 시간이 지난 모델 해제. 해제한 모델 이름 목록."""
+        now = now or time.time()
+        freed = []
+        with self._lock:
+            for entry in self.entries.values():
+                if entry.idle_unload_s <= 0 or entry.in_use or not entry.is_loaded():
+                    continue
+                if entry.last_used is not None and now - entry.last_used < entry.idle_unload_s:
+                    continue
+                if entry.unload():
+                    entry.unloads += 1
+                    freed.append(entry.name)
+        if freed:
+            before = artifacts.rss_mb()
+            _release_memory()
+            print(f"[registry] unloaded idle {', '.join(freed)} (RSS {before:.0f}MB → {artifacts.rss_mb():.0f}MB)")
+        return freed
+
+    async def prewarm(self, name: str):
+        """
+        곧 쓰일 모델을 미리 로드 (정책상 KoBART 를 쓰는 포스트에 사용자가 들어왔을 때 등).
+        이미 상주 중이면 유휴 타이머만 갱신. 같은 모델의 prewarm 은 하나만 진행.
+        """
+        entry = self.entries.get(name)
+        if entry is None:
+            return
+        if entry.is_loaded():
+            entry.last_used = time.time()
+            return
+        task = self._prewarming.get(name)
+        if task is None or task.done():
+            from polite_back.models.executor import QueueFull, electra_executor, kobart_executor
+
+            executor = electra_executor if name == "electra" else kobart_executor
+            entry.prewarms += 1
+
+            async def _load():
+                try:
+                    await executor.run(entry.load)
+                except QueueFull:
+                    pass  # 바쁘면 다음 요청에서 로드
+                except Exception as e:
+                    print(f"[registry] prewarm {name} failed: {e}")
+                finally:
+                    self._prewarming.pop(name, None)
+
+            task = asyncio.get_running_loop().create_task(_load())
+            self._prewarming[name] = task
+        await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {
+            "budget_mb": self.budget_mb,
+            "resident_mb": round(self.resident_mb(), 1),
+            "rss_mb": round(artifacts.rss_mb(), 1),
+            "over_budget_loads": self.over_budget,
+            "models": {name: e.to_dict() for name, e in self.entries.items()},
+        }
+
+
+models = ModelRegistry()
+models.register(ModelEntry(
+    "electra", bert_model._ensure_loaded, bert_model.unload, bert_model.is_loaded,
+    ELECTRA_IDLE_UNLOAD_S, ELECTRA_SIZE_MB,
+))
+models.register(ModelEntry(
+    "kobart", kobart_model.get_kobart_model, kobart_model.unload, kobart_model.is_loaded,
+    KOBART_IDLE_UNLOAD_S, KOBART_SIZE_MB,
+))
+
+
+async def _reap_loop():
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(MODEL_REAP_INTERVAL_S)
+        # gc / malloc_trim 이 이벤트 루프를 막지 않도록
+        await loop.run_in_executor(None, models.reap)
+
+
+def start() -> Optional[asyncio.Task]:
+    """lifespan / 모델 서버에서 호출. 유휴 해제가 꺼져 있으면 None."""
+    if not any(e.idle_unload_s > 0 for e in models.entries.values()):
+        return None
+    return asyncio.get_running_loop().create_task(_reap_loop())
@@ -0,0 +1,182 @@
+# polite_back/models/remote.py
+# 웹 워커 ↔ 모델 서버(polite_back.model_server) Unix 소켓 프로토콜과 클라이언트
+# 프레임: 4바이트 길이(big-endian) + JSON. 요청 {"id", "op", "args", "priority"} → 응답 {"id", "result"|"error"}
+# 스트리밍(op=stream) 응답은 {"id", "event", "data"} 여러 개 뒤 {"id", "end": true}.
+# 텐서는 모델 서버 밖으로 나가지 않고 텍스트/점수만 오가므로 공유 메모리 없이 JSON 으로 충분하다.
+
+import asyncio
+import itertools
+import json
+import os
+import struct
+from typing import Any, AsyncIterator, Dict, Optional
+
+from polite_back.models import admission
+from polite_back.models.admission import Overloaded
+from polite_back.models.executor import QueueFull
+
+# ""(기본): 각 프로세스가 모델을 직접 로드 | client: MODEL_SERVER_SOCKET 의 모델 서버 사용
+MODEL_SERVER = os.environ.get("MODEL_SERVER", "").lower()
+MODEL_SERVER_SOCKET = os.environ.get("MODEL_SERVER_SOCKET", "/tmp/polite-model-server.sock")
+MODEL_SERVER_TIMEOUT = float(os.environ.get("MODEL_SERVER_TIMEOUT", "60"))
+
+_HEADER = struct.Struct(">I")
+MAX_FRAME = 16 * 1024 * 1024
+
+
+class ModelServerError(RuntimeError):
+    """모델 서버에서 난 그 외 예외 (라우터에서 500)."""
+
+
+async def read_frame(reader: asyncio.StreamReader) -> dict:
+    (size,) = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+    if size > MAX_FRAME:
+        raise ValueError(f"frame too large: {size}")
+    return json.loads(await reader.readexactly(size))
+
+
+def write_frame(writer: asyncio.StreamWriter, msg: dict):
+    body = json.dumps(msg, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    writer.write(_HEADER.pack(len(body)) + body)
+
+
+def encode_error(e: BaseException) -> dict:
+    if isinstance(e, Overloaded):
+        return {"type": "Overloaded", "name": e.name, "priority": e.priority, "wait_ms": e.wait_ms, "slo_ms": e.slo_ms}
+    if isinstance(e, QueueFull):
+        return {"type": "QueueFull", "name": e.name, "limit": e.limit}
+    return {"type": type(e).__name__, "message": str(e)}
+
+
+def decode_error(err: dict) -> Exception:
+    # 과부하 계열은 같은 예외로 복원 → main.py 핸들러가 워커에서도 그대로 429/503 변환
+    if err.get("type") == "Overloaded":
+        return Overloaded(err["name"], err["priority"], err["wait_ms"], err["slo_ms"])
+    if err.get("type") == "QueueFull":
+        return QueueFull(err["name"], err["limit"])
+    return ModelServerError(f"{err.get('type')}: {err.get('message')}")
+
+
+class ModelClient:
+    """
+    워커당 하나의 연결을 여러 요청이 공유(요청 id 로 다중화). 연결이 끊기면 대기 중인 요청은 ConnectionError,
+    다음 요청에서 재연결.
+    """
+
+    def __init__(self, path: str = MODEL_SERVER_SOCKET, timeout: float = MODEL_SERVER_TIMEOUT):
+        self.path = path
+        self.timeout = timeout
+        self._ids = itertools.count(1)
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._calls: Dict[int, asyncio.Future] = {}
+        self._streams: Dict[int, asyncio.Queue] = {}
+        self.requests = 0
+        self.errors = 0
+        self.reconnects = 0
+
+    async def _ensure(self):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._writer is not None and not self._writer.is_closing():
+                return
+            self._reader, self._writer = await asyncio.open_unix_connection(self.path, limit=MAX_FRAME)
+            self._reader_task = asyncio.get_running_loop().create_task(self._read_loop(self._reader))
+            self.reconnects += 1
+
+    async def _read_loop(self, reader: asyncio.StreamReader):
+        try:
+            while True:
+                msg = await read_frame(reader)
+                rid = msg.get("id")
+                if rid in self._streams:
+                    self._streams[rid].put_nowait(msg)
+                    continue
+                fut = self._calls.pop(rid, None)
+                if fut is None or fut.done():
+                    continue
+                if "error" in msg:
+                    fut.set_exception(decode_error(msg["error"]))
+                else:
+                    fut.set_result(msg.get("result"))
+        except (asyncio.IncompleteReadError, ConnectionError, OSError, ValueError) as e:
+            self._fail_all(ConnectionError(f"model server connection lost: {e}"))
+
+    def _fail_all(self, exc: Exception):
+        if self._writer is not None:
+            self._writer.close()
+        self._writer = None
+        calls, self._calls = self._calls, {}
+        for fut in calls.values():
+            if not fut.done():
+                fut.set_exception(exc)
+        for q in self._streams.values():
+            q.put_nowait({"error": {"type": "ConnectionError", "message": str(exc)}})
+
+    async def _send(self, msg: dict):
+        await self._ensure()
+        write_frame(self._writer, msg)
+        await self._writer.drain()
+
+    async def call(self, op: str, **args) -> Any:
+        rid = next(self._ids)
+        fut = asyncio.get_running_loop().create_future()
+        self._calls[rid] = fut
+        self.requests += 1
+        try:
+            await self._send({"id": rid, "op": op, "args": args, "priority": admission.current_priority()})
+            return await asyncio.wait_for(fut, timeout=self.timeout)
+        except asyncio.CancelledError:
+            await self._cancel(rid)
+            raise
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self._calls.pop(rid, None)
+
+    async def stream(self, op: str, **args) -> AsyncIterator[dict]:
+        rid = next(self._ids)
+        queue: asyncio.Queue = asyncio.Queue()
+        self._streams[rid] = queue
+        self.requests += 1
+        finished = False
+        try:
+            await self._send({"id": rid, "op": op, "args": args, "priority": admission.current_priority()})
+            while True:
+                msg = await asyncio.wait_for(queue.get(), timeout=self.timeout)
+                if "error" in msg:
+                    self.errors += 1
+                    finished = True
+                    if msg["error"].get("type") == "ConnectionError":
+                        raise ConnectionError(msg["error"].get("message"))
+                    raise decode_error(msg["error"])
+                if msg.get("end"):
+                    finished = True
+                    return
+                yield msg
+        finally:
+            self._streams.pop(rid, None)
+            if not finished:
+                # 클라이언트 이탈 → 서버 쪽 생성도 중단
+                await self._cancel(rid)
+
+    async def _cancel(self, rid: int):
+        try:
+            if self._writer is not None and not self._writer.is_closing():
+                write_frame(self._writer, {"id": next(self._ids), "op": "cancel", "args": {"target": rid}})
+        except (ConnectionError, OSError):
+            pass
+
+    def stats(self) -> dict:
+        return {
+            "socket": self.path,
+            "connected": self._writer is not None and not self._writer.is_closing(),
+            "requests": self.requests,
+            "errors": self.errors,
+            "connects": self.reconnects,
+            "pending": len(self._calls) + len(self._streams),
+        }
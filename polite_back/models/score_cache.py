@@ -0,0 +1,91 @@
+# polite_back/models/score_cache.py
+
+import hashlib
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+_WS = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """NFC 정규화 + 공백 축약. 토크나이저 입장에서 동일한 입력을 같은 키로 묶는다."""
+    return _WS.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def text_key(text: str) -> bytes:
+    return hashlib.blake2b(normalize_text(text).encode("utf-8"), digest_size=16).digest()
+
+
+class LRUCache:
+    """
+    항목 수 상한(max_entries) + TTL 을 갖는 프로세스 내 LRU 캐시.
+    값은 임계값 적용 전 원본 점수를 저장하므로 포스트별 threshold 를 나중에 적용할 수 있다.
+    """
+
+    def __init__(self, max_entries: int = 4096, ttl: float = 3600.0, name: str = "cache"):
+        self.max_entries = max(0, int(max_entries))
+        self.ttl = float(ttl)
+        self.name = name
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            value, expires = item
+            if self.ttl > 0 and expires < time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self._data),
+            "max_entries": self.max_entries,
+            "ttl_s": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
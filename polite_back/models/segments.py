@@ -0,0 +1,74 @@
+# polite_back/models/segments.py
+# 댓글을 문장(또는 길이 제한 윈도우) 단위로 분할 → 세그먼트별 채점/캐시 후 댓글 점수로 집계
+# 수정된 댓글은 바뀐 문장만 다시 모델에 들어가고, 128 토큰을 넘는 긴 댓글도 잘리지 않는다.
+
+import os
+import re
+from typing import List, Sequence, Tuple
+
+from polite_back.models.score_cache import normalize_text
+
+# 한 세그먼트 최대 문자 수: 한국어 기준 MAX_LENGTH(128 토큰) 안에 들어가도록 여유 있게
+SEGMENT_MAX_CHARS = int(os.environ.get("SEGMENT_MAX_CHARS", "150"))
+# 이보다 짧은 조각("ㅋㅋ.", "진짜?")은 앞 문장에 붙임
+SEGMENT_MIN_CHARS = int(os.environ.get("SEGMENT_MIN_CHARS", "8"))
+# 문장 부호 없이 긴 텍스트를 자를 때 윈도우 간 겹치는 비율 (경계에 걸친 표현도 한 윈도우에는 온전히 포함)
+SEGMENT_OVERLAP = float(os.environ.get("SEGMENT_OVERLAP", "0.25"))
+
+_SENTENCE_END = re.compile(r"(?<=[.!?…~。])\s+")
+
+
+def _windows(sentence: str, max_chars: int, overlap: float) -> List[str]:
+    """어절 경계에서 max_chars 이하 윈도우로 자름. 인접 윈도우는 overlap 비율만큼 어절을 공유."""
+    words = sentence.split(" ")
+    out: List[str] = []
+    start = 0
+    while start < len(words):
+        end, size = start, 0
+        while end < len(words) and (end == start or size + 1 + len(words[end]) <= max_chars):
+            size += len(words[end]) + (1 if end > start else 0)
+            end += 1
+        out.append(" ".join(words[start:end]))
+        if end >= len(words):
+            break
+        step = max(1, int((end - start) * (1 - overlap)))
+        start += step
+    return out
+
+
+def split_segments(
+    text: str,
+    max_chars: int = SEGMENT_MAX_CHARS,
+    min_chars: int = SEGMENT_MIN_CHARS,
+    overlap: float = SEGMENT_OVERLAP,
+) -> List[str]:
+    """
+    원문 → 정규화된 세그먼트 목록 (순서 유지, 빈 문자열 없음). 짧은 한 줄 텍스트는 [normalize_text(text)].
+    normalize_text 가 줄바꿈을 공백으로 합치므로 줄 단위로 먼저 나눈 뒤 줄마다 정규화.
+    """
+    lines = [norm for norm in map(normalize_text, text.splitlines()) if norm]
+    if len(lines) == 1 and len(lines[0]) <= max_chars and not _SENTENCE_END.search(lines[0]):
+        return lines
+
+    sentences: List[str] = []
+    for s in (s for line in lines for s in _SENTENCE_END.split(line)):
+        s = s.strip()
+        if not s:
+            continue
+        if sentences and len(s) < min_chars and len(sentences[-1]) + 1 + len(s) <= max_chars:
+            sentences[-1] = f"{sentences[-1]} {s}"
+        else:
+            sentences.append(s)
+
+    segments: List[str] = []
+    for s in sentences:
+        segments.extend([s] if len(s) <= max_chars else _windows(s, max_chars, overlap))
+    return segments
+
+
+def aggregate(scores: Sequence[Tuple[float, bool]]) -> Tuple[float, bool]:
+    """
+    집계 규칙: 댓글 확률 = 세그먼트 확률의 최댓값, 사전 매칭은 하나라도 있으면 매칭.
+    공격적인 문장이 하나라도 있으면 댓글 전체가 임계를 넘도록 (긴 댓글에서 희석되지 않음).
+    """
+    return max(p for p, _ in scores), any(hit for _, hit in scores)
@@ -0,0 +1,61 @@
+# polite_back/models/singleflight.py
+# 같은 키(모델 + 정규화 입력 + 디코딩 파라미터)로 동시에 들어온 요청은 하나의 실행 결과를 공유
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Future):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    첫 요청(leader)만 fn() 을 실행하고, 완료 전에 들어온 같은 키 요청은 같은 태스크를 await.
+    기다리는 쪽이 모두 취소되면 실행도 취소 (배치에 들어가기 전이면 모델 호출 자체가 생략됨).
+    한 요청이 취소돼도 나머지 대기자는 계속 결과를 받는다.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[Hashable, _Flight] = {}
+        self.leaders = 0
+        self.shared = 0  # 절약한 모델 호출 수
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        flight = self._inflight.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(fn()))
+            self._inflight[key] = flight
+            flight.task.add_done_callback(lambda _, k=key, f=flight: self._forget(k, f))
+            self.leaders += 1
+        else:
+            self.shared += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # 취소가 반영되기 전에 같은 키로 들어온 요청이 취소될 태스크에 붙지 않도록 즉시 제거
+                self._forget(key, flight)
+                flight.task.cancel()
+
+    def _forget(self, key: Hashable, flight: _Flight):
+        if self._inflight.get(key) is flight:
+            del self._inflight[key]
+
+    def stats(self) -> dict:
+        total = self.leaders + self.shared
+        return {
+            "name": self.name,
+            "in_flight": len(self._inflight),
+            "calls": total,
+            "saved_calls": self.shared,
+            "saved_ratio": round(self.shared / total, 4) if total else 0.0,
+        }
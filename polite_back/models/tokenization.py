@@ -0,0 +1,158 @@
+# polite_back/models/tokenization.py
+# 두 모델 공용 토큰화 단계: Rust fast tokenizer 로 배치 단위 토큰화 + 최근 텍스트의 토큰 id 캐시
+# - encode(): 입력별 Encoded(ids, length, full_length) → 호출부가 다시 토큰화하지 않고 잘림/디코딩 길이 판단
+# - buckets(): 배치 하나의 패딩 비율이 클 때만 토큰 길이 구간별로 나눈 인덱스 (보통은 배치 전체가 한 그룹 = forward 1회)
+# - collate(): 버킷 하나를 오른쪽 패딩된 input_ids / attention_mask 텐서로
+
+import os
+import threading
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from polite_back.models.score_cache import LRUCache
+
+TOKEN_CACHE_SIZE = int(os.environ.get("TOKEN_CACHE_SIZE", "8192"))  # 0이면 비활성화
+# 배치 전체를 최장 길이로 패딩했을 때 패딩 토큰 비율이 이 값을 넘을 때만 길이 구간별로 나눔
+# (나누면 forward/generate 호출이 늘어 호출당 고정 비용이 커지므로 패딩 낭비가 클 때만)
+BUCKET_MAX_PADDING = float(os.environ.get("BUCKET_MAX_PADDING", "0.5"))
+
+
+class Encoded(NamedTuple):
+    ids: Tuple[int, ...]  # 특수 토큰 포함, max_length 로 잘린 id
+    length: int           # len(ids) = 모델에 실제로 들어가는 토큰 수
+    full_length: int      # 자르기 전 토큰 수 (> length 면 잘림)
+
+    @property
+    def truncated(self) -> bool:
+        return self.full_length > self.length
+
+
+class BatchTokenizer:
+    """
+    get_tokenizer: 로드된 fast tokenizer 를 돌려주는 함수 (모델 모듈의 지연 로더와 함께 로드/해제).
+    prefix 는 토큰화 직전에 붙이고(KoBART "[순화] "), 캐시 키는 prefix 없는 원문.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        get_tokenizer: Callable[[], object],
+        prefix: str = "",
+        max_length: Optional[int] = None,
+        bucket_width: int = 16,
+        cache_size: int = TOKEN_CACHE_SIZE,
+        max_padding: float = BUCKET_MAX_PADDING,
+    ):
+        self.name = name
+        self.get_tokenizer = get_tokenizer
+        self.prefix = prefix
+        self.max_length = max_length
+        self.bucket_width = max(0, int(bucket_width))  # 0: 나누지 않음
+        self.max_padding = max_padding
+        self.cache = LRUCache(cache_size, ttl=0, name=f"{name}_tokens")
+        # fast tokenizer 는 truncation/padding 설정을 내부 상태로 바꾸므로 워커 스레드 간 동시 호출 금지
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.tokenized = 0
+        self.truncated = 0
+        self.batches = 0
+        self.split_batches = 0  # 패딩 비율 초과로 나눈 배치 수
+
+    def _truncate(self, ids: List[int], max_length: Optional[int]) -> Tuple[int, ...]:
+        if max_length is None or len(ids) <= max_length:
+            return tuple(ids)
+        # [CLS] … [SEP] / <s> … </s>: HF truncation 과 같이 본문 끝을 자르고 마지막 특수 토큰 유지
+        return tuple(ids[: max_length - 1] + ids[-1:])
+
+    def encode(self, texts: Sequence[str], max_length: Optional[int] = None, use_cache: bool = True) -> List[Encoded]:
+        """입력 순서대로 Encoded. 캐시에 없는 텍스트만 한 번의 배치 호출로 토큰화."""
+        max_length = max_length or self.max_length
+        use_cache = use_cache and max_length == self.max_length
+        results: List[Optional[Encoded]] = [None] * len(texts)
+        todo: Dict[str, List[int]] = {}
+        for i, text in enumerate(texts):
+            cached = self.cache.get(text) if use_cache else None
+            if cached is not None:
+                results[i] = cached
+            else:
+                todo.setdefault(text, []).append(i)
+        if todo:
+            missing = list(todo)
+            tokenizer = self.get_tokenizer()
+            with self._lock:
+                # 자르지 않고 토큰화 → 전체 길이를 알고 나서 직접 자름
+                batch = tokenizer(
+                    [self.prefix + t for t in missing],
+                    add_special_tokens=True,
+                    return_attention_mask=False,
+                    return_token_type_ids=False,
+                )["input_ids"]
+            self.calls += 1
+            self.tokenized += len(missing)
+            for text, ids in zip(missing, batch):
+                ids = list(ids)
+                trimmed = self._truncate(ids, max_length)
+                enc = Encoded(trimmed, len(trimmed), len(ids))
+                if enc.truncated:
+                    self.truncated += 1
+                if use_cache:
+                    self.cache.put(text, enc)
+                for i in todo[text]:
+                    results[i] = enc
+        return results
+
+    @staticmethod
+    def padding_ratio(encoded: Sequence[Encoded]) -> float:
+        """최장 길이로 패딩했을 때 패딩 토큰 비율."""
+        longest = max(e.length for e in encoded)
+        return 1 - sum(e.length for e in encoded) / (longest * len(encoded))
+
+    def buckets(self, encoded: Sequence[Encoded], width: Optional[int] = None) -> List[List[int]]:
+        """
+        배치 전체의 패딩 비율이 max_padding 이하면(또는 width 0) 입력 순서 그대로 한 그룹.
+        넘으면 토큰 길이 오름차순 인덱스를 width 토큰 구간별로 묶음.
+        """
+        width = self.bucket_width if width is None else width
+        self.batches += 1
+        if width <= 0 or len(encoded) < 2 or self.padding_ratio(encoded) <= self.max_padding:
+            return [list(range(len(encoded)))]
+        self.split_batches += 1
+        order = sorted(range(len(encoded)), key=lambda i: encoded[i].length)
+        groups: List[List[int]] = []
+        for i in order:
+            key = encoded[i].length // width
+            if groups and encoded[groups[-1][0]].length // width == key:
+                groups[-1].append(i)
+            else:
+                groups.append([i])
+        return groups
+
+    def collate(self, encoded: Sequence[Encoded], device=None) -> dict:
+        """배치 내 최장 길이에 맞춰 오른쪽 패딩 (기존 tokenizer(..., padding=True) 와 같은 텐서)."""
+        import torch
+
+        pad_id = self.get_tokenizer().pad_token_id or 0
+        width = max(e.length for e in encoded)
+        input_ids = torch.full((len(encoded), width), pad_id, dtype=torch.long)
+        attention_mask = torch.zeros((len(encoded), width), dtype=torch.long)
+        for row, e in enumerate(encoded):
+            input_ids[row, : e.length] = torch.tensor(e.ids, dtype=torch.long)
+            attention_mask[row, : e.length] = 1
+        if device is not None:
+            input_ids = input_ids.to(device)
+            attention_mask = attention_mask.to(device)
+        return {"input_ids": input_ids, "attention_mask": attention_mask}
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "calls": self.calls,
+            "tokenized": self.tokenized,
+            "avg_batch": round(self.tokenized / self.calls, 3) if self.calls else 0.0,
+            "truncated": self.truncated,
+            "max_length": self.max_length,
+            "bucket_width": self.bucket_width,
+            "bucket_max_padding": self.max_padding,
+            "batches": self.batches,
+            "split_batches": self.split_batches,
+            "cache": self.cache.stats(),
+        }
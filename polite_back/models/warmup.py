@@ -0,0 +1,115 @@
+# polite_back/models/warmup.py
+# 기동 직후 백그라운드에서 모델 로드 + 대표 길이 더미 배치 실행 → 첫 사용자가 로드 시간을 기다리지 않도록
+# 상태는 GET /ready 로 노출 (모든 대상 모델이 ready 일 때 200)
+
+import asyncio
+import os
+import time
+from typing import Dict, List, Optional
+
+from polite_back.models import bert_model, kobart_model, remote
+from polite_back.models.executor import electra_executor, kobart_executor
+
+WARMUP_ENABLED = os.environ.get("WARMUP_ENABLED", "1") != "0"
+# 워밍업·준비 상태 판단 대상 (순서대로 로드: ELECTRA 는 모든 요청에 필요하므로 먼저)
+WARMUP_MODELS = [m.strip() for m in os.environ.get("WARMUP_MODELS", "electra,kobart").split(",") if m.strip()]
+
+PENDING, LOADING, WARMING, READY, FAILED = "pending", "loading", "warming", "ready", "failed"
+
+
+class ModelStatus:
+    def __init__(self, name: str):
+        self.name = name
+        self.state = PENDING
+        self.load_ms: Optional[float] = None
+        self.warmup_ms: Optional[float] = None
+        self.error: Optional[str] = None
+        self.ready_at: Optional[float] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "state": self.state,
+            "load_ms": round(self.load_ms, 1) if self.load_ms is not None else None,
+            "warmup_ms": round(self.warmup_ms, 1) if self.warmup_ms is not None else None,
+            "error": self.error,
+            "ready_at": self.ready_at,
+        }
+
+
+# name → (load, warmup, executor, 로드 소요 시간 조회)
+_MODELS = {
+    "electra": (bert_model._ensure_loaded, bert_model.warmup, electra_executor, lambda: bert_model.load_ms),
+    "kobart": (kobart_model.get_kobart_model, kobart_model.warmup, kobart_executor, lambda: kobart_model.load_ms),
+}
+
+status: Dict[str, ModelStatus] = {name: ModelStatus(name) for name in WARMUP_MODELS if name in _MODELS}
+
+
+async def _warm(name: str):
+    load, warm, executor, loaded_ms = _MODELS[name]
+    st = status[name]
+    st.state = LOADING
+    try:
+        started = time.perf_counter()
+        await executor.run(load)
+        # 요청이 먼저 로드를 시작했다면 그쪽 실측값 사용
+        st.load_ms = loaded_ms() or (time.perf_counter() - started) * 1000
+        st.state = WARMING
+        started = time.perf_counter()
+        await executor.run(warm)
+        st.warmup_ms = (time.perf_counter() - started) * 1000
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        st.state = FAILED
+        st.error = str(e)
+        print(f"[warmup] {name} failed: {e}")
+        return
+    st.state = READY
+    st.ready_at = time.time()
+    print(f"[warmup] {name} ready (load {st.load_ms:.0f}ms, warmup {st.warmup_ms:.0f}ms)")
+
+
+async def run():
+    for name in status:
+        await _warm(name)
+
+
+def start() -> Optional[asyncio.Task]:
+    """lifespan 에서 호출. 비활성화 시 None (모델은 첫 요청에서 지연 로드)."""
+    if not WARMUP_ENABLED or remote.MODEL_SERVER == "client":
+        # client 모드에서는 모델 서버가 워밍업
+        return None
+    return asyncio.get_running_loop().create_task(run())
+
+
+async def readiness() -> dict:
+    """client 모드면 모델 서버의 상태를 그대로 전달."""
+    if remote.MODEL_SERVER != "client":
+        return local_readiness()
+    from polite_back.models import inference
+
+    try:
+        body = await inference.remote.call("ready")
+    except (OSError, ConnectionError, asyncio.TimeoutError) as e:
+        return {"ready": False, "model_server": f"unreachable: {e}", "models": {}}
+    body["model_server"] = inference.remote.path
+    return body
+
+
+def local_readiness() -> dict:
+    models: Dict[str, dict] = {name: st.to_dict() for name, st in status.items()}
+    for name, st in models.items():
+        # ready 이후 유휴 해제됐을 수 있음 (다음 요청에서 다시 로드, registry 참고)
+        st["resident"] = _loaded(name)
+    if not WARMUP_ENABLED:
+        # 워밍업 없이 지연 로드: 요청을 받을 수는 있으므로 ready, 로드 여부만 표시
+        for name, st in models.items():
+            st["state"] = READY if _loaded(name) else "lazy"
+        return {"ready": True, "warmup": False, "models": models}
+    pending: List[str] = [name for name, st in status.items() if st.state != READY]
+    return {"ready": not pending, "warmup": True, "models": models}
+
+
+def _loaded(name: str) -> bool:
+    return bert_model.is_loaded() if name == "electra" else kobart_model.is_loaded()
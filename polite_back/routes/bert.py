@@ -1,21 +1,22 @@
 # polite_back/routes/bert.py
 
-import asyncio, torch
-from fastapi import APIRouter, HTTPException, Depends
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Depends, WebSocket, WebSocketDisconnect
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import Optional
 
-from polite_back.models.bert_model import predict as _predict
+from polite_back.models import inference
+from polite_back.models.live import LiveSession, live_stats
+from polite_back.models.admission import Overloaded
+from polite_back.models.executor import QueueFull
 from polite_back.model import Post
-from polite_back.database import get_db
+from polite_back.database import async_session, get_db
 
 router = APIRouter()
 
-# 동시 추론 제한 
-_infer_gate = asyncio.Semaphore(1)
-
 class TextInput(BaseModel):
     text: str = Field(..., min_length=1)
     post_id: int = Field(..., gt=0)
@@ -31,10 +32,8 @@ async def predict_sentiment(input: TextInput, db: AsyncSession = Depends(get_db)
 
         th = input.threshold if input.threshold is not None else float(post.threshold)
 
-        # 동시성 게이트로 메모리 피크 제어
-        async with _infer_gate:
-            # 내부에서 inference_mode 사용(bert_model.py)
-            pred, prob = _predict(input.text, threshold=th)
+        # 동시 요청은 마이크로 배치로 묶여 한 번의 forward로 처리됨
+        pred, prob = await inference.predict(input.text, threshold=th)
 
         return {
             "text": input.text,
@@ -45,7 +44,70 @@ async def predict_sentiment(input: TextInput, db: AsyncSession = Depends(get_db)
             "probability": round(prob, 4),
             "over_threshold": bool(pred == 1),
         }
-    except HTTPException:
+    except (HTTPException, QueueFull, Overloaded):
         raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/bert/stats")
+async def inference_stats():
+    body = inference.stats()
+    if inference.remote is not None:
+        # client 모드: 배치/캐시/입장 제어 실측치는 모델 서버 쪽에 있음
+        body["model_server"] = await inference.remote.call("stats")
+    return body
+
+@router.get("/bert/admission")
+async def admission_stats():
+    # 모델별 대기 항목·예상 대기 시간·우선순위별 입장/거절 수
+    return inference.admission_stats()
+
+@router.websocket("/bert/live/{post_id}")
+async def live_meter(websocket: WebSocket, post_id: int):
+    """
+    입력 중 실시간 공격성 미리보기.
+    수신: {"text": 초안, "seq": 선택} / 송신: {"type": "score"|"busy"|"error", "seq", "probability", "over_threshold", ...}
+    채점 태스크가 끝나 버리면(전송 실패 등) 1011 로 연결을 닫는다.
+    """
+    await websocket.accept()
+    # 연결 내내 DB 세션을 잡고 있지 않도록 임계값만 읽고 바로 반납
+    async with async_session() as db:
+        res = await db.execute(select(Post).where(Post.id == post_id))
+        post = res.scalar_one_or_none()
+    if not post:
+        await websocket.close(code=4404)
+        return
+    inference.prewarm_hint(post.policy_mode)
+
+    session = LiveSession(float(post.threshold), websocket.send_json)
+    scorer = asyncio.ensure_future(session.run())
+    live_stats.connections += 1
+    live_stats.active += 1
+    try:
+        while True:
+            receive = asyncio.ensure_future(websocket.receive_json())
+            await asyncio.wait({receive, scorer}, return_when=asyncio.FIRST_COMPLETED)
+            if not receive.done():
+                # 미리보기가 멈춘 채로 연결만 열려 있지 않도록 닫음
+                receive.cancel()
+                if not scorer.cancelled() and scorer.exception() is not None:
+                    print(f"[live] scorer stopped: {scorer.exception()!r}")
+                try:
+                    await websocket.close(code=1011)
+                except RuntimeError:
+                    pass  # 이미 닫힌 연결 (전송 실패로 태스크가 끝난 경우)
+                break
+            msg = receive.result()
+            if not isinstance(msg, dict):
+                continue
+            seq = msg.get("seq")
+            session.update(str(msg.get("text", "")), int(seq) if seq is not None else None)
+    except (WebSocketDisconnect, ValueError):
+        pass
+    finally:
+        live_stats.active -= 1
+        scorer.cancel()
+
+@router.get("/bert/live/stats")
+async def live_meter_stats():
+    return live_stats.stats()
@@ -9,8 +9,12 @@ from datetime import datetime, timedelta, timezone
 
 from polite_back import model
 from polite_back.database import get_db
-from polite_back.models.bert_model import predict
-from polite_back.routes.kobart import refine_text
+from polite_back import inference_token
+from polite_back.inference_token import InferenceHint
+from polite_back.models import admission
+from polite_back.models.bert_model import decide
+from polite_back.models.inference import open_refine_stream, predict, refine_for_threshold, score, score_and_refine
+from polite_back.routes.kobart import sse_event, sse_response
 from polite_back.schemas.schemas import SuggestReq, SuggestRes, SaveReq, SaveRes
 from polite_back.model import FinalSource, Comment
 
@@ -77,14 +81,8 @@ async def _assert_user_locked_to_post(db: AsyncSession, user_id: int, post_id: i
         raise HTTPException(status_code=403, detail="User is locked to another post")
 
 
-@router.post("/suggest", response_model=SuggestRes)
-async def suggest(req: SuggestReq, db: AsyncSession = Depends(get_db)):
-    post = await _load_post(db, req.post_id)
-    th = float(post.threshold)
-
-    # 공통: logit 계산
-    over_pred, prob = predict(req.text, threshold=th)
-
+def _suggest_without_rewrite(post: model.Post, th: float, over_pred: int, prob: float) -> Optional[SuggestRes]:
+    """순화문이 필요 없는 경우의 응답. 순화문 생성이 필요하면 None."""
     # A: block
     if post.policy_mode == "block":
         if over_pred:
@@ -112,35 +110,116 @@ async def suggest(req: SuggestReq, db: AsyncSession = Depends(get_db)):
             logit=prob
         )
 
-    # B: polite_one_edit
-    if over_pred:
-        polite_text = refine_text(req.text)
-        return SuggestRes(
-            policy_mode="polite_one_edit",
-            over_threshold=True,
-            threshold_applied=th,
-            polite_text=polite_text
-        )
-    else:
+    # B: polite_one_edit (기준 미만)
+    if not over_pred:
         return SuggestRes(
             policy_mode="polite_one_edit",
             over_threshold=False,
             threshold_applied=th,
             message="통과 가능합니다."
         )
+    return None
+
+
+async def _attach_token(res: SuggestRes, req: SuggestReq, th: float, over_pred: int, prob: float) -> SuggestRes:
+    """
+    이번 응답에 쓰인 판정/순화문을 서명 토큰으로 첨부 (원문은 다시 채점하지 않음).
+    순화문은 여기서 한 번 채점해 담는다 (적응형/rerank 디코딩이 이미 채점했으면 score_cache 적중).
+    """
+    hint = InferenceHint(
+        post_id=req.post_id,
+        threshold=th,
+        text_sha=inference_token.text_sha(req.text),
+        score_original=inference_token.decided_score(over_pred, prob, th),
+        polite_text=res.polite_text,
+        score_polite=await score(res.polite_text, threshold=th) if res.polite_text else None,
+    )
+    res.inference_token = inference_token.issue(hint)
+    return res
+
+
+@router.post("/suggest", response_model=SuggestRes)
+async def suggest(req: SuggestReq, db: AsyncSession = Depends(get_db)):
+    post = await _load_post(db, req.post_id)
+    th = float(post.threshold)
+
+    # B: 채점과 순화문 생성을 함께 (조건부로 동시 실행, 미만이면 생성 폐기)
+    if post.policy_mode == "polite_one_edit":
+        over_pred, prob, rewrite = await score_and_refine(req.text, th)
+    else:
+        over_pred, prob = await predict(req.text, threshold=th)
+        rewrite = None
+    res = _suggest_without_rewrite(post, th, over_pred, prob)
+    if res is not None:
+        return await _attach_token(res, req, th, over_pred, prob)
+
+    # B: polite_one_edit (기준 초과)
+    polite_text, strategy = rewrite
+    res = SuggestRes(
+        policy_mode="polite_one_edit",
+        over_threshold=True,
+        threshold_applied=th,
+        polite_text=polite_text,
+        decode_strategy=strategy
+    )
+    return await _attach_token(res, req, th, over_pred, prob)
+
+
+@router.post("/suggest/stream")
+async def suggest_stream(req: SuggestReq, db: AsyncSession = Depends(get_db)):
+    """
+    /suggest 의 SSE 버전. 순화문 생성 중에는 partial 이벤트를 보내고,
+    마지막 done 이벤트에는 /suggest 와 동일한 SuggestRes 를 담는다.
+    생성 입장 제어/대기열 거절은 응답 전에 429/503, 스트리밍 도중 실패는 error 이벤트.
+    """
+    post = await _load_post(db, req.post_id)
+    th = float(post.threshold)
+    over_pred, prob = await predict(req.text, threshold=th)
+    res = _suggest_without_rewrite(post, th, over_pred, prob)
+    stream = await open_refine_stream(req.text) if res is None else None
+
+    async def events():
+        if res is not None:
+            yield sse_event("done", (await _attach_token(res, req, th, over_pred, prob)).model_dump(mode="json"))
+            return
+        async for kind, payload in stream:
+            if kind == "partial":
+                yield sse_event("partial", payload)
+                continue
+            yield sse_event("metrics", {"ttft_ms": payload["ttft_ms"], "total_ms": payload["total_ms"]})
+            done = SuggestRes(
+                policy_mode="polite_one_edit",
+                over_threshold=True,
+                threshold_applied=th,
+                polite_text=payload["polite_text"],
+                decode_strategy="stream"
+            )
+            yield sse_event("done", (await _attach_token(done, req, th, over_pred, prob)).model_dump(mode="json"))
+
+    return sse_response(events())
 
 
 @router.post("", response_model=SaveRes)
 async def add_comment(req: SaveReq, db: AsyncSession = Depends(get_db)):
+    # 저장은 제안보다 나중에 버려지도록 높은 우선순위로 입장
+    admission.set_priority(admission.SAVE)
     post = await _load_post(db, req.post_id)
     th = float(post.threshold)
     sp = await _require_subpost(db, req.post_id, req.section)
     await _assert_user_locked_to_post(db, req.user_id, req.post_id)
     now_kst = datetime.now(KST_TZ)
 
+    # suggest 단계 결과 재사용: 토큰이 유효하면 원문 점수/순화문/순화문 점수를 다시 계산하지 않음
+    hint = inference_token.verify(req.inference_token, req.post_id, th, req.text_original)
+
+    async def _predict_original():
+        if hint is not None:
+            return decide(hint.score_original, th)
+        return await predict(req.text_original, threshold=th)
+
     # A: block
     if post.policy_mode == "block":
-        over_pred, prob = predict(req.text_original, threshold=th)
+        over_pred, prob = await _predict_original()
         if over_pred:
             new_comment = model.Comment(
                 user_id=req.user_id,
@@ -189,7 +268,7 @@ async def add_comment(req: SaveReq, db: AsyncSession = Depends(get_db)):
 
     # C: nofilter
     if post.policy_mode == "nofilter":
-        over_pred, prob = predict(req.text_original, threshold=th)
+        over_pred, prob = await _predict_original()
         new_comment = model.Comment(
             user_id=req.user_id,
             post_id=req.post_id,
@@ -214,7 +293,7 @@ async def add_comment(req: SaveReq, db: AsyncSession = Depends(get_db)):
 
 
     # B: polite_one_edit
-    over_pred, prob_orig = predict(req.text_original, threshold=th)
+    over_pred, prob_orig = await _predict_original()
     if not over_pred:
         # 미만이면 개입 없이 original 저장
         new_comment = model.Comment(
@@ -240,11 +319,22 @@ async def add_comment(req: SaveReq, db: AsyncSession = Depends(get_db)):
         return SaveRes(saved=True, final_source="original", comment_id=new_comment.id)
 
     # 기준 초과 → 제안문 필요
-    polite_text = req.generated_polite_text or refine_text(req.text_original)
+    if req.generated_polite_text:
+        polite_text = req.generated_polite_text
+    elif hint is not None and hint.polite_text:
+        polite_text = hint.polite_text
+    else:
+        polite_text = (await refine_for_threshold(req.text_original, th))[0]
+
+    async def _polite_prob() -> float:
+        # 사용자에게 보여준 순화문과 같을 때만 토큰의 점수를 그대로 저장
+        if hint is not None and hint.score_polite is not None and polite_text == hint.polite_text:
+            return hint.score_polite[0]
+        return (await predict(polite_text, threshold=th))[1]
 
     # 1회 수정이 있으면 평가
     if req.text_user_edit:
-        over_edit, prob_edit = predict(req.text_user_edit, threshold=th)
+        over_edit, prob_edit = await predict(req.text_user_edit, threshold=th)
         if not over_edit:
             # 수정본 채택
             new_comment = model.Comment(
@@ -273,7 +363,7 @@ async def add_comment(req: SaveReq, db: AsyncSession = Depends(get_db)):
             return SaveRes(saved=True, final_source="user_edit", comment_id=new_comment.id)
 
         # 수정안이 임계 초과 → 순화문으로 저장 (was_edited=False로 기록됨)
-        prob_polite = predict(polite_text, threshold=th)[1]
+        prob_polite = await _polite_prob()
         new_comment = model.Comment(
             user_id=req.user_id,
             post_id=req.post_id,
@@ -300,7 +390,7 @@ async def add_comment(req: SaveReq, db: AsyncSession = Depends(get_db)):
         return SaveRes(saved=True, final_source="polite", comment_id=new_comment.id)
 
     # 수정 없음 → 제안문(순화문) 채택
-    prob_polite = predict(polite_text, threshold=th)[1]
+    prob_polite = await _polite_prob()
     new_comment = model.Comment(
         user_id=req.user_id,
         post_id=req.post_id,
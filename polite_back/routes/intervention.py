@@ -26,6 +26,7 @@ async def log_intervention(payload: dict, db: AsyncSession = Depends(get_db)):
       "threshold_applied": 0.5,
       "action_applied": "blocked"|"none",
       "generated_polite_text": "...",              # 순화 완료시
+      "decode_strategy": "greedy"|"greedy_beam"|..., # /comments/suggest 응답값 그대로
       "user_edit_text": "...", "edit_logit": 0.74, # 수정 시도시
       "decision_rule_applied": "forced_accept_one_edit"|"none",
       "final_choice_hint": "polite"|"user_edit"|"original"|"unknown",
@@ -42,6 +43,7 @@ async def log_intervention(payload: dict, db: AsyncSession = Depends(get_db)):
       threshold_applied=payload.get("threshold_applied"),
       action_applied=payload.get("action_applied", "none"),
       generated_polite_text=payload.get("generated_polite_text"),
+      decode_strategy=payload.get("decode_strategy"),
       user_edit_text=payload.get("user_edit_text"),
       edit_logit=payload.get("edit_logit"),
       decision_rule_applied=DecisionRule(payload.get("decision_rule_applied", "none")),
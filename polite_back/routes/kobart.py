@@ -1,24 +1,147 @@
 # polite_back/routes/kobart.py
 
-import asyncio, torch
-from fastapi import APIRouter
-from polite_back.schemas.request import InputText
-from polite_back.models.kobart_model import get_kobart_model
+import asyncio
+import json
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from polite_back.schemas.request import InputText, JobReq
+from polite_back.models import inference
+from polite_back.models.inference import job_queue
+from polite_back.models.admission import Overloaded
+from polite_back.models.executor import QueueFull
+from polite_back.models.jobs import CANCELLED, DEFAULT_PRIORITY, FAILED, INTERACTIVE_PRIORITY, Job, TooManyJobs
 
 router = APIRouter(prefix="/kobart", tags=["KoBART"])
-_infer_gate = asyncio.Semaphore(2) # 필요시 2로 업데이트  
 
-def refine_text(text: str) -> str:
-    tokenizer, model, device = get_kobart_model()
-    input_text = "[순화] " + text
-    # 동적 패딩(배치=1) 유지: padding 지정 안 함 
-    input_ids = tokenizer(input_text, return_tensors="pt").input_ids.to(device)
-    with torch.inference_mode():  
-        output = model.generate(input_ids, max_length=128, num_beams=5)  # 기존 설정 그대로 유지 
-    return tokenizer.decode(output[0], skip_special_tokens=True)
+DISCONNECT_POLL_S = 0.5
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def _sse_error(e: Exception) -> dict:
+    # 헤더(200)를 보낸 뒤라 상태 코드로 알릴 수 없음 → 같은 상태 코드를 error 이벤트에 담아 전달
+    if isinstance(e, Overloaded):
+        return {"status": e.status_code, "detail": str(e), "retry_after": e.retry_after}
+    if isinstance(e, QueueFull):
+        return {"status": 503, "detail": str(e), "retry_after": 1}
+    print(f"[sse] stream failed: {e!r}")
+    return {"status": 500, "detail": "generation failed"}
+
+async def _guarded(events: AsyncIterator[str]) -> AsyncIterator[str]:
+    try:
+        async for chunk in events:
+            yield chunk
+    except Exception as e:
+        yield sse_event("error", _sse_error(e))
+
+def sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    """스트리밍 중 실패하면 스트림을 조용히 끊지 않고 error 이벤트로 종료."""
+    return StreamingResponse(_guarded(events), media_type="text/event-stream", headers=SSE_HEADERS)
+
+def _client_key(request: Request) -> Optional[str]:
+    # 사용자별 작업 한도 키는 요청 본문이 아니라 서버가 본 접속 주소 (없으면 익명 버킷)
+    # 프록시 뒤에서는 FORWARDED_ALLOW_IPS(Dockerfile) 로 프록시를 신뢰해야 실제 클라이언트 주소가 들어옴
+    return f"client:{request.client.host}" if request.client else None
+
+def _submit(text: str, request: Request, priority: int = DEFAULT_PRIORITY, limit_user: bool = True) -> Job:
+    # 예상 대기 시간이 SLO 를 넘으면 작업을 만들지 않고 바로 429
+    inference.kobart_admission.check()
+    try:
+        return job_queue.submit(text, user_id=_client_key(request), priority=priority, limit_user=limit_user)
+    except TooManyJobs as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
 
 @router.post("/generate")
-async def generate_polite_text(input: InputText):
-    async with _infer_gate:
-        polite_text = refine_text(input.text)
-    return {"polite_text": polite_text}
+async def generate_polite_text(input: InputText, request: Request):
+    # 작업 큐의 동기 래퍼: 완료까지 기다리되 클라이언트가 끊기면 작업 취소
+    # (연결이 곧 작업이므로 사용자별 한도 없이, 사용자가 기다리는 중이라 백그라운드 작업보다 먼저)
+    job = _submit(input.text, request, priority=INTERACTIVE_PRIORITY, limit_user=False)
+    while not job.done.is_set():
+        try:
+            await asyncio.wait_for(job.done.wait(), timeout=DISCONNECT_POLL_S)
+        except asyncio.TimeoutError:
+            if await request.is_disconnected():
+                job_queue.cancel(job.id)
+                raise HTTPException(status_code=499, detail="client disconnected")
+    if job.status == FAILED:
+        if isinstance(job.exception, (Overloaded, QueueFull)):
+            raise job.exception
+        raise HTTPException(status_code=500, detail=job.error)
+    if job.status == CANCELLED:
+        raise HTTPException(status_code=409, detail="job cancelled")
+    return {"polite_text": job.result}
+
+@router.post("/jobs", status_code=202)
+async def submit_job(req: JobReq, request: Request):
+    job = _submit(req.text, request, priority=req.priority)
+    return job.to_dict()
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="job not found")
+    return job.to_dict()
+
+@router.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    job = job_queue.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="job not found")
+    return job.to_dict()
+
+@router.websocket("/jobs/{job_id}/ws")
+async def job_ws(websocket: WebSocket, job_id: str):
+    """완료 시 결과를 push 하고 종료. 완료 전에 연결이 끊기면 작업 취소."""
+    await websocket.accept()
+    job = job_queue.get(job_id)
+    if job is None:
+        await websocket.close(code=4404)
+        return
+    await websocket.send_json(job.to_dict())
+    if job.finished:
+        await websocket.close()
+        return
+
+    done = asyncio.ensure_future(job.done.wait())
+    recv = asyncio.ensure_future(websocket.receive())
+    try:
+        await asyncio.wait({done, recv}, return_when=asyncio.FIRST_COMPLETED)
+        if done.done():
+            await websocket.send_json(job.to_dict())
+            await websocket.close()
+        elif recv.result().get("type") == "websocket.disconnect":
+            job_queue.cancel(job.id)
+        else:
+            # 클라이언트 메시지는 쓰지 않음 → 완료까지 대기
+            await done
+            await websocket.send_json(job.to_dict())
+            await websocket.close()
+    except WebSocketDisconnect:
+        job_queue.cancel(job.id)
+    finally:
+        done.cancel()
+        recv.cancel()
+
+@router.post("/generate/stream")
+async def generate_polite_text_stream(input: InputText):
+    """
+    SSE: partial(부분 순화문) 이벤트를 토큰 단위로 보낸 뒤
+    metrics(ttft_ms/total_ms), done({"polite_text"}) 순으로 종료. 도중 실패 시 error({"status", "detail"}).
+    입장 제어/대기열 거절은 응답 전에 확인 → 스트림이 아니라 429/503 응답.
+    """
+    stream = await inference.open_refine_stream(input.text)
+
+    async def events():
+        async for kind, payload in stream:
+            if kind == "partial":
+                yield sse_event("partial", payload)
+            else:
+                yield sse_event("metrics", {"ttft_ms": payload["ttft_ms"], "total_ms": payload["total_ms"]})
+                yield sse_event("done", {"polite_text": payload["polite_text"]})
+
+    return sse_response(events())
@@ -6,6 +6,7 @@ from sqlalchemy.future import select
 from sqlalchemy import asc
 from polite_back.database import get_db
 from polite_back import model
+from polite_back.models import inference
 
 router = APIRouter(prefix="/posts", tags=["Posts"])
 
@@ -42,6 +43,9 @@ async def verify_post_password(post_id: int, data: dict, db: AsyncSession = Depe
     )
     sub_posts = result_sp.scalars().all()
 
+    # 사용자가 포스트에 들어옴 → 정책상 필요한 모델이 해제돼 있으면 미리 로드 (응답은 기다리지 않음)
+    inference.prewarm_hint(post.policy_mode)
+
     return {
         "valid": True,
         "post": {
@@ -1,4 +1,11 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from polite_back.models.jobs import DEFAULT_PRIORITY, MAX_PRIORITY
 
 class InputText(BaseModel):
     text: str
+
+class JobReq(BaseModel):
+    text: str = Field(..., min_length=1)
+    # 작을수록 먼저 처리. 기본값보다 앞선 우선순위는 서버 전용 (요청하면 422)
+    priority: int = Field(DEFAULT_PRIORITY, ge=DEFAULT_PRIORITY, le=MAX_PRIORITY)
@@ -52,6 +52,8 @@ class SuggestRes(BaseModel):
     polite_text: Optional[str] = None
     message: Optional[str] = None
     logit: Optional[float] = None
+    decode_strategy: Optional[str] = None  # 순화문 생성 방식 (beam|greedy|greedy_beam|greedy_deadline|stream, 재순위 시 *_rerank)
+    inference_token: Optional[str] = None  # 저장 시 SaveReq.inference_token 으로 그대로 전달
 
 
 class SaveReq(BaseModel):
@@ -65,6 +67,9 @@ class SaveReq(BaseModel):
     generated_polite_text: Optional[str] = None
     text_user_edit: Optional[str] = None
 
+    # /comments/suggest 응답의 inference_token (있으면 점수/순화문 재계산 생략)
+    inference_token: Optional[str] = None
+
 
 class SaveRes(BaseModel):
     saved: bool
@@ -0,0 +1,66 @@
+import os
+
+import pytest
+import torch
+
+from polite_back.models import artifacts
+
+
+@pytest.fixture(scope="module")
+def electra_root(tmp_path_factory):
+    from safetensors.torch import save_file
+    from transformers import ElectraConfig, ElectraModel
+
+    root = tmp_path_factory.mktemp("electra")
+    cfg = ElectraConfig(
+        vocab_size=64, hidden_size=32, embedding_size=32, num_hidden_layers=1,
+        num_attention_heads=2, intermediate_size=64,
+    )
+    ElectraModel(cfg).save_pretrained(root / "backbone", safe_serialization=True)
+    save_file({"weight": torch.randn(1, 32), "bias": torch.zeros(1)}, str(root / "head.safetensors"))
+    artifacts._write_manifest(str(root), {"base": "test"})
+    return str(root)
+
+
+def _mapped_file(ptr: int) -> str:
+    with open("/proc/self/maps") as f:
+        for line in f:
+            parts = line.split()
+            lo, hi = (int(x, 16) for x in parts[0].split("-"))
+            if lo <= ptr < hi:
+                return parts[5] if len(parts) > 5 else ""
+    return ""
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/maps"), reason="needs /proc/self/maps")
+def test_electra_weights_stay_mapped_from_safetensors(electra_root):
+    model = artifacts.load_electra(electra_root, torch.device("cpu"))
+    copied = [
+        name for name, t in model.state_dict().items()
+        if not _mapped_file(t.data_ptr()).endswith(".safetensors")
+    ]
+    assert copied == []
+
+
+def test_stat_verify_rehashes_only_files_whose_mtime_changed(electra_root):
+    head = os.path.join(electra_root, "head.safetensors")
+    original = open(head, "rb").read()
+    st = os.stat(head)
+    try:
+        # 내용이 같으면 mtime 만 바뀌어도 통과 (해시로 재확인)
+        os.utime(head, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        artifacts.verify(electra_root, "stat")
+
+        # 크기가 같은 손상은 mtime 이 바뀌었으므로 해시에서 걸림
+        corrupted = bytearray(original)
+        corrupted[-1] ^= 1
+        with open(head, "wb") as f:
+            f.write(corrupted)
+        with pytest.raises(artifacts.ArtifactError, match="checksum"):
+            artifacts.verify(electra_root, "stat")
+        assert artifacts.verify(electra_root, "size")
+    finally:
+        with open(head, "wb") as f:
+            f.write(original)
+        os.utime(head, ns=(st.st_atime_ns, st.st_mtime_ns))
+    artifacts.verify(electra_root, "sha256")
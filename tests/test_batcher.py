@@ -0,0 +1,38 @@
+import asyncio
+import contextvars
+import threading
+import time
+
+from polite_back.models.batcher import MicroBatcher
+
+_kind: contextvars.ContextVar = contextvars.ContextVar("kind", default="request")
+
+
+def test_discarded_items_are_charged_their_share_of_worker_time():
+    started = threading.Event()
+
+    def slow(items):
+        started.set()
+        time.sleep(0.2)
+        return items
+
+    batcher = MicroBatcher(slow, max_batch_size=2, max_wait_ms=50, name="test", tag=_kind.get)
+
+    async def scenario():
+        token = _kind.set("speculative")
+        try:
+            dropped = asyncio.ensure_future(batcher.submit("a"))
+        finally:
+            _kind.reset(token)
+        kept = asyncio.ensure_future(batcher.submit("b"))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait)
+        # 실행이 시작된 뒤 취소해도 forward 는 끝까지 돌고, 그 몫이 낭비로 집계되어야 함
+        dropped.cancel()
+        return await kept
+
+    assert asyncio.run(scenario()) == "b"
+    stats = batcher.stats()
+    assert stats["discarded_items"] == 1
+    assert set(stats["discarded_ms"]) == {"speculative"}
+    # 2개 배치에서 1개 폐기 → 실행 시간(≥200ms)의 절반
+    assert stats["discarded_ms"]["speculative"] >= 95
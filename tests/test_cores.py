@@ -0,0 +1,39 @@
+import pytest
+
+from polite_back.models import cores
+
+ENV = (
+    "INFERENCE_CPUS", "ELECTRA_CORE_SHARE",
+    "ELECTRA_WORKERS", "ELECTRA_THREADS", "KOBART_WORKERS", "KOBART_THREADS",
+)
+
+
+@pytest.fixture(autouse=True)
+def _clean_env(monkeypatch):
+    for name in ENV:
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(cores, "affinity", lambda: list(range(16)))
+
+
+# cpus → (ELECTRA workers x threads, KoBART workers x threads)
+@pytest.mark.parametrize("cpus, electra, kobart", [
+    (1, (1, 1), (2, 1)),
+    (2, (1, 1), (2, 1)),
+    (4, (1, 1), (2, 2)),
+    (7, (1, 2), (3, 2)),
+])
+def test_plan_layouts(cpus, electra, kobart):
+    layout = cores.plan(cpus)
+    assert (layout["electra"].workers, layout["electra"].threads) == electra
+    assert (layout["kobart"].workers, layout["kobart"].threads) == kobart
+
+
+@pytest.mark.parametrize("cpus", [1, 2, 4, 7])
+def test_plan_uses_every_core(cpus):
+    layout = cores.plan(cpus)
+    used = set()
+    for lay in layout.values():
+        for i in range(lay.workers):
+            used.update(lay.worker_cores(i))
+    assert used == set(range(cpus))
+    assert layout["kobart"].workers >= 2
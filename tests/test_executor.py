@@ -0,0 +1,34 @@
+import asyncio
+import threading
+
+from polite_back.models.executor import InferenceExecutor, QueueFull
+
+
+def test_cancelled_awaiters_keep_their_slot_until_the_work_finishes():
+    executor = InferenceExecutor("test", max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        tasks = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        for task in tasks:
+            task.cancel()
+        await asyncio.sleep(0.05)
+        # 첫 작업은 스레드에서 아직 실행 중 → 슬롯을 계속 차지, 대기 중이던 두 번째는 취소되어 반환
+        in_flight = executor.stats()["in_flight"]
+        third = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+        rejected = third.done() and isinstance(third.exception(), QueueFull)
+        release.set()
+        if not rejected:
+            await third
+        return in_flight, rejected
+
+    try:
+        in_flight, rejected = asyncio.run(scenario())
+    finally:
+        release.set()
+        executor.shutdown(wait=True)
+    assert in_flight == 1
+    assert not rejected
+    assert executor.stats()["in_flight"] == 0
@@ -0,0 +1,48 @@
+import asyncio
+
+from polite_back.models import inference, kobart_model
+from polite_back.models.gen_cache import make_key
+
+
+class _Cache:
+    def __init__(self, entries):
+        self.entries = entries
+
+    def get(self, key):
+        return self.entries.get(key)
+
+
+def test_cache_hits_skip_the_batcher_and_admission(monkeypatch):
+    params = tuple(sorted(kobart_model.GEN_KWARGS.items()))
+    key = make_key(kobart_model.CACHE_MODEL_ID, dict(params), "안녕")
+    monkeypatch.setattr(inference, "remote", None)
+    monkeypatch.setattr(kobart_model, "gen_cache", _Cache({key: "안녕하세요"}))
+
+    def submit(item):
+        raise AssertionError("cache hit was batched")
+
+    observed = []
+    monkeypatch.setattr(inference.kobart_batcher, "submit", submit)
+    monkeypatch.setattr(inference.kobart_admission, "observe", lambda *a: observed.append(a))
+
+    assert asyncio.run(inference._generate("안녕", params)) == "안녕하세요"
+    assert observed == []
+
+
+def test_misses_are_batched_without_a_second_lookup(monkeypatch):
+    lookups = []
+
+    class _Miss:
+        def get(self, key):
+            lookups.append(key)
+
+    monkeypatch.setattr(inference, "remote", None)
+    monkeypatch.setattr(kobart_model, "gen_cache", _Miss())
+
+    async def submit(item):
+        return "생성됨"
+
+    monkeypatch.setattr(inference.kobart_batcher, "submit", submit)
+    params = tuple(sorted(kobart_model.GEN_KWARGS.items()))
+    assert asyncio.run(inference._generate("반가워", params)) == "생성됨"
+    assert len(lookups) == 1
@@ -0,0 +1,38 @@
+import pytest
+
+from polite_back import inference_token
+from polite_back.models.bert_model import LEXICON_PROB, decide
+from polite_back.schemas.schemas import SuggestReq, SuggestRes
+
+
+@pytest.mark.parametrize("score", [(0.2, False), (0.8, False), (LEXICON_PROB, True)])
+@pytest.mark.parametrize("th", [0.5, 0.95])
+def test_decided_score_replays_the_same_decision(score, th):
+    over_pred, prob = decide(score, th)
+    assert decide(inference_token.decided_score(over_pred, prob, th), th) == (over_pred, prob)
+
+
+def test_attach_token_scores_only_the_polite_text(monkeypatch):
+    import asyncio
+
+    from polite_back.routes import comment
+
+    scored = []
+
+    async def _score(text, threshold=None):
+        scored.append(text)
+        return 0.1, False
+
+    monkeypatch.setattr(comment, "score", _score)
+
+    req = SuggestReq(post_id=3, section=1, text="원문")
+    res = SuggestRes(policy_mode="polite_one_edit", over_threshold=True, threshold_applied=0.5, polite_text="순화문")
+    token = asyncio.run(comment._attach_token(res, req, 0.5, 1, 0.7)).inference_token
+
+    # 원문은 핸들러의 판정을 그대로 쓰고, 순화문만 한 번 채점해 토큰에 담음
+    assert scored == ["순화문"]
+    hint = inference_token.verify(token, 3, 0.5, "원문")
+    assert hint.score_original == (0.7, False)
+    assert hint.polite_text == "순화문"
+    assert hint.score_polite == (0.1, False)
+    assert inference_token.verify(token, 3, 0.5, "다른 원문") is None
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from polite_back.models.jobs import ANONYMOUS, DEFAULT_PRIORITY, INTERACTIVE_PRIORITY, MAX_PRIORITY, JobQueue, TooManyJobs
+
+
+def _queue(**kwargs):
+    release = asyncio.Event()
+
+    async def handler(text):
+        await release.wait()
+        return text
+
+    return JobQueue(handler, workers=1, max_per_user=1, max_anonymous=2, **kwargs), release
+
+
+def test_jobs_without_a_user_share_the_anonymous_limit():
+    async def scenario():
+        queue, release = _queue()
+        jobs = [queue.submit("a"), queue.submit("b")]
+        with pytest.raises(TooManyJobs):
+            queue.submit("c")
+        # 키가 있는 사용자는 익명 버킷과 별도로 자기 한도만 적용
+        jobs.append(queue.submit("d", user_id="client:10.0.0.1"))
+        with pytest.raises(TooManyJobs):
+            queue.submit("e", user_id="client:10.0.0.1")
+        assert {j.user_id for j in jobs} == {ANONYMOUS, "client:10.0.0.1"}
+        release.set()
+        await asyncio.gather(*(queue.wait(j, timeout=5) for j in jobs))
+        # 끝난 작업은 한도에서 빠짐
+        queue.submit("f")
+
+    asyncio.run(scenario())
+
+
+def test_jobs_run_in_priority_order():
+    async def scenario():
+        order = []
+        release = asyncio.Event()
+
+        async def handler(text):
+            await release.wait()
+            order.append(text)
+            return text
+
+        queue = JobQueue(handler, workers=1, max_per_user=10)
+        blocker = queue.submit("blocker")
+        await asyncio.sleep(0)  # 워커가 blocker 를 가져가 실행 중인 동안 나머지는 대기열에
+        jobs = [queue.submit("low", priority=MAX_PRIORITY), queue.submit("default"),
+                queue.submit("interactive", priority=INTERACTIVE_PRIORITY), queue.submit("default2")]
+        release.set()
+        await asyncio.gather(*(queue.wait(j, timeout=5) for j in [blocker, *jobs]))
+        return order
+
+    assert asyncio.run(scenario()) == ["blocker", "interactive", "default", "default2", "low"]
+
+
+def test_client_cannot_request_server_priorities():
+    from pydantic import ValidationError
+
+    from polite_back.schemas.request import JobReq
+
+    assert JobReq(text="a").priority == DEFAULT_PRIORITY
+    with pytest.raises(ValidationError):
+        JobReq(text="a", priority=INTERACTIVE_PRIORITY)
+
+
+def test_sync_wrapper_jobs_skip_the_per_user_limit():
+    async def scenario():
+        queue, release = _queue()
+        jobs = [queue.submit(t, user_id="client:10.0.0.1", limit_user=False) for t in "abc"]
+        # 기다리는 동기 요청은 /jobs 한도를 차지하지만 스스로는 막히지 않음
+        with pytest.raises(TooManyJobs):
+            queue.submit("d", user_id="client:10.0.0.1")
+        release.set()
+        await asyncio.gather(*(queue.wait(j, timeout=5) for j in jobs))
+
+    asyncio.run(scenario())
@@ -0,0 +1,34 @@
+import asyncio
+
+from polite_back.models import inference, live
+
+
+def test_score_errors_are_reported_and_the_session_keeps_going(monkeypatch):
+    monkeypatch.setattr(live, "LIVE_DEBOUNCE_MS", 1)
+    monkeypatch.setattr(live, "_slots", None)
+    calls = []
+
+    async def score(text, segmented=None, threshold=None):
+        calls.append(text)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        return 0.2, False
+
+    monkeypatch.setattr(inference, "score", score)
+
+    async def scenario():
+        sent = asyncio.Queue()
+        session = live.LiveSession(0.5, sent.put)
+        task = asyncio.ensure_future(session.run())
+        try:
+            session.update("첫 초안")
+            first = await asyncio.wait_for(sent.get(), timeout=5)
+            session.update("둘째 초안")
+            second = await asyncio.wait_for(sent.get(), timeout=5)
+        finally:
+            task.cancel()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first == {"type": "error", "seq": 1}
+    assert second["type"] == "score" and second["seq"] == 2
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from polite_back.models import inference, kobart_model
+from polite_back.models.executor import QueueFull
+from polite_back.routes import kobart
+
+
+class _Tokenizer:
+    def decode(self, ids, **kwargs):
+        return ""
+
+
+def test_queue_full_is_raised_before_the_stream_opens(monkeypatch):
+    monkeypatch.setattr(inference, "remote", None)
+    monkeypatch.setattr(kobart_model, "cached_stream_text", lambda text: None)
+
+    async def run(fn, *args, **kwargs):
+        return _Tokenizer(), None, None
+
+    def submit(fn, *args, **kwargs):
+        raise QueueFull("kobart", 0)
+
+    monkeypatch.setattr(inference.kobart_executor, "run", run)
+    monkeypatch.setattr(inference.kobart_executor, "submit", submit)
+
+    in_flight = inference.kobart_admission.in_flight
+    with pytest.raises(QueueFull):
+        asyncio.run(asyncio.wait_for(inference.open_refine_stream("안녕"), timeout=5))
+    assert inference.kobart_admission.in_flight == in_flight
+
+
+def _client():
+    app = FastAPI()
+    app.include_router(kobart.router)
+
+    @app.exception_handler(QueueFull)
+    async def queue_full_handler(request, exc):
+        return JSONResponse(status_code=503, content={"detail": str(exc)})
+
+    return TestClient(app)
+
+
+def test_shed_stream_gets_an_http_status(monkeypatch):
+    async def open_refine_stream(text):
+        raise QueueFull("kobart", 0)
+
+    monkeypatch.setattr(inference, "open_refine_stream", open_refine_stream)
+    res = _client().post("/kobart/generate/stream", json={"text": "안녕"})
+    assert res.status_code == 503
+
+
+def test_failure_mid_stream_ends_with_an_error_event(monkeypatch):
+    async def events():
+        yield "partial", {"text": "안", "delta": "안"}
+        raise RuntimeError("worker died")
+
+    async def open_refine_stream(text):
+        return events()
+
+    monkeypatch.setattr(inference, "open_refine_stream", open_refine_stream)
+    res = _client().post("/kobart/generate/stream", json={"text": "안녕"})
+    assert res.status_code == 200
+    assert res.text.startswith("event: partial")
+    assert 'event: error\ndata: {"status": 500' in res.text
@@ -0,0 +1,15 @@
+from polite_back.models.segments import split_segments
+
+
+def test_line_breaks_split_segments():
+    text = "첫 번째 줄입니다 정말로\n두 번째 줄도 길게 씁니다\n\n  세 번째   줄은 공백이 많아요  "
+    assert split_segments(text) == ["첫 번째 줄입니다 정말로", "두 번째 줄도 길게 씁니다", "세 번째 줄은 공백이 많아요"]
+
+
+def test_short_line_joins_previous_segment():
+    assert split_segments("오늘 경기 정말 재밌었어요\nㅋㅋ") == ["오늘 경기 정말 재밌었어요 ㅋㅋ"]
+
+
+def test_single_line_is_normalized_whole():
+    assert split_segments("  짧은   댓글 ") == ["짧은 댓글"]
+    assert split_segments(" \n ") == []
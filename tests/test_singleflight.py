@@ -0,0 +1,24 @@
+import asyncio
+
+from polite_back.models.singleflight import SingleFlight
+
+
+def test_request_after_last_waiter_cancels_starts_a_new_call():
+    flight = SingleFlight("test")
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return len(calls)
+
+    async def scenario():
+        first = asyncio.ensure_future(flight.do("k", fn))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)  # 대기자 취소 처리 (leader 태스크의 done 콜백은 아직)
+        # 취소된 leader 에 붙으면 CancelledError 를 받게 됨
+        return await flight.do("k", fn)
+
+    assert asyncio.run(scenario()) == 2
+    assert flight.stats()["in_flight"] == 0
@@ -0,0 +1,28 @@
+from polite_back.models.tokenization import BatchTokenizer, Encoded
+
+
+def _enc(*lengths):
+    return [Encoded(tuple(range(n)), n, n) for n in lengths]
+
+
+def _tokens(width=16, max_padding=0.5):
+    return BatchTokenizer("test", lambda: None, bucket_width=width, max_padding=max_padding, cache_size=0)
+
+
+def test_similar_lengths_stay_in_one_forward():
+    tokens = _tokens()
+    # 길이가 bucket_width 구간을 넘나들어도 패딩이 적으면 나누지 않음
+    assert tokens.buckets(_enc(14, 18, 20, 15)) == [[0, 1, 2, 3]]
+    assert tokens.stats()["split_batches"] == 0
+
+
+def test_split_only_when_padding_ratio_is_high():
+    tokens = _tokens()
+    groups = tokens.buckets(_enc(120, 8, 10, 9))
+    assert groups == [[1, 3, 2], [0]]
+    assert tokens.stats()["split_batches"] == 1
+
+
+def test_zero_width_disables_bucketing():
+    tokens = _tokens(width=0)
+    assert tokens.buckets(_enc(120, 8, 10, 9)) == [[0, 1, 2, 3]]